@@ -8,5 +8,7 @@ with the ERPNext App Builder to enable intelligent app generation.
 from .hooks import ClaudeHooks
 from .prompts import PromptManager
 from .ai_interface import AIInterface
+from .async_ai_interface import AsyncAIInterface
+from .conversation_log import ConversationLog
 
-__all__ = ['ClaudeHooks', 'PromptManager', 'AIInterface']
\ No newline at end of file
+__all__ = ['ClaudeHooks', 'PromptManager', 'AIInterface', 'AsyncAIInterface', 'ConversationLog']
\ No newline at end of file
@@ -8,7 +8,7 @@ through the MCP (Model Context Protocol) server.
 import json
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
 try:
     import requests
@@ -18,12 +18,64 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def analysis_prompts(requirement: str, context: Dict[str, Any] = None) -> Tuple[str, str]:
+    """Build the system and user prompts for a requirement analysis"""
+    system_prompt = """You are an expert ERPNext consultant. Analyze the business requirement and provide structured recommendations for building an ERPNext application."""
+    
+    user_prompt = f"""Analyze this business requirement and provide recommendations:
+
+Requirement: {requirement}
+Context: {json.dumps(context, indent=2) if context else 'None'}
+
+Please provide:
+1. Business entities identified
+2. Suggested ERPNext DocTypes
+3. Field specifications
+4. Workflow requirements
+5. User roles and permissions
+6. Implementation approach"""
+
+    return system_prompt, user_prompt
+
+
+def doctype_prompts(doctype_info: Dict[str, Any]) -> Tuple[str, str]:
+    """Build the system and user prompts for a DocType design"""
+    system_prompt = """You are an ERPNext developer. Design a detailed DocType specification based on the requirements."""
+    
+    user_prompt = f"""Design a DocType with the following specifications:
+
+Name: {doctype_info.get('name', 'Custom DocType')}
+Purpose: {doctype_info.get('purpose', 'General purpose DocType')}
+Related to: {', '.join(doctype_info.get('related_entities', []))}
+
+Provide detailed field specifications, relationships, and permissions."""
+
+    return system_prompt, user_prompt
+
+
+def workflow_prompts(workflow_info: Dict[str, Any]) -> Tuple[str, str]:
+    """Build the system and user prompts for a workflow design"""
+    system_prompt = """You are an ERPNext workflow designer. Create workflow specifications based on business processes."""
+    
+    user_prompt = f"""Design a workflow for:
+
+Process: {workflow_info.get('process_name', 'Business Process')}
+Stakeholders: {', '.join(workflow_info.get('stakeholders', []))}
+Current Steps: {', '.join(workflow_info.get('steps', []))}
+
+Provide workflow states, transitions, and role assignments."""
+
+    return system_prompt, user_prompt
+
+
 class AIInterface:
     """Interface for communicating with Claude AI through MCP"""
     
     def __init__(self, mcp_server_url: str = "http://localhost:3000"):
         self.mcp_server_url = mcp_server_url
         self.session_id = None
+        # Kept open so repeated health checks reuse one keep-alive connection
+        self._http = requests.Session() if requests is not None else None
         
     def send_prompt(self, system_prompt: str, user_prompt: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -115,57 +167,25 @@ class AIInterface:
     
     def analyze_requirement(self, requirement: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Analyze business requirement using Claude"""
-        system_prompt = """You are an expert ERPNext consultant. Analyze the business requirement and provide structured recommendations for building an ERPNext application."""
-        
-        user_prompt = f"""Analyze this business requirement and provide recommendations:
-
-Requirement: {requirement}
-Context: {json.dumps(context, indent=2) if context else 'None'}
-
-Please provide:
-1. Business entities identified
-2. Suggested ERPNext DocTypes
-3. Field specifications
-4. Workflow requirements
-5. User roles and permissions
-6. Implementation approach"""
-
+        system_prompt, user_prompt = analysis_prompts(requirement, context)
         return self.send_prompt(system_prompt, user_prompt, context)
     
     def design_doctype(self, doctype_info: Dict[str, Any]) -> Dict[str, Any]:
         """Design specific DocType using Claude"""
-        system_prompt = """You are an ERPNext developer. Design a detailed DocType specification based on the requirements."""
-        
-        user_prompt = f"""Design a DocType with the following specifications:
-
-Name: {doctype_info.get('name', 'Custom DocType')}
-Purpose: {doctype_info.get('purpose', 'General purpose DocType')}
-Related to: {', '.join(doctype_info.get('related_entities', []))}
-
-Provide detailed field specifications, relationships, and permissions."""
-
+        system_prompt, user_prompt = doctype_prompts(doctype_info)
         return self.send_prompt(system_prompt, user_prompt, doctype_info)
     
     def suggest_workflow(self, workflow_info: Dict[str, Any]) -> Dict[str, Any]:
         """Suggest workflow design using Claude"""
-        system_prompt = """You are an ERPNext workflow designer. Create workflow specifications based on business processes."""
-        
-        user_prompt = f"""Design a workflow for:
-
-Process: {workflow_info.get('process_name', 'Business Process')}
-Stakeholders: {', '.join(workflow_info.get('stakeholders', []))}
-Current Steps: {', '.join(workflow_info.get('steps', []))}
-
-Provide workflow states, transitions, and role assignments."""
-
+        system_prompt, user_prompt = workflow_prompts(workflow_info)
         return self.send_prompt(system_prompt, user_prompt, workflow_info)
     
     def health_check(self) -> bool:
         """Check if AI interface is working"""
         try:
-            if requests is None:
+            if self._http is None:
                 return False
-            response = requests.get(f"{self.mcp_server_url}/health", timeout=5)
+            response = self._http.get(f"{self.mcp_server_url}/health", timeout=5)
             return response.status_code == 200
         except:
             return False
\ No newline at end of file
@@ -0,0 +1,319 @@
+"""
+Async AI Interface for Claude integration
+
+This module provides an asyncio interface to the MCP server that keeps a
+pool of keep-alive HTTP/1.1 connections, caps the number of prompts in
+flight, gives every call a deadline and retries transient failures with
+jittered exponential backoff. It uses only asyncio streams, so no HTTP
+client package is needed.
+"""
+
+import json
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .ai_interface import analysis_prompts, doctype_prompts, workflow_prompts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_HEALTH_TIMEOUT = 5.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.1
+DEFAULT_BACKOFF_MAX = 2.0
+
+# Statuses worth another attempt: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class HTTPStatusError(Exception):
+    """Non-success HTTP status from the MCP server"""
+    
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"MCP server returned HTTP {status}")
+        self.status = status
+        self.body = body
+
+
+async def read_http_message(reader: asyncio.StreamReader) -> Tuple[str, Dict[str, str], bytes]:
+    """
+    Read one HTTP/1.1 message from a stream
+    
+    Returns:
+        Start line, headers with lower-cased names, and body
+    """
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';', 1)[0], 16)
+            if size == 0:
+                await reader.readuntil(b'\r\n')
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b''.join(chunks)
+    else:
+        body = await reader.readexactly(int(headers.get('content-length', 0)))
+    
+    return lines[0], headers, body
+
+
+class _Connection:
+    """Keep-alive connection to the MCP server"""
+    
+    __slots__ = ('reader', 'writer')
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+    
+    @property
+    def usable(self) -> bool:
+        return not self.writer.is_closing() and not self.reader.at_eof()
+    
+    def close(self):
+        self.writer.close()
+
+
+class AsyncAIInterface:
+    """Asyncio interface for communicating with Claude AI through MCP
+    
+    At most ``max_concurrency`` requests are in flight at once, each on its
+    own pooled connection; idle connections are kept open for the next
+    request. ``timeout`` bounds a whole call, retries included. The pool
+    belongs to the event loop it was first used on and is dropped when the
+    interface is used from another loop.
+    """
+    
+    def __init__(self, mcp_server_url: str = "http://localhost:3000",
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 prompt_path: str = "/prompt"):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        
+        url = urlsplit(mcp_server_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported MCP server URL: {mcp_server_url}")
+        
+        self.mcp_server_url = mcp_server_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.prompt_path = prompt_path
+        self.session_id = None
+        
+        self._host = url.hostname or 'localhost'
+        self._port = url.port or (443 if url.scheme == 'https' else 80)
+        self._ssl = url.scheme == 'https'
+        self._base_path = url.path.rstrip('/')
+        self._host_header = url.netloc
+        
+        self._loop = None
+        self._semaphore = None
+        self._idle = deque()
+        self._stats = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'connections_opened': 0,
+            'connections_reused': 0
+        }
+    
+    async def send_prompt(self, system_prompt: str, user_prompt: str,
+                          context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Send prompt to Claude through MCP server
+        
+        Args:
+            system_prompt: System instructions for Claude
+            user_prompt: User's actual prompt
+            context: Additional context information
+        
+        Returns:
+            Claude's response
+        """
+        try:
+            payload = {
+                'system_prompt': system_prompt,
+                'user_prompt': user_prompt,
+                'context': context or {},
+                'session_id': self.session_id
+            }
+            
+            response = await self.request('POST', self.prompt_path, payload)
+            if isinstance(response, dict):
+                return response
+            return {
+                'success': True,
+                'response': response
+            }
+        
+        except Exception as e:
+            logger.error(f"Error sending prompt to Claude: {str(e) or type(e).__name__}")
+            return {
+                'success': False,
+                'error': str(e) or type(e).__name__,
+                'response': "Unable to process request at this time"
+            }
+    
+    async def analyze_requirement(self, requirement: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Analyze business requirement using Claude"""
+        system_prompt, user_prompt = analysis_prompts(requirement, context)
+        return await self.send_prompt(system_prompt, user_prompt, context)
+    
+    async def design_doctype(self, doctype_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Design specific DocType using Claude"""
+        system_prompt, user_prompt = doctype_prompts(doctype_info)
+        return await self.send_prompt(system_prompt, user_prompt, doctype_info)
+    
+    async def suggest_workflow(self, workflow_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Suggest workflow design using Claude"""
+        system_prompt, user_prompt = workflow_prompts(workflow_info)
+        return await self.send_prompt(system_prompt, user_prompt, workflow_info)
+    
+    async def health_check(self, timeout: float = DEFAULT_HEALTH_TIMEOUT) -> bool:
+        """Check if AI interface is working, without retrying"""
+        try:
+            await self.request('GET', '/health', timeout=timeout, retries=0)
+            return True
+        except Exception:
+            return False
+    
+    async def request(self, method: str, path: str, payload: Any = None,
+                      timeout: Optional[float] = None, retries: Optional[int] = None) -> Any:
+        """
+        Send a request to the MCP server and decode its JSON response
+        
+        Args:
+            method: HTTP method
+            path: Path under the server URL
+            payload: JSON request body, or None for no body
+            timeout: Deadline for the call in seconds, retries included
+            retries: Attempts after the first for transient failures
+        
+        Returns:
+            Decoded response body
+        """
+        self._bind_loop()
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        deadline = time.monotonic() + timeout
+        body = json.dumps(payload, default=str).encode('utf-8') if payload is not None else None
+        
+        async with self._semaphore:
+            self._stats['requests'] += 1
+            attempt = 0
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    status, response = await asyncio.wait_for(self._send(method, path, body), remaining)
+                    if status >= 400:
+                        raise HTTPStatusError(status, response)
+                    return json.loads(response) if response else None
+                
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        asyncio.LimitOverrunError, HTTPStatusError) as e:
+                    transient = not isinstance(e, HTTPStatusError) or e.status in RETRY_STATUSES
+                    # Full jitter keeps clients that failed together from retrying together
+                    delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                    if not transient or attempt >= retries or time.monotonic() + delay >= deadline:
+                        self._stats['failures'] += 1
+                        raise
+                    attempt += 1
+                    self._stats['retries'] += 1
+                    await asyncio.sleep(delay)
+    
+    async def close(self):
+        """Close every pooled connection"""
+        while self._idle:
+            connection = self._idle.popleft()
+            connection.close()
+            try:
+                await connection.writer.wait_closed()
+            except OSError:
+                pass
+    
+    async def __aenter__(self) -> 'AsyncAIInterface':
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, retry and connection counts"""
+        return {
+            **self._stats,
+            'idle_connections': len(self._idle),
+            'max_concurrency': self.max_concurrency
+        }
+    
+    def _bind_loop(self):
+        """Start a fresh pool and semaphore when called from a new event loop"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Connections of a previous loop cannot be used, or closed, from this one
+            self._idle.clear()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+    
+    async def _send(self, method: str, path: str, body: Optional[bytes]) -> Tuple[int, bytes]:
+        """Send one request on a pooled connection and read the response"""
+        connection = await self._acquire()
+        reusable = False
+        try:
+            head = [
+                f"{method} {self._base_path}{path} HTTP/1.1",
+                f"Host: {self._host_header}",
+                "Connection: keep-alive",
+                "Accept: application/json"
+            ]
+            if body is not None:
+                head.append("Content-Type: application/json")
+            head.append(f"Content-Length: {len(body) if body is not None else 0}")
+            
+            connection.writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + (body or b''))
+            await connection.writer.drain()
+            
+            status_line, headers, response = await read_http_message(connection.reader)
+            reusable = headers.get('connection', '').lower() != 'close'
+            return int(status_line.split(' ', 2)[1]), response
+        finally:
+            if reusable:
+                self._idle.append(connection)
+            else:
+                connection.close()
+    
+    async def _acquire(self) -> _Connection:
+        """Take an idle connection, or open a new one"""
+        while self._idle:
+            connection = self._idle.pop()
+            if connection.usable:
+                self._stats['connections_reused'] += 1
+                return connection
+            connection.close()
+        
+        reader, writer = await asyncio.open_connection(self._host, self._port, ssl=self._ssl or None)
+        self._stats['connections_opened'] += 1
+        return _Connection(reader, writer)
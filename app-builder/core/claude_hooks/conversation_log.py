@@ -0,0 +1,201 @@
+"""
+Conversation Log for ERPNext App Builder
+
+This module keeps the most recent conversation turns in a ring buffer and
+spills older ones to an append-only JSON lines log, keeping only compact
+summaries of the latest turns in memory, so long chat sessions do not
+accumulate full analysis results.
+"""
+
+import json
+import logging
+import threading
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from itertools import islice
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_SIZE = 100
+
+# Turn summaries kept in memory; older ones are read back from the log
+DEFAULT_SUMMARY_SIZE = 1000
+
+# Spilled turns per recorded log offset; turns in between are found by reading lines
+LOG_OFFSET_INTERVAL = 64
+
+# Characters of a text turn kept in its summary
+SUMMARY_TEXT_LENGTH = 200
+
+# Fields of an analysis result kept in its summary
+SUMMARY_FIELDS = ('success', 'industry_category', 'complexity_level')
+
+
+def summarize_turn(turn: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the compact in-memory summary of a conversation turn"""
+    content = turn.get('content')
+    if isinstance(content, str):
+        summary = content[:SUMMARY_TEXT_LENGTH]
+    elif isinstance(content, Mapping):
+        summary = {field: content[field] for field in SUMMARY_FIELDS if field in content}
+    else:
+        summary = None
+    
+    return {
+        'timestamp': turn.get('timestamp'),
+        'type': turn.get('type'),
+        'summary': summary
+    }
+
+
+class ConversationLog:
+    """Bounded conversation history with an on-disk overflow log
+    
+    The last ``max_turns`` turns are kept in full and the summaries of the
+    last ``max_summaries`` turns. Older turns are appended to ``log_path`` as
+    they leave the buffer and read back, or summarized again, when paged
+    through. Without a log path only the summaries still in memory remain of
+    them. ``close`` closes the log; turns spilled after that are not logged.
+    """
+    
+    def __init__(self, max_turns: int = DEFAULT_HISTORY_SIZE, log_path: Optional[str] = None,
+                 max_summaries: int = DEFAULT_SUMMARY_SIZE):
+        if max_turns <= 0:
+            raise ValueError("max_turns must be positive")
+        if max_summaries <= 0:
+            raise ValueError("max_summaries must be positive")
+        
+        self.max_turns = max_turns
+        self.max_summaries = max_summaries
+        self.log_path = log_path
+        self._recent = deque()
+        self._summaries = deque(maxlen=max_summaries)
+        # Log file offset of every LOG_OFFSET_INTERVAL-th logged turn
+        self._offsets = array('q')
+        self._logged = 0
+        self._spilled = 0
+        self._lock = threading.RLock()
+        self._log = open(log_path, 'ab') if log_path else None
+    
+    def append(self, turn: Dict[str, Any]):
+        """Add a turn, spilling the oldest buffered turn when the buffer is full"""
+        with self._lock:
+            if len(self._recent) == self.max_turns:
+                self._spill(self._recent.popleft())
+            self._recent.append(turn)
+            self._summaries.append(summarize_turn(turn))
+    
+    def read(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Read turns in conversation order
+        
+        Args:
+            offset: Index of the first turn to read
+            limit: Maximum number of turns to read, or None for all
+        
+        Returns:
+            Full turns, or summaries for spilled turns that were not logged;
+            unlogged turns whose summaries were dropped are skipped
+        """
+        with self._lock:
+            stop = len(self) if limit is None else min(len(self), offset + limit)
+            if offset >= stop:
+                return []
+            
+            turns = []
+            if offset < self._spilled:
+                turns.extend(self._read_spilled(offset, min(stop, self._spilled)))
+            
+            first_recent = max(offset, self._spilled) - self._spilled
+            turns.extend(islice(self._recent, first_recent, max(stop - self._spilled, 0)))
+            return turns
+    
+    def summaries(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read turn summaries in conversation order, summarizing logged turns that left memory again"""
+        with self._lock:
+            stop = len(self) if limit is None else min(len(self), offset + limit)
+            if offset >= stop:
+                return []
+            
+            first_summary = len(self) - len(self._summaries)
+            summaries = []
+            if offset < first_summary:
+                logged_stop = min(stop, first_summary, self._logged)
+                if offset < logged_stop:
+                    summaries.extend(summarize_turn(turn) for turn in self._read_logged(offset, logged_stop))
+            
+            summaries.extend(dict(summary) for summary in
+                             islice(self._summaries, max(offset - first_summary, 0), max(stop - first_summary, 0)))
+            return summaries
+    
+    def clear(self):
+        """Drop every turn and truncate the log"""
+        with self._lock:
+            self._recent.clear()
+            self._summaries.clear()
+            self._offsets = array('q')
+            self._logged = 0
+            self._spilled = 0
+            if self._log is not None:
+                self._log.seek(0)
+                self._log.truncate()
+    
+    def close(self):
+        """Close the log file"""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+    
+    def __enter__(self) -> 'ConversationLog':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer and log sizes"""
+        with self._lock:
+            return {
+                'turns': len(self),
+                'buffered_turns': len(self._recent),
+                'spilled_turns': self._spilled,
+                'logged_turns': self._logged,
+                'summaries': len(self._summaries),
+                'log_bytes': self._log.tell() if self._log is not None else 0
+            }
+    
+    def _spill(self, turn: Dict[str, Any]):
+        """Append a turn leaving the buffer to the log"""
+        # Only a prefix of the turns is logged, so no turn is logged after the log was closed
+        if self._log is not None and self._logged == self._spilled:
+            if self._logged % LOG_OFFSET_INTERVAL == 0:
+                self._offsets.append(self._log.tell())
+            self._log.write(json.dumps(turn, default=str).encode('utf-8') + b'\n')
+            self._log.flush()
+            self._logged += 1
+        self._spilled += 1
+    
+    def _read_spilled(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Read spilled turns back from the log, or their summaries when they were not logged"""
+        logged = min(stop, self._logged)
+        turns = self._read_logged(start, logged) if start < logged else []
+        
+        first_summary = len(self) - len(self._summaries)
+        turns.extend(dict(summary) for summary in
+                     islice(self._summaries, max(start, logged, first_summary) - first_summary,
+                            max(stop - first_summary, 0)))
+        return turns
+    
+    def _read_logged(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """Read logged turns back, seeking to the nearest recorded offset and skipping lines from there"""
+        with open(self.log_path, 'rb') as log:
+            log.seek(self._offsets[start // LOG_OFFSET_INTERVAL])
+            for _ in range(start % LOG_OFFSET_INTERVAL):
+                log.readline()
+            return [json.loads(log.readline()) for _ in range(start, stop)]
+    
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
@@ -7,42 +7,108 @@ processing user requirements and generating ERPNext applications.
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 
+from ..context_engine.requirement_document import RequirementDocument
+from ..context_engine.keyword_automaton import register_keywords
+from .conversation_log import ConversationLog, DEFAULT_HISTORY_SIZE
+
 logger = logging.getLogger(__name__)
 
+# Business entity keywords
+BUSINESS_KEYWORDS = [
+    'customer', 'client', 'vendor', 'supplier', 'employee', 'staff',
+    'product', 'item', 'service', 'order', 'invoice', 'payment',
+    'project', 'task', 'lead', 'opportunity', 'quotation', 'contract'
+]
+
+# Keywords mapped to ERPNext DocTypes
+DOCTYPE_KEYWORDS = {
+    'customer': 'Customer',
+    'supplier': 'Supplier',
+    'item': 'Item',
+    'product': 'Item',
+    'order': 'Sales Order',
+    'purchase': 'Purchase Order',
+    'invoice': 'Sales Invoice',
+    'employee': 'Employee',
+    'project': 'Project',
+    'task': 'Task',
+    'lead': 'Lead',
+    'quotation': 'Quotation'
+}
+
+WORKFLOW_KEYWORDS = {
+    'approval': 'Document approval workflow',
+    'review': 'Review and approval process',
+    'payment': 'Payment processing workflow',
+    'order': 'Order fulfillment workflow',
+    'procurement': 'Procurement workflow'
+}
+
+INDUSTRY_KEYWORDS = {
+    'retail': ['shop', 'store', 'retail', 'sell', 'customer'],
+    'manufacturing': ['manufacture', 'production', 'factory', 'assembly'],
+    'healthcare': ['patient', 'medical', 'hospital', 'clinic', 'doctor'],
+    'education': ['student', 'course', 'school', 'university', 'education'],
+    'services': ['service', 'consulting', 'support', 'maintenance']
+}
+
+COMPLEXITY_INDICATORS = {
+    'simple': ['basic', 'simple', 'straightforward', 'quick'],
+    'medium': ['integrate', 'workflow', 'reports', 'dashboard'],
+    'complex': ['advanced', 'complex', 'integration', 'api', 'custom']
+}
+
+register_keywords(BUSINESS_KEYWORDS, DOCTYPE_KEYWORDS, WORKFLOW_KEYWORDS,
+                  *INDUSTRY_KEYWORDS.values(), *COMPLEXITY_INDICATORS.values())
+
 
 class ClaudeHooks:
     """Main Claude integration class for ERPNext App Builder"""
     
-    def __init__(self, mcp_client=None):
+    def __init__(self, mcp_client=None, history_size: int = DEFAULT_HISTORY_SIZE,
+                 history_path: Optional[str] = None):
         self.mcp_client = mcp_client
         self.session_context = {}
-        self.conversation_history = []
+        self.conversation_history = ConversationLog(history_size, history_path)
+    
+    def __enter__(self) -> 'ClaudeHooks':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the conversation history log"""
+        self.conversation_history.close()
         
-    def process_user_requirement(self, requirement: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def process_user_requirement(self, requirement: Union[str, RequirementDocument],
+                                 context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Process user requirement through Claude AI
         
         Args:
-            requirement: User's app requirement description
+            requirement: User's app requirement description or annotated RequirementDocument
             context: Additional context information
             
         Returns:
             Dict containing processed requirement and suggestions
         """
         try:
+            document = RequirementDocument.coerce(requirement)
+            
             # Store the requirement in conversation history
             self.conversation_history.append({
                 'timestamp': datetime.now().isoformat(),
                 'type': 'user_requirement',
-                'content': requirement,
+                'content': document.text,
                 'context': context or {}
             })
             
             # Process requirement using Claude
-            processed_result = self._analyze_requirement(requirement, context)
+            processed_result = self._analyze_requirement(document, context)
             
             # Store Claude's response
             self.conversation_history.append({
@@ -61,38 +127,33 @@ class ClaudeHooks:
                 'fallback_suggestions': self._get_fallback_suggestions(requirement)
             }
     
-    def _analyze_requirement(self, requirement: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _analyze_requirement(self, requirement: Union[str, RequirementDocument],
+                             context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Analyze user requirement and extract key information"""
+        document = RequirementDocument.coerce(requirement)
         
         # Basic requirement analysis
         analysis = {
             'success': True,
-            'requirement': requirement,
+            'requirement': document.text,
             'timestamp': datetime.now().isoformat(),
-            'extracted_entities': self._extract_entities(requirement),
-            'suggested_doctypes': self._suggest_doctypes(requirement),
-            'workflow_suggestions': self._suggest_workflows(requirement),
-            'industry_category': self._identify_industry(requirement),
-            'complexity_level': self._assess_complexity(requirement),
-            'next_steps': self._generate_next_steps(requirement)
+            'extracted_entities': self._extract_entities(document),
+            'suggested_doctypes': self._suggest_doctypes(document),
+            'workflow_suggestions': self._suggest_workflows(document),
+            'industry_category': self._identify_industry(document),
+            'complexity_level': self._assess_complexity(document),
+            'next_steps': self._generate_next_steps(document)
         }
         
         return analysis
     
-    def _extract_entities(self, requirement: str) -> List[Dict[str, str]]:
+    def _extract_entities(self, document: RequirementDocument) -> List[Dict[str, str]]:
         """Extract business entities from requirement text"""
         entities = []
         
         # Simple keyword-based entity extraction
-        business_keywords = [
-            'customer', 'client', 'vendor', 'supplier', 'employee', 'staff',
-            'product', 'item', 'service', 'order', 'invoice', 'payment',
-            'project', 'task', 'lead', 'opportunity', 'quotation', 'contract'
-        ]
-        
-        requirement_lower = requirement.lower()
-        for keyword in business_keywords:
-            if keyword in requirement_lower:
+        for keyword in BUSINESS_KEYWORDS:
+            if document.contains(keyword):
                 entities.append({
                     'name': keyword.title(),
                     'type': 'business_entity',
@@ -101,29 +162,13 @@ class ClaudeHooks:
         
         return entities
     
-    def _suggest_doctypes(self, requirement: str) -> List[Dict[str, Any]]:
+    def _suggest_doctypes(self, document: RequirementDocument) -> List[Dict[str, Any]]:
         """Suggest ERPNext DocTypes based on requirement"""
         suggestions = []
         
         # Map keywords to ERPNext DocTypes
-        doctype_mapping = {
-            'customer': 'Customer',
-            'supplier': 'Supplier',
-            'item': 'Item',
-            'product': 'Item',
-            'order': 'Sales Order',
-            'purchase': 'Purchase Order',
-            'invoice': 'Sales Invoice',
-            'employee': 'Employee',
-            'project': 'Project',
-            'task': 'Task',
-            'lead': 'Lead',
-            'quotation': 'Quotation'
-        }
-        
-        requirement_lower = requirement.lower()
-        for keyword, doctype in doctype_mapping.items():
-            if keyword in requirement_lower:
+        for keyword, doctype in DOCTYPE_KEYWORDS.items():
+            if document.contains(keyword):
                 suggestions.append({
                     'doctype': doctype,
                     'reason': f"Detected '{keyword}' in requirement",
@@ -132,21 +177,12 @@ class ClaudeHooks:
         
         return suggestions
     
-    def _suggest_workflows(self, requirement: str) -> List[Dict[str, str]]:
+    def _suggest_workflows(self, document: RequirementDocument) -> List[Dict[str, str]]:
         """Suggest workflows based on requirement"""
         workflows = []
         
-        workflow_patterns = {
-            'approval': 'Document approval workflow',
-            'review': 'Review and approval process',
-            'payment': 'Payment processing workflow',
-            'order': 'Order fulfillment workflow',
-            'procurement': 'Procurement workflow'
-        }
-        
-        requirement_lower = requirement.lower()
-        for pattern, workflow in workflow_patterns.items():
-            if pattern in requirement_lower:
+        for pattern, workflow in WORKFLOW_KEYWORDS.items():
+            if document.contains(pattern):
                 workflows.append({
                     'name': workflow,
                     'description': f"Workflow for {pattern} process"
@@ -154,45 +190,29 @@ class ClaudeHooks:
         
         return workflows
     
-    def _identify_industry(self, requirement: str) -> str:
+    def _identify_industry(self, document: RequirementDocument) -> str:
         """Identify industry category from requirement"""
-        industry_keywords = {
-            'retail': ['shop', 'store', 'retail', 'sell', 'customer'],
-            'manufacturing': ['manufacture', 'production', 'factory', 'assembly'],
-            'healthcare': ['patient', 'medical', 'hospital', 'clinic', 'doctor'],
-            'education': ['student', 'course', 'school', 'university', 'education'],
-            'services': ['service', 'consulting', 'support', 'maintenance']
-        }
-        
-        requirement_lower = requirement.lower()
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in requirement_lower for keyword in keywords):
+        for industry, keywords in INDUSTRY_KEYWORDS.items():
+            if document.contains_any(keywords):
                 return industry
         
         return 'general'
     
-    def _assess_complexity(self, requirement: str) -> str:
+    def _assess_complexity(self, document: RequirementDocument) -> str:
         """Assess complexity level of the requirement"""
-        complexity_indicators = {
-            'simple': ['basic', 'simple', 'straightforward', 'quick'],
-            'medium': ['integrate', 'workflow', 'reports', 'dashboard'],
-            'complex': ['advanced', 'complex', 'integration', 'api', 'custom']
-        }
-        
-        requirement_lower = requirement.lower()
-        for level, indicators in complexity_indicators.items():
-            if any(indicator in requirement_lower for indicator in indicators):
+        for level, indicators in COMPLEXITY_INDICATORS.items():
+            if document.contains_any(indicators):
                 return level
         
         # Default complexity based on length
-        if len(requirement.split()) > 50:
+        if document.word_count > 50:
             return 'complex'
-        elif len(requirement.split()) > 20:
+        elif document.word_count > 20:
             return 'medium'
         else:
             return 'simple'
     
-    def _generate_next_steps(self, requirement: str) -> List[str]:
+    def _generate_next_steps(self, document: RequirementDocument) -> List[str]:
         """Generate next steps for implementing the requirement"""
         steps = [
             "Review and refine the requirement specification",
@@ -214,11 +234,24 @@ class ClaudeHooks:
             "Think about user roles and permissions needed"
         ]
     
-    def get_conversation_history(self) -> List[Dict[str, Any]]:
-        """Get the conversation history"""
-        return self.conversation_history
+    def get_conversation_history(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the conversation history, oldest turn first
+        
+        Args:
+            offset: Index of the first turn to return
+            limit: Maximum number of turns to return, or None for all
+            
+        Returns:
+            Conversation turns; older turns come from the history log on disk
+        """
+        return self.conversation_history.read(offset, limit)
+    
+    def get_conversation_summaries(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get compact summaries of conversation turns; summaries of older turns are rebuilt from the history log"""
+        return self.conversation_history.summaries(offset, limit)
     
     def clear_conversation(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
         self.session_context = {}
\ No newline at end of file
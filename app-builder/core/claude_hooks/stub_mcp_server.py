@@ -0,0 +1,231 @@
+"""
+Stub MCP Server for ERPNext App Builder
+
+This module provides a local asyncio HTTP server that answers MCP health
+checks and prompts with the mock Claude responses after a configurable
+latency, so AsyncAIInterface can be exercised and benchmarked offline.
+
+Run from the app-builder directory:
+
+    python -m core.claude_hooks.stub_mcp_server serve --port 3000 --latency 0.2
+    python -m core.claude_hooks.stub_mcp_server bench --prompts 500 --concurrency 100
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, Any, Optional
+
+from .ai_interface import AIInterface
+from .async_ai_interface import AsyncAIInterface, read_http_message, DEFAULT_MAX_CONCURRENCY
+
+DEFAULT_LATENCY = 0.05
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 503: 'Service Unavailable'}
+
+
+class StubMCPServer:
+    """Keep-alive HTTP server imitating the MCP server's prompt endpoint
+    
+    Every request waits ``latency`` seconds plus up to ``jitter`` more, and
+    fails with HTTP 503 at ``failure_rate``, before it is answered.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = DEFAULT_LATENCY,
+                 jitter: float = 0.0, failure_rate: float = 0.0, prompt_path: str = "/prompt"):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.prompt_path = prompt_path
+        self._mock = AIInterface()
+        self._server = None
+        self._handlers = set()
+        self._stats = {
+            'requests': 0,
+            'failures_injected': 0,
+            'connections': 0,
+            'in_flight': 0,
+            'max_in_flight': 0
+        }
+    
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    async def start(self) -> 'StubMCPServer':
+        """Start listening, picking a free port when ``port`` is 0"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+    
+    async def stop(self):
+        """Stop listening and drop every open connection"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        
+        handlers = list(self._handlers)
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+    
+    async def __aenter__(self) -> 'StubMCPServer':
+        return await self.start()
+    
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request and connection counts"""
+        return dict(self._stats)
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it"""
+        self._stats['connections'] += 1
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            while True:
+                try:
+                    request_line, headers, body = await read_http_message(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                
+                self._stats['requests'] += 1
+                self._stats['in_flight'] += 1
+                self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self._stats['in_flight'])
+                try:
+                    status, response = await self._respond(request_line, body)
+                finally:
+                    self._stats['in_flight'] -= 1
+                
+                payload = json.dumps(response).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write((
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                ).encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(handler)
+            writer.close()
+    
+    async def _respond(self, request_line: str, body: bytes):
+        """Build the status and JSON body answering a request"""
+        method, path = request_line.split(' ')[:2]
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+        
+        if self.failure_rate and random.random() < self.failure_rate:
+            self._stats['failures_injected'] += 1
+            return 503, {'success': False, 'error': 'Injected failure'}
+        
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'healthy', 'service': 'stub-mcp-server'}
+        
+        if method == 'POST' and path == self.prompt_path:
+            try:
+                prompt = json.loads(body)
+            except ValueError:
+                return 400, {'success': False, 'error': 'Invalid JSON'}
+            return 200, self._mock._mock_claude_response(prompt.get('user_prompt', ''), prompt.get('context'))
+        
+        return 404, {'success': False, 'error': f"No route for {method} {path}"}
+
+
+async def benchmark(prompts: int = 200, concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                    latency: float = DEFAULT_LATENCY, jitter: float = 0.0,
+                    failure_rate: float = 0.0, server_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Send prompts concurrently through AsyncAIInterface and measure throughput
+    
+    Args:
+        prompts: Number of prompts to send, all at once
+        concurrency: AsyncAIInterface's cap on prompts in flight
+        latency: Stub server latency per request in seconds
+        jitter: Extra random stub latency of up to this many seconds
+        failure_rate: Share of stub requests answered with HTTP 503
+        server_url: Benchmark this server instead of starting a stub
+    
+    Returns:
+        Throughput, success count and both sides' statistics
+    """
+    server = None
+    if server_url is None:
+        server = await StubMCPServer(latency=latency, jitter=jitter, failure_rate=failure_rate).start()
+        server_url = server.url
+    
+    try:
+        async with AsyncAIInterface(server_url, max_concurrency=concurrency) as interface:
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                interface.analyze_requirement(f"Requirement {index}: track customers and sales orders")
+                for index in range(prompts)
+            ))
+            elapsed = time.perf_counter() - started
+            interface_stats = interface.get_stats()
+    finally:
+        if server is not None:
+            await server.stop()
+    
+    return {
+        'prompts': prompts,
+        'successes': sum(1 for result in results if result.get('success')),
+        'elapsed_seconds': round(elapsed, 3),
+        'prompts_per_second': round(prompts / elapsed, 1) if elapsed else None,
+        'interface': interface_stats,
+        'server': server.get_stats() if server is not None else None
+    }
+
+
+def main(argv=None):
+    """Serve the stub or benchmark against it from the command line"""
+    parser = argparse.ArgumentParser(description="Stub MCP server for offline AsyncAIInterface testing")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    serve = commands.add_parser('serve', help="Run the stub server until interrupted")
+    serve.add_argument('--host', default="127.0.0.1")
+    serve.add_argument('--port', type=int, default=3000)
+    
+    bench = commands.add_parser('bench', help="Measure prompt throughput through AsyncAIInterface")
+    bench.add_argument('--prompts', type=int, default=200)
+    bench.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY)
+    bench.add_argument('--server-url', default=None, help="Benchmark a running server instead of a stub")
+    
+    for command in (serve, bench):
+        command.add_argument('--latency', type=float, default=DEFAULT_LATENCY)
+        command.add_argument('--jitter', type=float, default=0.0)
+        command.add_argument('--failure-rate', type=float, default=0.0)
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'bench':
+        result = asyncio.run(benchmark(args.prompts, args.concurrency, args.latency, args.jitter,
+                                       args.failure_rate, args.server_url))
+        print(json.dumps(result, indent=2))
+        return
+    
+    async def serve_forever():
+        server = await StubMCPServer(args.host, args.port, args.latency, args.jitter, args.failure_rate).start()
+        print(f"Stub MCP server listening on {server.url}")
+        await server._server.serve_forever()
+    
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,18 @@ for intelligent ERPNext application generation.
 
 from .context_processor import ContextProcessor
 from .requirement_parser import RequirementParser
-from .domain_knowledge import DomainKnowledge
+from .domain_knowledge import DomainKnowledge, thaw
+from .requirement_document import RequirementDocument
+from .keyword_automaton import KeywordAutomaton, register_keywords
+from .rule_extractor import BusinessRuleExtractor
+from .bounded_cache import BoundedCache
+from .sentence_cache import SentenceCache
+from .sentence_segmenter import segment_sentences, split_sentences
+from .records import ActionRecord, ConstraintRecord
+from .context_store import ContextStore, MemoryContextStore, SQLiteContextStore
 
-__all__ = ['ContextProcessor', 'RequirementParser', 'DomainKnowledge']
\ No newline at end of file
+__all__ = ['ContextProcessor', 'RequirementParser', 'DomainKnowledge', 'thaw', 'RequirementDocument',
+           'KeywordAutomaton', 'register_keywords', 'BusinessRuleExtractor',
+           'BoundedCache', 'SentenceCache', 'segment_sentences', 'split_sentences',
+           'ActionRecord', 'ConstraintRecord',
+           'ContextStore', 'MemoryContextStore', 'SQLiteContextStore']
\ No newline at end of file
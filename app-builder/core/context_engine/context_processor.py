@@ -7,75 +7,215 @@ including user requirements, domain knowledge, and application state.
 
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
 from datetime import datetime
 import re
+from collections import deque
+
+from .requirement_document import RequirementDocument, KeywordSummary
+from .pattern_scanner import PatternScanner
+from .keyword_automaton import register_keywords
+from .sentence_cache import SentenceCache, DEFAULT_SENTENCE_CACHE_SIZE
+from .context_store import ContextStore, MemoryContextStore
 
 logger = logging.getLogger(__name__)
 
+# Most recent processed requirements kept in the history
+DEFAULT_HISTORY_SIZE = 1000
+
+# Common business entity keywords (a trailing plural 's' also matches)
+ENTITY_KEYWORDS = {
+    'customer': ('customer', 'client', 'buyer', 'purchaser'),
+    'supplier': ('supplier', 'vendor', 'provider'),
+    'product': ('product', 'item', 'good', 'merchandise'),
+    'service': ('service', 'offering'),
+    'order': ('order', 'purchase', 'sale'),
+    'invoice': ('invoice', 'bill', 'receipt'),
+    'payment': ('payment', 'transaction', 'billing'),
+    'employee': ('employee', 'staff', 'worker', 'personnel'),
+    'project': ('project', 'initiative', 'program'),
+    'task': ('task', 'activity', 'assignment', 'job'),
+    'lead': ('lead', 'prospect', 'opportunity'),
+    'quotation': ('quotation', 'quote', 'proposal', 'estimate'),
+    'contract': ('contract', 'agreement', 'deal'),
+    'report': ('report', 'analysis', 'summary'),
+    'dashboard': ('dashboard', 'overview', 'summary')
+}
+
+# Common business process keywords
+PROCESS_KEYWORDS = {
+    'sales_process': ('sell', 'sales', 'selling', 'revenue'),
+    'purchase_process': ('buy', 'purchase', 'procurement', 'sourcing'),
+    'inventory_management': ('inventory', 'stock', 'warehouse', 'storage'),
+    'customer_management': ('customer service', 'crm', 'customer relation'),
+    'project_management': ('project', 'task', 'milestone', 'timeline'),
+    'hr_process': ('employee', 'hr', 'human resource', 'payroll'),
+    'financial_process': ('accounting', 'finance', 'budget', 'expense'),
+    'manufacturing': ('manufacture', 'production', 'assembly', 'fabrication'),
+    'quality_control': ('quality', 'inspection', 'testing', 'compliance'),
+    'reporting': ('report', 'analytics', 'dashboard', 'metrics')
+}
+
+# Technical capability keywords
+TECHNICAL_KEYWORDS = {
+    'integration': ('integrate', 'api', 'connect', 'sync', 'import', 'export'),
+    'automation': ('automate', 'automatic', 'trigger', 'workflow'),
+    'reporting': ('report', 'dashboard', 'analytics', 'chart', 'graph'),
+    'mobile': ('mobile', 'app', 'smartphone', 'tablet'),
+    'email': ('email', 'notification', 'alert', 'remind'),
+    'permissions': ('permission', 'role', 'access', 'security', 'approval'),
+    'customization': ('custom', 'customize', 'specific', 'unique'),
+    'performance': ('fast', 'quick', 'performance', 'speed', 'efficient')
+}
+
+# Substring keywords for industry classification, complexity and module hints
+INDUSTRY_KEYWORDS = {
+    'manufacturing': ['manufacture', 'production', 'factory', 'assembly'],
+    'retail': ['retail', 'store', 'shop', 'customer'],
+    'services': ['service', 'consulting', 'support'],
+    'healthcare': ['patient', 'medical', 'hospital', 'clinic'],
+    'education': ['student', 'course', 'school', 'university'],
+    'technology': ['software', 'development', 'tech', 'digital']
+}
+
+COMPLEXITY_INDICATORS = {
+    'integration': 'high',
+    'workflow': 'medium',
+    'custom': 'high',
+    'report': 'low',
+    'dashboard': 'medium',
+    'automation': 'high',
+    'approval': 'medium'
+}
+
+MODULE_KEYWORDS = {
+    'Accounting': ['accounting', 'finance'],
+    'HR': ['hr', 'employee'],
+    'Buying': ['purchase'],
+    'Selling': ['sales']
+}
+
+FALLBACK_BUSINESS_TERMS = ['customer', 'order', 'product', 'service']
+
+# Whole words looked up in the requirement
+KEY_PHRASE_TERMS = ['management', 'system', 'process', 'tracking', 'monitoring', 'analysis']
+
+ACTION_VERBS = [
+    'manage', 'track', 'monitor', 'create', 'generate', 'process',
+    'handle', 'maintain', 'update', 'calculate', 'analyze', 'report',
+    'approve', 'review', 'schedule', 'assign', 'allocate', 'integrate'
+]
+
+BUSINESS_TERMS = [
+    'workflow', 'approval', 'inventory', 'sales', 'purchase',
+    'customer', 'supplier', 'project', 'task', 'invoice',
+    'payment', 'quotation', 'delivery', 'shipment', 'quality'
+]
+
+TRACKED_WORDS = frozenset(ACTION_VERBS) | frozenset(BUSINESS_TERMS)
+
+register_keywords(COMPLEXITY_INDICATORS, FALLBACK_BUSINESS_TERMS,
+                  *INDUSTRY_KEYWORDS.values(), *MODULE_KEYWORDS.values())
+
+_context_scanner = None
+
+
+def get_context_scanner() -> PatternScanner:
+    """Return the process-wide scanner for entity, process and technical keywords"""
+    global _context_scanner
+    if _context_scanner is None:
+        _context_scanner = PatternScanner({
+            'entities': (ENTITY_KEYWORDS, True),
+            'processes': (PROCESS_KEYWORDS, False),
+            'technical': (TECHNICAL_KEYWORDS, False)
+        })
+    return _context_scanner
+
 
 class ContextProcessor:
-    """Main context processing engine for app generation"""
+    """Main context processing engine for app generation
     
-    def __init__(self):
-        self.context_store = {}
-        self.requirement_history = []
+    One instance can serve many threads: its tables are read-only after
+    construction, and the context store, sentence cache and history lock
+    around every change.
+    """
+    
+    def __init__(self, sentence_cache_size: int = DEFAULT_SENTENCE_CACHE_SIZE,
+                 context_store: Optional[ContextStore] = None,
+                 history_size: int = DEFAULT_HISTORY_SIZE):
+        self.context_store = context_store if context_store is not None else MemoryContextStore()
+        self.requirement_history = deque(maxlen=history_size)
+        self._history_lock = threading.Lock()
         self.domain_entities = {}
         self.business_rules = []
         self.user_preferences = {}
+        self.sentence_cache = SentenceCache(sentence_cache_size)
         
-    def process_requirement(self, requirement: str, user_context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def process_requirement(self, requirement: Union[str, RequirementDocument],
+                            user_context: Dict[str, Any] = None, incremental: bool = False) -> Dict[str, Any]:
         """
         Process user requirement and build comprehensive context
         
         Args:
-            requirement: User's business requirement
+            requirement: User's business requirement or annotated RequirementDocument
             user_context: Additional user-provided context
+            incremental: Reuse cached analysis for sentences seen in earlier calls,
+                         so re-processing an edited requirement only analyzes what changed
             
         Returns:
             Processed context with extracted entities and insights
         """
         try:
+            document = RequirementDocument.coerce(requirement)
+            if incremental:
+                analysis = self._analyze_incrementally(document)
+            else:
+                analysis = self._analyze_text(document)
+            
             # Parse and structure the requirement
-            parsed_requirement = self._parse_requirement(requirement)
+            parsed_requirement = self._parse_requirement(document, analysis)
+            
+            # Entity, process and technical keyword matches from a single scan
+            keyword_matches = analysis['keyword_matches']
             
             # Extract business entities
-            entities = self._extract_business_entities(requirement)
+            entities = self._extract_business_entities(keyword_matches['entities'])
             
             # Identify business processes
-            processes = self._identify_business_processes(requirement)
+            processes = self._identify_business_processes(keyword_matches['processes'])
             
             # Determine data relationships
             relationships = self._analyze_data_relationships(entities)
             
             # Assess technical requirements
-            technical_needs = self._assess_technical_requirements(requirement)
+            technical_needs = self._assess_technical_requirements(keyword_matches['technical'])
             
             # Build comprehensive context
             context = {
                 'timestamp': datetime.now().isoformat(),
-                'original_requirement': requirement,
+                'original_requirement': document.text,
                 'parsed_requirement': parsed_requirement,
                 'business_entities': entities,
                 'business_processes': processes,
                 'data_relationships': relationships,
                 'technical_requirements': technical_needs,
                 'user_context': user_context or {},
-                'domain_insights': self._get_domain_insights(requirement),
-                'complexity_assessment': self._assess_complexity(requirement, entities, processes)
+                'domain_insights': self._get_domain_insights(analysis['keywords']),
+                'complexity_assessment': self._assess_complexity(analysis, entities, processes)
             }
             
             # Store in context store
-            context_id = self._generate_context_id()
-            self.context_store[context_id] = context
+            context_id = self.context_store.add(context)
             
             # Add to requirement history
-            self.requirement_history.append({
-                'context_id': context_id,
-                'timestamp': datetime.now().isoformat(),
-                'requirement': requirement,
-                'processing_result': 'success'
-            })
+            with self._history_lock:
+                self.requirement_history.append({
+                    'context_id': context_id,
+                    'timestamp': datetime.now().isoformat(),
+                    'requirement': document.text,
+                    'processing_result': 'success'
+                })
             
             return {
                 'success': True,
@@ -91,51 +231,121 @@ class ContextProcessor:
                 'partial_context': self._create_fallback_context(requirement)
             }
     
-    def _parse_requirement(self, requirement: str) -> Dict[str, Any]:
+    def _analyze_text(self, document: RequirementDocument) -> Dict[str, Any]:
+        """
+        Collect the word and keyword statistics the context is built from
+        
+        Returns:
+            word_count, key_phrases, words (set of words, at least the
+            TRACKED_WORDS present), keyword_matches (scanner result) and
+            keywords (anything answering contains/contains_any)
+        """
+        return {
+            'word_count': document.word_count,
+            'key_phrases': self._extract_key_phrases(document),
+            'words': document.word_set,
+            'keyword_matches': self._scan_keywords(document),
+            'keywords': document
+        }
+    
+    def _analyze_incrementally(self, document: RequirementDocument) -> Dict[str, Any]:
+        """Collect the same statistics as _analyze_text from cached per-unit analyses"""
+        text = document.text
+        word_count = 0
+        key_phrases = []
+        words: Set[str] = set()
+        keyword_matches: Dict[str, Dict[str, List[str]]] = {table: {} for table in get_context_scanner().tables}
+        keywords = KeywordSummary()
+        previous_word = None
+        
+        for start, end in self._find_analysis_units(document):
+            unit_text = text[start:end]
+            key = SentenceCache.key(unit_text)
+            unit = self.sentence_cache.get(key)
+            if unit is None:
+                unit = self._analyze_unit(unit_text)
+                self.sentence_cache.put(key, unit)
+            
+            # A key phrase can pair a unit's first word with the previous unit's last word
+            if previous_word is not None and unit['first_word'] in KEY_PHRASE_TERMS:
+                key_phrases.append(f"{previous_word} {unit['first_word']}")
+            key_phrases.extend(unit['key_phrases'])
+            if unit['last_word'] is not None:
+                previous_word = unit['last_word']
+            
+            word_count += unit['word_count']
+            words.update(unit['words'])
+            for table, categories in unit['keyword_matches'].items():
+                merged = keyword_matches[table]
+                for category, matches in categories.items():
+                    merged.setdefault(category, []).extend(matches)
+            keywords.update(unit['keywords'])
+        
+        return {
+            'word_count': word_count,
+            'key_phrases': key_phrases,
+            'words': words,
+            'keyword_matches': keyword_matches,
+            'keywords': keywords
+        }
+    
+    def _find_analysis_units(self, document: RequirementDocument) -> List[Tuple[int, int]]:
+        """
+        Split the text into runs of whole sentences that can be analyzed separately
+        
+        Units only break where a sentence starts after whitespace, so no word,
+        keyword or key phrase lookahead spans two units.
+        """
+        text = document.text
+        breaks = [0]
+        for start, _ in document.sentence_spans:
+            if start > 0 and text[start - 1].isspace():
+                breaks.append(start)
+        breaks.append(len(text))
+        return [(start, end) for start, end in zip(breaks, breaks[1:]) if start < end]
+    
+    def _analyze_unit(self, text: str) -> Dict[str, Any]:
+        """Analyze one unit of the text for _analyze_incrementally"""
+        document = RequirementDocument(text)
+        words = document.words
+        return {
+            'word_count': len(words),
+            'first_word': words[0] if words else None,
+            'last_word': words[-1] if words else None,
+            'key_phrases': self._extract_key_phrases(document),
+            'words': sorted(document.word_set & TRACKED_WORDS),
+            'keyword_matches': self._scan_keywords(document),
+            'keywords': sorted(document.keyword_offsets)
+        }
+    
+    def _parse_requirement(self, document: RequirementDocument, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Parse requirement text into structured components"""
         
         # Extract key phrases and components
-        sentences = self._split_into_sentences(requirement)
-        key_phrases = self._extract_key_phrases(requirement)
-        action_verbs = self._extract_action_verbs(requirement)
-        business_terms = self._extract_business_terms(requirement)
+        sentences = list(document.sentences)
+        key_phrases = analysis['key_phrases']
+        action_verbs = self._extract_action_verbs(analysis['words'])
+        business_terms = self._extract_business_terms(analysis['words'])
         
         return {
             'sentences': sentences,
             'key_phrases': key_phrases,
             'action_verbs': action_verbs,
             'business_terms': business_terms,
-            'word_count': len(requirement.split()),
+            'word_count': analysis['word_count'],
             'sentence_count': len(sentences)
         }
     
-    def _extract_business_entities(self, requirement: str) -> List[Dict[str, Any]]:
-        """Extract business entities from requirement text"""
+    def _scan_keywords(self, document: RequirementDocument) -> Dict[str, Dict[str, List[str]]]:
+        """Scan the requirement once for every entity, process and technical keyword"""
+        return get_context_scanner().scan(document.lower)
+    
+    def _extract_business_entities(self, entity_matches: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        """Extract business entities from scanned entity keyword matches"""
         entities = []
         
-        # Common business entity patterns
-        entity_patterns = {
-            'customer': r'\b(customer|client|buyer|purchaser)s?\b',
-            'supplier': r'\b(supplier|vendor|provider)s?\b',
-            'product': r'\b(product|item|good|merchandise)s?\b',
-            'service': r'\b(service|offering)s?\b',
-            'order': r'\b(order|purchase|sale)s?\b',
-            'invoice': r'\b(invoice|bill|receipt)s?\b',
-            'payment': r'\b(payment|transaction|billing)s?\b',
-            'employee': r'\b(employee|staff|worker|personnel)s?\b',
-            'project': r'\b(project|initiative|program)s?\b',
-            'task': r'\b(task|activity|assignment|job)s?\b',
-            'lead': r'\b(lead|prospect|opportunity)s?\b',
-            'quotation': r'\b(quotation|quote|proposal|estimate)s?\b',
-            'contract': r'\b(contract|agreement|deal)s?\b',
-            'report': r'\b(report|analysis|summary)s?\b',
-            'dashboard': r'\b(dashboard|overview|summary)s?\b'
-        }
-        
-        requirement_lower = requirement.lower()
-        
-        for entity_type, pattern in entity_patterns.items():
-            matches = re.findall(pattern, requirement_lower, re.IGNORECASE)
+        for entity_type in ENTITY_KEYWORDS:
+            matches = entity_matches.get(entity_type)
             if matches:
                 entities.append({
                     'type': entity_type,
@@ -147,32 +357,17 @@ class ContextProcessor:
         
         return sorted(entities, key=lambda x: x['priority'], reverse=True)
     
-    def _identify_business_processes(self, requirement: str) -> List[Dict[str, Any]]:
-        """Identify business processes from requirement"""
+    def _identify_business_processes(self, process_matches: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        """Identify business processes from scanned process keyword matches"""
         processes = []
         
-        # Common business process patterns
-        process_patterns = {
-            'sales_process': r'\b(sell|sales|selling|revenue)\b',
-            'purchase_process': r'\b(buy|purchase|procurement|sourcing)\b',
-            'inventory_management': r'\b(inventory|stock|warehouse|storage)\b',
-            'customer_management': r'\b(customer service|crm|customer relation)\b',
-            'project_management': r'\b(project|task|milestone|timeline)\b',
-            'hr_process': r'\b(employee|hr|human resource|payroll)\b',
-            'financial_process': r'\b(accounting|finance|budget|expense)\b',
-            'manufacturing': r'\b(manufacture|production|assembly|fabrication)\b',
-            'quality_control': r'\b(quality|inspection|testing|compliance)\b',
-            'reporting': r'\b(report|analytics|dashboard|metrics)\b'
-        }
-        
-        requirement_lower = requirement.lower()
-        
-        for process_type, pattern in process_patterns.items():
-            if re.search(pattern, requirement_lower, re.IGNORECASE):
+        for process_type in PROCESS_KEYWORDS:
+            matches = process_matches.get(process_type)
+            if matches:
                 processes.append({
                     'type': process_type,
                     'name': process_type.replace('_', ' ').title(),
-                    'confidence': self._calculate_process_confidence(pattern, requirement_lower),
+                    'confidence': self._calculate_process_confidence(len(matches)),
                     'suggested_workflows': self._suggest_workflows_for_process(process_type)
                 })
         
@@ -209,25 +404,12 @@ class ContextProcessor:
         
         return relationships
     
-    def _assess_technical_requirements(self, requirement: str) -> Dict[str, Any]:
-        """Assess technical requirements from the business requirement"""
-        
-        technical_keywords = {
-            'integration': r'\b(integrate|api|connect|sync|import|export)\b',
-            'automation': r'\b(automate|automatic|trigger|workflow)\b',
-            'reporting': r'\b(report|dashboard|analytics|chart|graph)\b',
-            'mobile': r'\b(mobile|app|smartphone|tablet)\b',
-            'email': r'\b(email|notification|alert|remind)\b',
-            'permissions': r'\b(permission|role|access|security|approval)\b',
-            'customization': r'\b(custom|customize|specific|unique)\b',
-            'performance': r'\b(fast|quick|performance|speed|efficient)\b'
-        }
-        
+    def _assess_technical_requirements(self, technical_matches: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Assess technical requirements from scanned technical keyword matches"""
         requirements = {}
-        requirement_lower = requirement.lower()
         
-        for tech_type, pattern in technical_keywords.items():
-            if re.search(pattern, requirement_lower, re.IGNORECASE):
+        for tech_type in TECHNICAL_KEYWORDS:
+            if technical_matches.get(tech_type):
                 requirements[tech_type] = {
                     'required': True,
                     'priority': 'high' if tech_type in ['integration', 'automation'] else 'medium',
@@ -236,17 +418,17 @@ class ContextProcessor:
         
         return requirements
     
-    def _get_domain_insights(self, requirement: str) -> Dict[str, Any]:
+    def _get_domain_insights(self, keywords: Union[RequirementDocument, KeywordSummary]) -> Dict[str, Any]:
         """Get domain-specific insights based on the requirement"""
         
         # Industry classification
-        industry = self._classify_industry(requirement)
+        industry = self._classify_industry(keywords)
         
         # Common patterns for the industry
         industry_patterns = self._get_industry_patterns(industry)
         
         # Recommended modules
-        recommended_modules = self._recommend_modules(requirement, industry)
+        recommended_modules = self._recommend_modules(keywords, industry)
         
         return {
             'industry': industry,
@@ -255,30 +437,20 @@ class ContextProcessor:
             'best_practices': self._get_industry_best_practices(industry)
         }
     
-    def _assess_complexity(self, requirement: str, entities: List[Dict], processes: List[Dict]) -> Dict[str, Any]:
+    def _assess_complexity(self, analysis: Dict[str, Any], entities: List[Dict],
+                           processes: List[Dict]) -> Dict[str, Any]:
         """Assess the complexity of implementing the requirement"""
         
         # Complexity factors
         entity_count = len(entities)
         process_count = len(processes)
-        word_count = len(requirement.split())
+        word_count = analysis['word_count']
         
         # Complexity indicators
-        complexity_indicators = {
-            'integration': 'high',
-            'workflow': 'medium',
-            'custom': 'high',
-            'report': 'low',
-            'dashboard': 'medium',
-            'automation': 'high',
-            'approval': 'medium'
-        }
-        
-        requirement_lower = requirement.lower()
         detected_complexities = []
         
-        for indicator, level in complexity_indicators.items():
-            if indicator in requirement_lower:
+        for indicator, level in COMPLEXITY_INDICATORS.items():
+            if analysis['keywords'].contains(indicator):
                 detected_complexities.append(level)
         
         # Calculate overall complexity
@@ -313,49 +485,29 @@ class ContextProcessor:
             'recommended_approach': self._recommend_approach(complexity_level)
         }
     
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """Split text into sentences"""
-        return [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
-    
-    def _extract_key_phrases(self, text: str) -> List[str]:
+    def _extract_key_phrases(self, document: RequirementDocument) -> List[str]:
         """Extract key phrases from text"""
         # Simple noun phrase extraction
-        words = text.lower().split()
+        words = document.words
         phrases = []
         
         # Look for important business terms
-        business_terms = ['management', 'system', 'process', 'tracking', 'monitoring', 'analysis']
-        
         for i, word in enumerate(words):
-            if word in business_terms and i > 0:
+            if word in KEY_PHRASE_TERMS and i > 0:
                 # Include the preceding word
                 phrases.append(f"{words[i-1]} {word}")
         
         return phrases
     
-    def _extract_action_verbs(self, text: str) -> List[str]:
+    def _extract_action_verbs(self, words: Set[str]) -> List[str]:
         """Extract action verbs that indicate functionality"""
-        action_verbs = [
-            'manage', 'track', 'monitor', 'create', 'generate', 'process',
-            'handle', 'maintain', 'update', 'calculate', 'analyze', 'report',
-            'approve', 'review', 'schedule', 'assign', 'allocate', 'integrate'
-        ]
-        
-        words = text.lower().split()
-        found_verbs = [verb for verb in action_verbs if verb in words]
+        found_verbs = [verb for verb in ACTION_VERBS if verb in words]
         
         return found_verbs
     
-    def _extract_business_terms(self, text: str) -> List[str]:
+    def _extract_business_terms(self, words: Set[str]) -> List[str]:
         """Extract business-specific terminology"""
-        business_terms = [
-            'workflow', 'approval', 'inventory', 'sales', 'purchase',
-            'customer', 'supplier', 'project', 'task', 'invoice',
-            'payment', 'quotation', 'delivery', 'shipment', 'quality'
-        ]
-        
-        words = text.lower().split()
-        found_terms = [term for term in business_terms if term in words]
+        found_terms = [term for term in BUSINESS_TERMS if term in words]
         
         return found_terms
     
@@ -373,9 +525,8 @@ class ContextProcessor:
         
         return base_priority.get(entity_type, 50) + (occurrences * 5)
     
-    def _calculate_process_confidence(self, pattern: str, text: str) -> float:
+    def _calculate_process_confidence(self, matches: int) -> float:
         """Calculate confidence level for identified process"""
-        matches = len(re.findall(pattern, text, re.IGNORECASE))
         return min(0.5 + (matches * 0.2), 1.0)
     
     def _suggest_workflows_for_process(self, process_type: str) -> List[str]:
@@ -390,21 +541,10 @@ class ContextProcessor:
         
         return workflow_suggestions.get(process_type, ['Custom Workflow'])
     
-    def _classify_industry(self, requirement: str) -> str:
+    def _classify_industry(self, document: Union[RequirementDocument, KeywordSummary]) -> str:
         """Classify the industry based on requirement text"""
-        industry_keywords = {
-            'manufacturing': ['manufacture', 'production', 'factory', 'assembly'],
-            'retail': ['retail', 'store', 'shop', 'customer'],
-            'services': ['service', 'consulting', 'support'],
-            'healthcare': ['patient', 'medical', 'hospital', 'clinic'],
-            'education': ['student', 'course', 'school', 'university'],
-            'technology': ['software', 'development', 'tech', 'digital']
-        }
-        
-        requirement_lower = requirement.lower()
-        
-        for industry, keywords in industry_keywords.items():
-            if any(keyword in requirement_lower for keyword in keywords):
+        for industry, keywords in INDUSTRY_KEYWORDS.items():
+            if document.contains_any(keywords):
                 return industry
         
         return 'general'
@@ -421,7 +561,7 @@ class ContextProcessor:
         
         return patterns.get(industry, ['Standard Business Processes'])
     
-    def _recommend_modules(self, requirement: str, industry: str) -> List[str]:
+    def _recommend_modules(self, document: Union[RequirementDocument, KeywordSummary], industry: str) -> List[str]:
         """Recommend ERPNext modules based on requirement and industry"""
         base_modules = ['Custom DocTypes', 'Workflows', 'Reports']
         
@@ -436,15 +576,9 @@ class ContextProcessor:
         recommended = base_modules + industry_modules.get(industry, [])
         
         # Add modules based on keywords in requirement
-        requirement_lower = requirement.lower()
-        if 'accounting' in requirement_lower or 'finance' in requirement_lower:
-            recommended.append('Accounting')
-        if 'hr' in requirement_lower or 'employee' in requirement_lower:
-            recommended.append('HR')
-        if 'purchase' in requirement_lower:
-            recommended.append('Buying')
-        if 'sales' in requirement_lower:
-            recommended.append('Selling')
+        for module, keywords in MODULE_KEYWORDS.items():
+            if document.contains_any(keywords):
+                recommended.append(module)
         
         return list(set(recommended))
     
@@ -494,20 +628,15 @@ class ContextProcessor:
         
         return approaches.get(complexity_level, 'Standard implementation approach')
     
-    def _generate_context_id(self) -> str:
-        """Generate unique context ID"""
-        import uuid
-        return str(uuid.uuid4())[:8]
-    
-    def _create_fallback_context(self, requirement: str) -> Dict[str, Any]:
+    def _create_fallback_context(self, requirement: Union[str, RequirementDocument]) -> Dict[str, Any]:
         """Create basic fallback context when processing fails"""
+        document = RequirementDocument.coerce(requirement)
         return {
-            'original_requirement': requirement,
+            'original_requirement': document.text,
             'processing_status': 'partial',
             'basic_analysis': {
-                'word_count': len(requirement.split()),
-                'contains_business_terms': any(term in requirement.lower() 
-                                             for term in ['customer', 'order', 'product', 'service'])
+                'word_count': document.word_count,
+                'contains_business_terms': document.contains_any(FALLBACK_BUSINESS_TERMS)
             }
         }
     
@@ -517,11 +646,13 @@ class ContextProcessor:
     
     def update_context(self, context_id: str, updates: Dict[str, Any]) -> bool:
         """Update existing context"""
-        if context_id in self.context_store:
-            self.context_store[context_id].update(updates)
-            return True
-        return False
+        return self.context_store.merge(context_id, updates)
     
     def get_requirement_history(self) -> List[Dict[str, Any]]:
-        """Get history of processed requirements"""
-        return self.requirement_history
\ No newline at end of file
+        """Get history of processed requirements, oldest first"""
+        with self._history_lock:
+            return list(self.requirement_history)
+    
+    def get_store_stats(self) -> Dict[str, Any]:
+        """Get context store size and eviction statistics"""
+        return self.context_store.get_stats()
\ No newline at end of file
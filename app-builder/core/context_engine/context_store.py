@@ -0,0 +1,376 @@
+"""
+Context Store for ERPNext App Builder
+
+This module keeps processed requirement contexts under a bounded budget.
+The in-memory store evicts the least recently used contexts once it holds
+too many or too large ones and expires contexts after a time to live; the
+SQLite store keeps contexts on disk so long-running workers stay small and
+contexts survive restarts.
+"""
+
+import json
+import time
+import uuid
+import zlib
+import sqlite3
+import logging
+import threading
+from abc import abstractmethod
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTEXT_ENTRIES = 1024
+DEFAULT_CONTEXT_BYTES = 64 * 1024 * 1024
+DEFAULT_CONTEXT_TTL_SECONDS = 24 * 3600
+
+# Minimum seconds between scans of the in-memory store for expired contexts
+EXPIRY_SWEEP_INTERVAL = 1.0
+
+
+def new_context_id() -> str:
+    """Generate a 128-bit random context ID"""
+    return uuid.uuid4().hex
+
+
+def context_size(context: Dict[str, Any]) -> int:
+    """Approximate the memory a context takes by the length of its JSON encoding"""
+    return len(json.dumps(context, default=_context_value))
+
+
+def _context_value(value: Any) -> Any:
+    """Turn context values json cannot encode into plain ones"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+class ContextStore(MutableMapping):
+    """Mapping of context IDs to processed contexts
+    
+    Stores may drop contexts on their own (eviction, expiry), so a context
+    that was stored is not guaranteed to be found later. ``merge`` applies
+    updates to a stored context in a way every store persists.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+    
+    def add(self, context: Dict[str, Any]) -> str:
+        """Store a context under a new unique ID and return the ID"""
+        with self._lock:
+            context_id = new_context_id()
+            while context_id in self:
+                context_id = new_context_id()
+            self[context_id] = context
+            return context_id
+    
+    def merge(self, context_id: str, updates: Dict[str, Any]) -> bool:
+        """
+        Update top-level keys of a stored context
+        
+        The context is replaced by an updated copy rather than changed in
+        place, so a context handed out earlier stays a consistent snapshot
+        for threads still reading it.
+        
+        Returns:
+            Whether the context was found
+        """
+        with self._lock:
+            context = self.get(context_id)
+            if context is None:
+                return False
+            self[context_id] = {**context, **updates}
+            return True
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size and eviction statistics"""
+    
+    def close(self):
+        """Release resources held by the store"""
+
+
+class MemoryContextStore(ContextStore):
+    """In-memory context store with LRU eviction and a time to live
+    
+    Contexts are held as the dicts that were stored, so ``get`` returns the
+    stored object itself. The store keeps at most ``max_entries`` contexts
+    and at most about ``max_bytes`` of them, measured by their JSON size;
+    the most recently stored context is always kept.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_CONTEXT_ENTRIES,
+                 max_bytes: int = DEFAULT_CONTEXT_BYTES,
+                 ttl_seconds: Optional[float] = DEFAULT_CONTEXT_TTL_SECONDS):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        
+        # context_id -> (context, size, stored_at)
+        self._entries: 'OrderedDict[str, Tuple[Dict[str, Any], int, float]]' = OrderedDict()
+        self._bytes = 0
+        self._next_sweep = 0.0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __getitem__(self, context_id: str) -> Dict[str, Any]:
+        with self._lock:
+            context, _, stored_at = self._entries[context_id]
+            if self._expired(stored_at, time.monotonic()):
+                self._drop(context_id)
+                self.expirations += 1
+                raise KeyError(context_id)
+            
+            self._entries.move_to_end(context_id)
+            return context
+    
+    def __setitem__(self, context_id: str, context: Dict[str, Any]):
+        size = context_size(context)
+        with self._lock:
+            if context_id in self._entries:
+                self._drop(context_id)
+            self._entries[context_id] = (context, size, time.monotonic())
+            self._bytes += size
+            self._evict()
+    
+    def __delitem__(self, context_id: str):
+        with self._lock:
+            if context_id not in self._entries:
+                raise KeyError(context_id)
+            self._drop(context_id)
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, context_id: object) -> bool:
+        with self._lock:
+            entry = self._entries.get(context_id)
+            return entry is not None and not self._expired(entry[2], time.monotonic())
+    
+    def clear(self):
+        """Drop every context"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size and eviction statistics"""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+    
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+    
+    def _drop(self, context_id: str):
+        _, size, _ = self._entries.pop(context_id)
+        self._bytes -= size
+    
+    def _evict(self):
+        """Expire old contexts, then drop least recently used ones until the store fits its budget"""
+        now = time.monotonic()
+        if self.ttl_seconds is not None and now >= self._next_sweep:
+            self._next_sweep = now + EXPIRY_SWEEP_INTERVAL
+            expired = [key for key, (_, _, stored_at) in self._entries.items() if self._expired(stored_at, now)]
+            for key in expired:
+                self._drop(key)
+            self.expirations += len(expired)
+        
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+
+class SQLiteContextStore(ContextStore):
+    """Context store backed by a SQLite database
+    
+    Contexts are stored compressed and decoded on every read, so ``get``
+    returns a fresh copy; use ``merge`` (or assign the modified context back)
+    to persist changes. Expiry and the ``max_entries``/``max_bytes`` budget
+    are enforced on write, evicting the least recently read contexts first.
+    The entry count and byte total are counted once when the database is
+    opened and kept up to date from then on, so the database should not be
+    shared with another store while it is open.
+    """
+    
+    def __init__(self, db_path: str, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = DEFAULT_CONTEXT_TTL_SECONDS):
+        super().__init__()
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self.expirations = 0
+        self._connection = self._open_database(db_path)
+        self._count, self._bytes = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM contexts"
+        ).fetchone()
+    
+    def __getitem__(self, context_id: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, size, created_at FROM contexts WHERE context_id = ?", (context_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(context_id)
+            
+            value, size, created_at = row
+            now = time.time()
+            expired = self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+            # Raising inside the transaction would roll the delete back, so leave it first
+            with self._connection:
+                if expired:
+                    self._connection.execute("DELETE FROM contexts WHERE context_id = ?", (context_id,))
+                else:
+                    self._connection.execute(
+                        "UPDATE contexts SET accessed_at = ? WHERE context_id = ?", (now, context_id)
+                    )
+            
+            if expired:
+                self._count -= 1
+                self._bytes -= size
+                self.expirations += 1
+                raise KeyError(context_id)
+            return json.loads(zlib.decompress(value).decode('utf-8'))
+    
+    def __setitem__(self, context_id: str, context: Dict[str, Any]):
+        value = zlib.compress(json.dumps(context, default=_context_value).encode('utf-8'))
+        now = time.time()
+        with self._lock, self._connection:
+            self._forget(context_id)
+            self._connection.execute(
+                "INSERT INTO contexts VALUES (?, ?, ?, ?, ?)",
+                (context_id, value, len(value), now, now)
+            )
+            self._count += 1
+            self._bytes += len(value)
+            self._evict(now)
+    
+    def __delitem__(self, context_id: str):
+        with self._lock, self._connection:
+            deleted = self._forget(context_id)
+        if not deleted:
+            raise KeyError(context_id)
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT context_id FROM contexts ORDER BY created_at").fetchall()
+        return (context_id for context_id, in rows)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __contains__(self, context_id: object) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT created_at FROM contexts WHERE context_id = ?", (context_id,)
+            ).fetchone()
+        return row is not None and (self.ttl_seconds is None or time.time() - row[0] <= self.ttl_seconds)
+    
+    def clear(self):
+        """Drop every context"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM contexts")
+            self._count = 0
+            self._bytes = 0
+    
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._connection.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size and eviction statistics"""
+        with self._lock:
+            return {
+                'backend': 'sqlite',
+                'entries': self._count,
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+    
+    def _open_database(self, db_path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(db_path, check_same_thread=False)
+        with connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS contexts (
+                    context_id TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS contexts_accessed ON contexts (accessed_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS contexts_created ON contexts (created_at)")
+        return connection
+    
+    def _forget(self, context_id: str) -> bool:
+        """Delete a context and take it off the running totals, returning whether it was stored"""
+        row = self._connection.execute("SELECT size FROM contexts WHERE context_id = ?", (context_id,)).fetchone()
+        if row is None:
+            return False
+        self._connection.execute("DELETE FROM contexts WHERE context_id = ?", (context_id,))
+        self._count -= 1
+        self._bytes -= row[0]
+        return True
+    
+    def _evict(self, now: float):
+        """Expire old contexts, then delete least recently read ones until the store fits its budget"""
+        if self.ttl_seconds is not None:
+            cutoff = now - self.ttl_seconds
+            expired, expired_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM contexts WHERE created_at < ?", (cutoff,)
+            ).fetchone()
+            if expired:
+                self._connection.execute("DELETE FROM contexts WHERE created_at < ?", (cutoff,))
+                self._count -= expired
+                self._bytes -= expired_bytes
+                self.expirations += expired
+        
+        if self._count <= 1 or not self._over_budget(self._count, self._bytes):
+            return
+        
+        evicted: List[Tuple[str]] = []
+        for context_id, size in self._connection.execute(
+                "SELECT context_id, size FROM contexts ORDER BY accessed_at, created_at"):
+            if self._count <= 1 or not self._over_budget(self._count, self._bytes):
+                break
+            evicted.append((context_id,))
+            self._count -= 1
+            self._bytes -= size
+        
+        self._connection.executemany("DELETE FROM contexts WHERE context_id = ?", evicted)
+        self.evictions += len(evicted)
+    
+    def _over_budget(self, entries: int, total: int) -> bool:
+        return ((self.max_entries is not None and entries > self.max_entries) or
+                (self.max_bytes is not None and total > self.max_bytes))
@@ -7,22 +7,109 @@ for different industries and business scenarios.
 
 import json
 import logging
-from typing import Dict, List, Any, Optional
+from itertools import count
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Any, Mapping, Optional, Tuple
 from datetime import datetime
 
+from .bounded_cache import BoundedCache
+
 logger = logging.getLogger(__name__)
 
+KNOWLEDGE_TABLES = ('industry_patterns', 'business_processes', 'erpnext_best_practices', 'doctype_templates')
+
+DEFAULT_KNOWLEDGE_CACHE_SIZE = 1024
+
+# Memoized results of every instance, keyed on the versions of the tables they were built from
+_guidance_cache = BoundedCache(DEFAULT_KNOWLEDGE_CACHE_SIZE)
+_doctype_structure_cache = BoundedCache(DEFAULT_KNOWLEDGE_CACHE_SIZE)
+
+# Versions of customized tables; the shared tables are version 0
+_table_versions = count(1)
+
+
+def freeze(value: Any) -> Any:
+    """Return a read-only copy of nested dicts, lists and sets"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable copy of a frozen value, as plain dicts and lists"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
 
 class DomainKnowledge:
-    """Repository of domain-specific knowledge for app generation"""
+    """Repository of domain-specific knowledge for app generation
+    
+    The knowledge tables are built once per process and shared by every
+    instance as read-only views. ``customize`` gives an instance its own copy
+    of a single table; results hand out mutable copies of table entries.
+    
+    Industry guidance and DocType structures only depend on their arguments
+    and the tables, so they are memoized in bounded caches shared by every
+    instance and returned as read-only views. Instances that customized a
+    table get results of their own.
+    """
     
     def __init__(self):
-        self.industry_patterns = self._load_industry_patterns()
-        self.business_processes = self._load_business_processes()
-        self.erpnext_best_practices = self._load_erpnext_best_practices()
-        self.doctype_templates = self._load_doctype_templates()
+        tables = get_knowledge_tables()
+        self.industry_patterns = tables['industry_patterns']
+        self.business_processes = tables['business_processes']
+        self.erpnext_best_practices = tables['erpnext_best_practices']
+        self.doctype_templates = tables['doctype_templates']
+        
+        # Versions of the tables above, part of every memoization key
+        self._tables_key: Tuple[int, ...] = (0,) * len(KNOWLEDGE_TABLES)
+    
+    def customize(self, table: str, key: str, value: Any):
+        """
+        Add or replace a knowledge table entry for this instance only
+        
+        The first customization of a table copies its top level; every other
+        entry stays shared with the process-wide table.
+        
+        Args:
+            table: One of KNOWLEDGE_TABLES
+            key: Entry to add or replace (an industry, process, context or entity)
+            value: New entry
+        """
+        if table not in KNOWLEDGE_TABLES:
+            raise ValueError(f"Unknown knowledge table: {table}")
+        
+        entries = dict(getattr(self, table))
+        entries[key] = freeze(value)
+        setattr(self, table, MappingProxyType(entries))
         
-    def get_industry_guidance(self, industry: str, requirement: str = None) -> Dict[str, Any]:
+        # A new version, so results memoized from the old entry are not reused
+        versions = list(self._tables_key)
+        versions[KNOWLEDGE_TABLES.index(table)] = next(_table_versions)
+        self._tables_key = tuple(versions)
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get size and hit statistics of the process-wide memoization caches"""
+        return {
+            'industry_guidance': _guidance_cache.get_stats(),
+            'doctype_structure': _doctype_structure_cache.get_stats()
+        }
+    
+    def clear_caches(self):
+        """Drop memoized results of every instance and reset the statistics"""
+        _guidance_cache.clear()
+        _doctype_structure_cache.clear()
+    
+    def get_industry_guidance(self, industry: str, requirement: str = None) -> Mapping[str, Any]:
         """
         Get industry-specific guidance for app development
         
@@ -31,12 +118,29 @@ class DomainKnowledge:
             requirement: Optional specific requirement for context
             
         Returns:
-            Industry-specific guidance and patterns
+            Read-only industry-specific guidance and patterns
         """
         if industry not in self.industry_patterns:
             industry = 'general'
-            
-        guidance = {
+        
+        key = (self._tables_key, industry)
+        guidance = _guidance_cache.get(key)
+        if guidance is None:
+            guidance = self._build_industry_guidance(industry)
+            _guidance_cache.put(key, guidance)
+        
+        # Requirement-specific suggestions are layered over the memoized guidance
+        if requirement:
+            guidance = MappingProxyType({
+                **guidance,
+                'contextualized_suggestions': freeze(self._contextualize_for_requirement(guidance, requirement))
+            })
+        
+        return guidance
+    
+    def _build_industry_guidance(self, industry: str) -> Mapping[str, Any]:
+        """Build the guidance for a known industry, independent of any requirement"""
+        return freeze({
             'industry': industry,
             'patterns': self.industry_patterns[industry],
             'recommended_modules': self._get_recommended_modules(industry),
@@ -45,28 +149,31 @@ class DomainKnowledge:
             'best_practices': self._get_industry_best_practices(industry),
             'compliance_considerations': self._get_compliance_considerations(industry),
             'integration_points': self._get_common_integrations(industry)
-        }
-        
-        if requirement:
-            guidance['contextualized_suggestions'] = self._contextualize_for_requirement(
-                guidance, requirement
-            )
-        
-        return guidance
+        })
     
     def suggest_doctype_structure(self, entity_name: str, industry: str = 'general', 
-                                 attributes: List[str] = None) -> Dict[str, Any]:
+                                 attributes: List[str] = None) -> Mapping[str, Any]:
         """
         Suggest DocType structure based on entity and industry
         
         Args:
             entity_name: Name of the business entity
             industry: Industry context
-            attributes: Known attributes from requirement analysis
+            attributes: Known attributes from requirement analysis (order does not matter)
             
         Returns:
-            Suggested DocType structure
+            Read-only suggested DocType structure
         """
+        key = (self._tables_key, entity_name, industry, frozenset(attributes or ()))
+        structure = _doctype_structure_cache.get(key)
+        if structure is None:
+            structure = self._build_doctype_structure(*key[1:])
+            _doctype_structure_cache.put(key, structure)
+        return structure
+    
+    def _build_doctype_structure(self, entity_name: str, industry: str,
+                                 attributes: FrozenSet[str]) -> Mapping[str, Any]:
+        """Build the DocType structure for one entity, industry and attribute set"""
         # Get base template
         base_template = self._get_doctype_template(entity_name)
         
@@ -74,9 +181,9 @@ class DomainKnowledge:
         industry_modifications = self._get_industry_doctype_modifications(entity_name, industry)
         
         # Incorporate requirement-specific attributes
-        custom_fields = self._suggest_custom_fields(entity_name, attributes or [])
+        custom_fields = self._suggest_custom_fields(entity_name, attributes)
         
-        return {
+        return freeze({
             'doctype_name': self._generate_doctype_name(entity_name),
             'base_structure': base_template,
             'industry_modifications': industry_modifications,
@@ -85,7 +192,7 @@ class DomainKnowledge:
             'permissions': self._suggest_permissions(entity_name, industry),
             'workflows': self._suggest_entity_workflows(entity_name, industry),
             'implementation_notes': self._get_implementation_notes(entity_name, industry)
-        }
+        })
     
     def recommend_business_process(self, process_type: str, industry: str = 'general') -> Dict[str, Any]:
         """
@@ -101,28 +208,29 @@ class DomainKnowledge:
         if process_type not in self.business_processes:
             process_type = 'generic'
             
-        process_info = self.business_processes[process_type].copy()
+        process_info = self.business_processes[process_type]
         
-        # Apply industry-specific customizations
+        # Apply industry-specific customizations, copying the shared entry only when there are any
         if industry != 'general':
             industry_customizations = self._get_process_industry_customizations(process_type, industry)
-            process_info.update(industry_customizations)
+            if industry_customizations:
+                process_info = {**process_info, **industry_customizations}
         
         return {
             'process_type': process_type,
             'industry': industry,
-            'process_flow': process_info.get('flow', []),
-            'required_doctypes': process_info.get('doctypes', []),
-            'workflow_states': process_info.get('workflow_states', []),
-            'automation_opportunities': process_info.get('automation', []),
-            'key_metrics': process_info.get('metrics', []),
-            'compliance_checkpoints': process_info.get('compliance', []),
-            'integration_points': process_info.get('integrations', [])
+            'process_flow': thaw(process_info.get('flow', [])),
+            'required_doctypes': thaw(process_info.get('doctypes', [])),
+            'workflow_states': thaw(process_info.get('workflow_states', [])),
+            'automation_opportunities': thaw(process_info.get('automation', [])),
+            'key_metrics': thaw(process_info.get('metrics', [])),
+            'compliance_checkpoints': thaw(process_info.get('compliance', [])),
+            'integration_points': thaw(process_info.get('integrations', []))
         }
     
     def get_best_practices(self, context: str = 'general') -> Dict[str, List[str]]:
         """Get ERPNext best practices for specific context"""
-        return self.erpnext_best_practices.get(context, self.erpnext_best_practices['general'])
+        return thaw(self.erpnext_best_practices.get(context, self.erpnext_best_practices['general']))
     
     def validate_requirement_feasibility(self, parsed_requirement: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -189,7 +297,8 @@ class DomainKnowledge:
         
         return feasibility
     
-    def _load_industry_patterns(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    def _load_industry_patterns() -> Dict[str, Dict[str, Any]]:
         """Load industry-specific patterns and knowledge"""
         return {
             'manufacturing': {
@@ -230,7 +339,8 @@ class DomainKnowledge:
             }
         }
     
-    def _load_business_processes(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    def _load_business_processes() -> Dict[str, Dict[str, Any]]:
         """Load business process templates"""
         return {
             'sales_process': {
@@ -263,7 +373,8 @@ class DomainKnowledge:
             }
         }
     
-    def _load_erpnext_best_practices(self) -> Dict[str, Dict[str, List[str]]]:
+    @staticmethod
+    def _load_erpnext_best_practices() -> Dict[str, Dict[str, List[str]]]:
         """Load ERPNext implementation best practices"""
         return {
             'general': {
@@ -308,7 +419,8 @@ class DomainKnowledge:
             }
         }
     
-    def _load_doctype_templates(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    def _load_doctype_templates() -> Dict[str, Dict[str, Any]]:
         """Load DocType templates for common entities"""
         return {
             'customer': {
@@ -473,8 +585,8 @@ class DomainKnowledge:
         
         return modifications
     
-    def _suggest_custom_fields(self, entity_name: str, attributes: List[str]) -> List[Dict[str, Any]]:
-        """Suggest custom fields based on extracted attributes"""
+    def _suggest_custom_fields(self, entity_name: str, attributes: FrozenSet[str]) -> List[Dict[str, Any]]:
+        """Suggest custom fields based on extracted attributes, in field type table order"""
         fields = []
         
         field_type_mapping = {
@@ -488,11 +600,11 @@ class DomainKnowledge:
             'address': 'Small Text'
         }
         
-        for attr in attributes:
-            if attr in field_type_mapping:
+        for attr, fieldtype in field_type_mapping.items():
+            if attr in attributes:
                 fields.append({
                     'fieldname': attr,
-                    'fieldtype': field_type_mapping[attr],
+                    'fieldtype': fieldtype,
                     'label': attr.replace('_', ' ').title(),
                     'reqd': 1 if attr in ['name', 'email'] else 0
                 })
@@ -574,4 +686,20 @@ class DomainKnowledge:
         if name.endswith('s') and len(name) > 1:
             name = name[:-1]
         
-        return name
\ No newline at end of file
+        return name
+
+
+_knowledge_tables = None
+
+
+def get_knowledge_tables() -> Mapping[str, Mapping[str, Any]]:
+    """Return the process-wide knowledge tables, building them on first use"""
+    global _knowledge_tables
+    if _knowledge_tables is None:
+        _knowledge_tables = MappingProxyType({
+            'industry_patterns': freeze(DomainKnowledge._load_industry_patterns()),
+            'business_processes': freeze(DomainKnowledge._load_business_processes()),
+            'erpnext_best_practices': freeze(DomainKnowledge._load_erpnext_best_practices()),
+            'doctype_templates': freeze(DomainKnowledge._load_doctype_templates())
+        })
+    return _knowledge_tables
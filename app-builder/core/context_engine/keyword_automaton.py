@@ -0,0 +1,174 @@
+"""
+Keyword Automaton for ERPNext App Builder
+
+This module implements an Aho-Corasick automaton over the keyword
+vocabularies used by the analyzers, so a requirement text is scanned once
+for every keyword instead of once per keyword.
+"""
+
+import re
+import logging
+import threading
+from array import array
+from typing import Dict, List, Iterable, Iterator, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordAutomaton:
+    """Array-backed Aho-Corasick automaton for substring keyword search
+    
+    The automaton is compiled into a dense transition table over the
+    characters that occur in the vocabulary; every other character maps to
+    column 0, which always leads back towards the root. Scanning costs one
+    table lookup per character of text, independent of vocabulary size.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(sorted({keyword for keyword in keywords if keyword}))
+        self.keyword_ids: Dict[str, int] = {keyword: i for i, keyword in enumerate(self.keywords)}
+        
+        alphabet = sorted({char for keyword in self.keywords for char in keyword})
+        if len(alphabet) > 254:
+            raise ValueError("Keyword vocabulary uses more than 254 distinct characters")
+        
+        self._width = len(alphabet) + 1
+        # Characters outside the alphabet are replaced by column 0 before scanning
+        self._outside_alphabet = re.compile(
+            f"[^{''.join(re.escape(char) for char in alphabet)}]" if alphabet else r'[\s\S]'
+        )
+        self._encode_table = str.maketrans(
+            {char: chr(column) for column, char in enumerate(alphabet, start=1)}
+        )
+        self._build()
+    
+    def _build(self):
+        """Build the trie, failure links and the dense transition table"""
+        width = self._width
+        columns = {chr(column): column for column in range(1, width)}
+        
+        # Trie construction; -1 marks a missing edge
+        goto = array('l', [-1] * width)
+        outputs: List[List[int]] = [[]]
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword.translate(self._encode_table):
+                index = state * width + columns[char]
+                if goto[index] == -1:
+                    goto[index] = len(outputs)
+                    goto.extend([-1] * width)
+                    outputs.append([])
+                state = goto[index]
+            outputs[state].append(keyword_id)
+        
+        # Breadth-first pass resolves failure links into a full DFA
+        failure = array('l', [0] * len(outputs))
+        queue = []
+        for column in range(width):
+            child = goto[column]
+            if child == -1:
+                goto[column] = 0
+            else:
+                queue.append(child)
+        
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            outputs[state].extend(outputs[failure[state]])
+            for column in range(width):
+                index = state * width + column
+                child = goto[index]
+                fallback = goto[failure[state] * width + column]
+                if child == -1:
+                    goto[index] = fallback
+                else:
+                    failure[child] = fallback
+                    queue.append(child)
+        
+        # Store transitions as row offsets so a scan step is one index operation
+        self._transitions = array('l', (state * width for state in goto))
+        self._outputs: Dict[int, Tuple[int, ...]] = {
+            state * width: tuple(keyword_ids)
+            for state, keyword_ids in enumerate(outputs) if keyword_ids
+        }
+        self.state_count = len(outputs)
+    
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.keyword_ids
+    
+    def __len__(self) -> int:
+        return len(self.keywords)
+    
+    def _encode(self, text: str) -> bytes:
+        """Map text onto transition-table columns, one byte per character"""
+        return self._outside_alphabet.sub('\x00', text).translate(self._encode_table).encode('latin-1')
+    
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Scan text once and yield every keyword occurrence
+        
+        Args:
+            text: Text to scan (keywords are matched case-sensitively)
+            
+        Yields:
+            (start offset, keyword) for every occurrence, overlapping ones included
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        keywords = self.keywords
+        
+        state = 0
+        for position, column in enumerate(self._encode(text)):
+            state = transitions[state + column]
+            if state in outputs:
+                for keyword_id in outputs[state]:
+                    keyword = keywords[keyword_id]
+                    yield position - len(keyword) + 1, keyword
+    
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """Map every keyword found in text to the start offsets of its occurrences"""
+        transitions = self._transitions
+        outputs = self._outputs
+        keywords = self.keywords
+        hits: Dict[str, List[int]] = {}
+        
+        state = 0
+        for position, column in enumerate(self._encode(text)):
+            state = transitions[state + column]
+            if state in outputs:
+                for keyword_id in outputs[state]:
+                    keyword = keywords[keyword_id]
+                    hits.setdefault(keyword, []).append(position - len(keyword) + 1)
+        
+        return hits
+
+
+_registered_keywords: Set[str] = set()
+_shared_automaton = None
+# Serializes registration with rebuilding, so no registered keyword is left out of the automaton
+_registry_lock = threading.Lock()
+
+
+def register_keywords(*vocabularies: Iterable[str]):
+    """Add keyword vocabularies to the shared automaton"""
+    global _shared_automaton
+    with _registry_lock:
+        new_keywords = set().union(*vocabularies) - _registered_keywords
+        if new_keywords:
+            _registered_keywords.update(new_keywords)
+            _shared_automaton = None
+
+
+def get_keyword_automaton() -> KeywordAutomaton:
+    """Return the shared automaton, rebuilding it after new keywords were registered"""
+    global _shared_automaton
+    automaton = _shared_automaton
+    if automaton is None:
+        with _registry_lock:
+            automaton = _shared_automaton
+            if automaton is None:
+                automaton = KeywordAutomaton(_registered_keywords)
+                _shared_automaton = automaton
+                logger.debug(f"Built keyword automaton: {len(automaton)} keywords, {automaton.state_count} states")
+    return automaton
@@ -0,0 +1,147 @@
+"""
+Pattern Scanner for ERPNext App Builder
+
+This module compiles whole-word keyword tables into one regular expression
+so that a requirement is scanned once for every category, instead of once
+per category pattern.
+"""
+
+import re
+import logging
+from typing import Dict, List, Tuple, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to ASCII letters
+# even after lower-casing (dotless i and long s)
+_IGNORECASE_FOLDS = str.maketrans({'ı': 'i', 'ſ': 's'})
+
+KeywordTable = Dict[str, Sequence[str]]
+
+
+def build_alternation(words) -> str:
+    """Build a prefix-factored regex alternation matching exactly the given words
+    
+    Sharing prefixes lets the regex engine reject a position after a character
+    or two, instead of trying every keyword in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    return _trie_to_regex(trie)
+
+
+def _trie_to_regex(node: Dict[str, dict]) -> str:
+    """Render one trie node as a regex fragment"""
+    branches = [re.escape(char) + _trie_to_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if '' in node:
+        # A shorter word ends at this node
+        return f"(?:{body})?"
+    return body
+
+
+class PatternScanner:
+    """Single-pass scanner for several tables of whole-word keyword categories
+    
+    Each table maps a category to its keywords, mirroring patterns of the form
+    ``\\b(keyword|keyword phrase|...)s?\\b``. All keywords of all tables are
+    compiled into one prefix-factored alternation with named ``word`` and
+    ``tail`` groups; the matched word is then resolved against
+    a precomputed lookup so every category sharing a keyword is credited,
+    with the same per-category counts ``re.findall`` would report.
+    """
+    
+    def __init__(self, tables: Dict[str, Tuple[KeywordTable, bool]]):
+        """
+        Build the scanner
+        
+        Args:
+            tables: Table name -> (category keyword table, whether a trailing
+                    plural 's' is accepted for that table)
+        """
+        self.tables = {name: tuple(table) for name, (table, _) in tables.items()}
+        # token or phrase -> [(table, category, keyword length, alternative order)]
+        self._word_hits: Dict[str, List[Tuple[str, str, int, int]]] = {}
+        self._phrase_hits: Dict[str, List[Tuple[str, str, int, int]]] = {}
+        
+        max_tail_words = 0
+        for table_name, (table, allow_plural) in tables.items():
+            for category, keywords in table.items():
+                key = (table_name, category)
+                for order, keyword in enumerate(keywords):
+                    words = keyword.split(' ')
+                    if len(words) > 1:
+                        self._add_hit(self._phrase_hits, keyword, key, len(keyword), order)
+                        self._word_hits.setdefault(words[0], [])
+                        max_tail_words = max(max_tail_words, len(words) - 1)
+                        continue
+                    
+                    self._add_hit(self._word_hits, keyword, key, len(keyword), order)
+                    if allow_plural:
+                        self._add_hit(self._word_hits, keyword + 's', key, len(keyword), order)
+        
+        alternation = build_alternation(self._word_hits)
+        tail = f"(?=(?P<tail>(?: \\w+){{1,{max_tail_words}}})?)" if max_tail_words else ''
+        self.pattern = re.compile(f"\\b(?P<word>{alternation})\\b{tail}", re.IGNORECASE)
+    
+    @staticmethod
+    def _add_hit(index: Dict[str, List[Tuple[str, str, int, int]]], token: str,
+                 key: Tuple[str, str], length: int, order: int):
+        """Register a category hit for a token, keeping the first alternative per category"""
+        hits = index.setdefault(token, [])
+        for hit in hits:
+            if (hit[0], hit[1]) == key:
+                return
+        hits.append((key[0], key[1], length, order))
+    
+    def scan(self, text: str) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Scan text once and collect matches for every category
+        
+        Args:
+            text: Lower-cased text to scan
+        
+        Returns:
+            Table name -> category -> matched text in text order (plural
+            suffix removed, as the first regex group would report)
+        """
+        results = {name: {} for name in self.tables}
+        consumed_until: Dict[Tuple[str, str], int] = {}
+        
+        for match in self.pattern.finditer(text):
+            word = match.group('word')
+            if not word.isascii():
+                word = word.translate(_IGNORECASE_FOLDS)
+            
+            start = match.start()
+            candidates = {}
+            for table_name, category, length, order in self._word_hits.get(word, ()):
+                candidates[(table_name, category)] = (order, length, match.end())
+            
+            tail = match.group('tail') if self._phrase_hits else None
+            if tail:
+                if not tail.isascii():
+                    tail = tail.translate(_IGNORECASE_FOLDS)
+                phrase = word
+                for part in tail[1:].split(' '):
+                    phrase = f"{phrase} {part}"
+                    for table_name, category, length, order in self._phrase_hits.get(phrase, ()):
+                        key = (table_name, category)
+                        if key not in candidates or order < candidates[key][0]:
+                            candidates[key] = (order, length, start + length)
+            
+            for key, (order, length, end) in candidates.items():
+                # re.findall never reports overlapping matches for one pattern
+                if consumed_until.get(key, 0) > start:
+                    continue
+                consumed_until[key] = end
+                results[key[0]].setdefault(key[1], []).append(text[start:start + length])
+        
+        return results
@@ -0,0 +1,72 @@
+"""
+Parse Records for ERPNext App Builder
+
+This module defines the compact records RequirementParser builds for
+actions and constraints while it parses. Records keep offsets instead of
+copies of the text and live in sentence results and the sentence cache,
+so long documents do not produce tens of thousands of dicts there.
+``to_dict`` gives the plain dict a parsing result holds.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, Any
+
+
+@dataclass(slots=True, eq=False)
+class ActionRecord:
+    """Action verb found in a requirement
+    
+    ``verb_start`` and ``context_start``/``context_end`` are offsets into
+    the text the verb was found in, and ``offset`` is the position of that
+    text within the whole requirement. Only the offsets are kept, so a
+    record does not hold on to the buffered text it was found in.
+    """
+    
+    type: str
+    verb: str
+    object: str
+    verb_start: int
+    context_start: int
+    context_end: int
+    operation_template: str
+    offset: int = 0
+    
+    @property
+    def position(self) -> int:
+        return self.offset + self.verb_start
+    
+    def shifted(self, offset: int) -> 'ActionRecord':
+        """Get this action found ``offset`` characters further into the requirement"""
+        return replace(self, offset=self.offset + offset)
+    
+    def to_dict(self, text: str) -> Dict[str, Any]:
+        """Get the action as a plain dict, taking its context from ``text``, the whole requirement"""
+        return {
+            'type': self.type,
+            'verb': self.verb,
+            'object': self.object,
+            'position': self.position,
+            'context': text[self.offset + self.context_start:self.offset + self.context_end].strip(),
+            'erpnext_operation': self.operation_template.format(self.object)
+        }
+
+
+@dataclass(slots=True, eq=False)
+class ConstraintRecord:
+    """Constraint found in a requirement sentence, given by its offsets into ``source``"""
+    
+    type: str
+    source: str
+    start: int
+    end: int
+    severity: str
+    implementation_suggestion: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the constraint as a plain dict"""
+        return {
+            'type': self.type,
+            'description': self.source[self.start:self.end],
+            'severity': self.severity,
+            'implementation_suggestion': self.implementation_suggestion
+        }
@@ -0,0 +1,227 @@
+"""
+Requirement Document for ERPNext App Builder
+
+This module provides a single annotated view of a requirement text that is
+shared by ClaudeHooks, RequirementParser and ContextProcessor, so the text is
+normalized, tokenized and split into sentences only once per requirement.
+"""
+
+import re
+import logging
+from bisect import bisect_right
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Any, Iterable, Set, Tuple, Union
+
+from .keyword_automaton import KeywordAutomaton, get_keyword_automaton
+from .sentence_segmenter import segment_sentences
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\S+')
+
+NO_SENTENCES: FrozenSet[int] = frozenset()
+
+
+class RequirementDocument:
+    """Annotated requirement text shared across analyzers
+    
+    Every annotation is computed the first time it is needed and then reused,
+    so passing the same document to several analyzers pays for lower-casing,
+    tokenization, sentence splitting and keyword scanning exactly once.
+    """
+    
+    def __init__(self, text: str):
+        if not isinstance(text, str):
+            raise TypeError(f"Requirement text must be a string, got {type(text).__name__}")
+        
+        self.text = text
+        self._keyword_hits: Dict[str, bool] = {}
+    
+    @classmethod
+    def coerce(cls, requirement: Union[str, 'RequirementDocument']) -> 'RequirementDocument':
+        """Return the given document, or annotate a raw requirement string"""
+        if isinstance(requirement, cls):
+            return requirement
+        return cls(requirement)
+    
+    @classmethod
+    def for_sentence(cls, sentence: str) -> 'RequirementDocument':
+        """Annotate a single, already segmented sentence without re-segmenting it"""
+        document = cls(sentence)
+        document.__dict__['sentence_spans'] = [(0, len(sentence))] if sentence else []
+        return document
+    
+    @cached_property
+    def lower(self) -> str:
+        """Lower-cased requirement text"""
+        return self.text.lower()
+    
+    @cached_property
+    def token_spans(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of whitespace-separated tokens in the text"""
+        return [match.span() for match in TOKEN_PATTERN.finditer(self.text)]
+    
+    @cached_property
+    def token_ends(self) -> List[int]:
+        """End offsets of the tokens in ``token_spans``, for binary search"""
+        return [end for _, end in self.token_spans]
+    
+    def tokens_after(self, offset: int, count: int) -> List[str]:
+        """
+        Get the tokens that follow an offset without copying the rest of the text
+        
+        Equivalent to ``text[offset:].split()[:count]``: a token that straddles
+        the offset contributes only its remaining part.
+        
+        Args:
+            offset: Character offset into the text
+            count: Maximum number of tokens to return
+            
+        Returns:
+            Up to ``count`` token strings
+        """
+        index = bisect_right(self.token_ends, offset)
+        text = self.text
+        return [text[max(start, offset):end] for start, end in self.token_spans[index:index + count]]
+    
+    @cached_property
+    def words(self) -> List[str]:
+        """Lower-cased whitespace-separated words"""
+        return self.lower.split()
+    
+    @cached_property
+    def word_set(self) -> Set[str]:
+        """Distinct lower-cased words for membership checks"""
+        return set(self.words)
+    
+    @property
+    def word_count(self) -> int:
+        """Number of whitespace-separated words"""
+        return len(self.words)
+    
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of the stripped sentences in the text"""
+        return segment_sentences(self.text)
+    
+    @cached_property
+    def lower_sentence_spans(self) -> List[Tuple[int, int]]:
+        """Sentence offsets into ``lower``, aligned with ``sentence_spans``"""
+        text = self.text
+        if len(self.lower) == len(text):
+            return self.sentence_spans
+        
+        # Lower-casing 'İ' yields two characters, shifting every later offset
+        spans = []
+        position = lower_position = 0
+        for start, end in self.sentence_spans:
+            lower_position += len(text[position:start].lower())
+            lower_start = lower_position
+            lower_position += len(text[start:end].lower())
+            spans.append((lower_start, lower_position))
+            position = end
+        return spans
+    
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Stripped sentences of the original text"""
+        text = self.text
+        return [text[start:end] for start, end in self.sentence_spans]
+    
+    def sentence_contains(self, index: int, keyword: str) -> bool:
+        """Check whether a lower-case keyword occurs in the sentence at index"""
+        start, end = self.lower_sentence_spans[index]
+        return self.lower.find(keyword, start, end) != -1
+    
+    def sentences_with(self, keyword: str) -> Set[int]:
+        """
+        Get the IDs of the sentences a lower-case keyword occurs in
+        
+        Registered keywords are answered from ``keyword_sentences``; any other
+        keyword falls back to searching every sentence span.
+        
+        Args:
+            keyword: Lower-case keyword, matched as a substring like ``contains``
+            
+        Returns:
+            Indexes into ``sentence_spans``
+        """
+        if keyword in self.keyword_automaton:
+            return self.keyword_sentences.get(keyword, NO_SENTENCES)
+        return {index for index in range(len(self.sentence_spans)) if self.sentence_contains(index, keyword)}
+    
+    @cached_property
+    def keyword_automaton(self) -> KeywordAutomaton:
+        """Shared keyword automaton this document was scanned with"""
+        return get_keyword_automaton()
+    
+    @cached_property
+    def keyword_offsets(self) -> Dict[str, List[int]]:
+        """Start offsets in the lower-cased text of every registered keyword found"""
+        return self.keyword_automaton.find_all(self.lower)
+    
+    @cached_property
+    def keyword_sentences(self) -> Dict[str, Set[int]]:
+        """Inverted index from every registered keyword found to the sentences containing it"""
+        spans = self.lower_sentence_spans
+        starts = [start for start, _ in spans]
+        index: Dict[str, Set[int]] = {}
+        
+        for keyword, offsets in self.keyword_offsets.items():
+            length = len(keyword)
+            sentence_ids = set()
+            for offset in offsets:
+                # Occurrences across a sentence boundary or in dropped delimiters don't count
+                sentence_id = bisect_right(starts, offset) - 1
+                if sentence_id >= 0 and offset + length <= spans[sentence_id][1]:
+                    sentence_ids.add(sentence_id)
+            if sentence_ids:
+                index[keyword] = sentence_ids
+        
+        return index
+    
+    def contains(self, keyword: str) -> bool:
+        """Check whether a lower-case keyword occurs anywhere in the text"""
+        if keyword in self.keyword_automaton:
+            return keyword in self.keyword_offsets
+        
+        # Keywords outside the registered vocabulary fall back to a memoized substring test
+        hit = self._keyword_hits.get(keyword)
+        if hit is None:
+            hit = keyword in self.lower
+            self._keyword_hits[keyword] = hit
+        return hit
+    
+    def contains_any(self, keywords: Iterable[str]) -> bool:
+        """Check whether any of the lower-case keywords occurs in the text"""
+        return any(self.contains(keyword) for keyword in keywords)
+    
+    def __len__(self) -> int:
+        return len(self.text)
+    
+    def __repr__(self) -> str:
+        return f"RequirementDocument({len(self.text)} chars)"
+
+
+class KeywordSummary:
+    """Registered keywords found across several documents
+    
+    Answers ``contains`` and ``contains_any`` like a RequirementDocument for
+    the keyword vocabulary of the shared automaton, without keeping the text
+    the keywords were found in.
+    """
+    
+    def __init__(self, keywords: Iterable[str] = ()):
+        self.keywords: Set[str] = set(keywords)
+    
+    def update(self, keywords: Iterable[str]):
+        """Add keywords found in another document"""
+        self.keywords.update(keywords)
+    
+    def contains(self, keyword: str) -> bool:
+        """Check whether a registered lower-case keyword was found"""
+        return keyword in self.keywords
+    
+    def contains_any(self, keywords: Iterable[str]) -> bool:
+        """Check whether any of the registered lower-case keywords was found"""
+        return any(keyword in self.keywords for keyword in keywords)
@@ -5,45 +5,230 @@ This module provides sophisticated parsing capabilities for business requirement
 extracting structured information that can be used for app generation.
 """
 
+import os
 import re
+import sys
+import codecs
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
 from datetime import datetime
 
+from .requirement_document import RequirementDocument, KeywordSummary, TOKEN_PATTERN
+from .requirement_stream import RequirementStream, StreamSource, STREAM_READ_SIZE, map_file, iter_mapped_chunks
+from .sentence_cache import SentenceCache, DEFAULT_SENTENCE_CACHE_SIZE
+from .keyword_automaton import register_keywords, get_keyword_automaton
+from .rule_extractor import BusinessRuleExtractor, DEFAULT_MAX_RULE_SPAN, RULE_KINDS
+from .records import ActionRecord, ConstraintRecord
+
 logger = logging.getLogger(__name__)
 
+# ERPNext module suggestions by keyword
+MODULE_KEYWORDS = {
+    'Selling': ['sales', 'customer', 'quotation', 'order'],
+    'Buying': ['purchase', 'supplier', 'procurement'],
+    'Stock': ['inventory', 'warehouse', 'item', 'stock'],
+    'Accounts': ['accounting', 'invoice', 'payment', 'financial'],
+    'CRM': ['lead', 'opportunity', 'customer relationship'],
+    'Projects': ['project', 'task', 'timesheet'],
+    'HR': ['employee', 'payroll', 'leave', 'attendance'],
+    'Manufacturing': ['production', 'bom', 'work order'],
+    'Quality Management': ['quality', 'inspection', 'testing']
+}
+
+WORKFLOW_KEYWORDS = ['approval', 'review', 'workflow', 'process']
+REPORT_KEYWORDS = ['report', 'analytics', 'dashboard', 'summary']
+CUSTOMIZATION_KEYWORDS = ['custom', 'specific', 'unique', 'special']
+
+# Attribute keywords looked up around entity mentions
+ATTRIBUTE_KEYWORDS = {
+    'name': ['name', 'title', 'called'],
+    'email': ['email', 'mail', 'contact'],
+    'phone': ['phone', 'mobile', 'telephone'],
+    'address': ['address', 'location'],
+    'date': ['date', 'time', 'when'],
+    'amount': ['amount', 'value', 'price', 'cost'],
+    'status': ['status', 'state', 'condition'],
+    'type': ['type', 'category', 'kind'],
+    'description': ['description', 'details', 'info']
+}
+
+MINIMAL_PARSE_TERMS = ['customer', 'order', 'product', 'invoice']
+
+COMPONENT_CATEGORIES = ('functional_requirements', 'non_functional_requirements', 'user_stories',
+                        'business_objectives', 'technical_constraints')
+
+# Enhanced entity patterns with attributes
+ENTITY_PATTERNS = {
+    'customer': {
+        'pattern': r'\b(customer|client|buyer|purchaser)s?\b',
+        'attributes': ['name', 'email', 'phone', 'address', 'type'],
+        'erpnext_doctype': 'Customer'
+    },
+    'supplier': {
+        'pattern': r'\b(supplier|vendor|provider)s?\b',
+        'attributes': ['name', 'email', 'phone', 'address', 'payment_terms'],
+        'erpnext_doctype': 'Supplier'
+    },
+    'product': {
+        'pattern': r'\b(product|item|good|merchandise|inventory)s?\b',
+        'attributes': ['name', 'description', 'price', 'category', 'stock'],
+        'erpnext_doctype': 'Item'
+    },
+    'order': {
+        'pattern': r'\b(order|purchase|sale)s?\b',
+        'attributes': ['date', 'amount', 'status', 'customer', 'items'],
+        'erpnext_doctype': 'Sales Order'
+    },
+    'invoice': {
+        'pattern': r'\b(invoice|bill|receipt)s?\b',
+        'attributes': ['number', 'date', 'amount', 'due_date', 'status'],
+        'erpnext_doctype': 'Sales Invoice'
+    },
+    'employee': {
+        'pattern': r'\b(employee|staff|worker|personnel)s?\b',
+        'attributes': ['name', 'position', 'department', 'email', 'phone'],
+        'erpnext_doctype': 'Employee'
+    },
+    'project': {
+        'pattern': r'\b(project|initiative|program)s?\b',
+        'attributes': ['name', 'description', 'start_date', 'end_date', 'status'],
+        'erpnext_doctype': 'Project'
+    },
+    'task': {
+        'pattern': r'\b(task|activity|assignment|job)s?\b',
+        'attributes': ['title', 'description', 'assigned_to', 'due_date', 'status'],
+        'erpnext_doctype': 'Task'
+    }
+}
+
+# Action patterns with CRUD operations, compiled so a window of a text can be scanned
+ACTION_PATTERNS = {
+    action_type: re.compile(pattern, re.IGNORECASE)
+    for action_type, pattern in {
+        'create': r'\b(create|add|new|register|setup|establish)\b',
+        'read': r'\b(view|display|show|list|browse|search|find)\b',
+        'update': r'\b(update|modify|change|edit|revise|adjust)\b',
+        'delete': r'\b(delete|remove|cancel|terminate|deactivate)\b',
+        'process': r'\b(process|handle|manage|execute|perform)\b',
+        'approve': r'\b(approve|authorize|validate|confirm|accept)\b',
+        'track': r'\b(track|monitor|follow|observe|record)\b',
+        'generate': r'\b(generate|produce|create|make|build)\b',
+        'integrate': r'\b(integrate|connect|link|sync|interface)\b',
+        'report': r'\b(report|analyze|summarize|dashboard|metrics)\b'
+    }.items()
+}
+
+# Characters of context kept around an action and words searched for its object
+ACTION_CONTEXT_CHARS = 50
+ACTION_OBJECT_WORDS = 5
+
+# ERPNext operation of each action type, formatted with the action's object
+ERPNEXT_OPERATIONS = {
+    'create': 'Create new {}',
+    'read': 'View {} list/form',
+    'update': 'Edit {} fields',
+    'delete': 'Cancel/delete {}',
+    'approve': 'Workflow approval for {}',
+    'track': 'Track {} status',
+    'generate': 'Generate {} document',
+    'report': 'Create {} report'
+}
+
+# Constraint patterns, compiled so they can be searched within a sentence span
+CONSTRAINT_PATTERNS = {
+    constraint_type: re.compile(pattern, re.IGNORECASE)
+    for constraint_type, pattern in {
+        'validation': r'\b(must be|should be|required|mandatory|validate)\b',
+        'permission': r'\b(only|access|permission|role|authorized)\b',
+        'workflow': r'\b(approval|review|workflow|process|step)\b',
+        'business_rule': r'\b(if|when|unless|condition|rule)\b',
+        'limit': r'\b(maximum|minimum|limit|exceed|below|above)\b',
+        'timing': r'\b(before|after|within|deadline|schedule)\b'
+    }.items()
+}
+
+ROLE_PATTERNS = {
+    'manager': r'\b(manager|supervisor|lead|head|director)\b',
+    'admin': r'\b(admin|administrator|system admin)\b',
+    'user': r'\b(user|employee|staff|worker)\b',
+    'customer': r'\b(customer|client|buyer)\b',
+    'sales': r'\b(sales|salesperson|sales rep)\b',
+    'accountant': r'\b(accountant|finance|accounting)\b',
+    'operator': r'\b(operator|technician|specialist)\b'
+}
+
+PERMISSION_KEYWORDS = ['read', 'write', 'create', 'delete', 'approve', 'access', 'view']
+RESPONSIBILITY_VERBS = ['manage', 'handle', 'process', 'approve', 'review', 'create', 'update']
+
+# Data flow indicators
+FLOW_PATTERNS = [
+    r'from\s+(\w+)\s+to\s+(\w+)',
+    r'(\w+)\s+sends?\s+(\w+)',
+    r'(\w+)\s+receives?\s+(\w+)',
+    r'transfer\s+(\w+)\s+to\s+(\w+)',
+    r'import\s+(\w+)\s+from\s+(\w+)'
+]
+
+INTEGRATION_PATTERNS = {
+    'api': r'\b(api|rest|soap|web service)\b',
+    'database': r'\b(database|db|sql|mysql|postgres)\b',
+    'email': r'\b(email|smtp|mail|notification)\b',
+    'payment': r'\b(payment|gateway|stripe|paypal)\b',
+    'accounting': r'\b(accounting|quickbooks|tally)\b',
+    'erp': r'\b(sap|oracle|erp|system)\b',
+    'file': r'\b(import|export|csv|excel|pdf)\b'
+}
+
+register_keywords(WORKFLOW_KEYWORDS, REPORT_KEYWORDS, CUSTOMIZATION_KEYWORDS, MINIMAL_PARSE_TERMS,
+                  ROLE_PATTERNS, PERMISSION_KEYWORDS, RESPONSIBILITY_VERBS,
+                  *MODULE_KEYWORDS.values(), *ATTRIBUTE_KEYWORDS.values())
+
 
 class RequirementParser:
     """Advanced parser for business requirements"""
     
-    def __init__(self):
+    def __init__(self, max_rule_span: int = DEFAULT_MAX_RULE_SPAN,
+                 sentence_cache_size: int = DEFAULT_SENTENCE_CACHE_SIZE):
         self.business_patterns = self._load_business_patterns()
         self.erpnext_mappings = self._load_erpnext_mappings()
+        self.rule_extractor = BusinessRuleExtractor(max_span=max_rule_span)
+        self.sentence_cache = SentenceCache(sentence_cache_size)
         
-    def parse(self, requirement: str) -> Dict[str, Any]:
+    def parse(self, requirement: Union[str, RequirementDocument], incremental: bool = False) -> Dict[str, Any]:
         """
         Parse business requirement into structured components
         
         Args:
-            requirement: Raw business requirement text
+            requirement: Raw business requirement text or annotated RequirementDocument
+            incremental: Reuse cached results for sentences seen in earlier calls,
+                         so re-parsing an edited requirement only analyzes what changed
             
         Returns:
             Structured parsing result
         """
         try:
+            document = RequirementDocument.coerce(requirement)
+            if incremental and document.sentence_spans:
+                return self.merge_stream_results(self._iter_cached_sentences(document), document.text)
+            
+            entities = self._extract_entities(document)
+            
             result = {
-                'original_text': requirement,
+                'original_text': document.text,
                 'parsed_at': datetime.now().isoformat(),
                 'success': True,
-                'components': self._extract_components(requirement),
-                'entities': self._extract_entities(requirement),
-                'actions': self._extract_actions(requirement),
-                'constraints': self._extract_constraints(requirement),
-                'user_roles': self._extract_user_roles(requirement),
-                'data_flows': self._extract_data_flows(requirement),
-                'business_rules': self._extract_business_rules(requirement),
-                'integration_points': self._extract_integration_points(requirement),
-                'erpnext_suggestions': self._suggest_erpnext_components(requirement)
+                'components': self._extract_components(document),
+                'entities': entities,
+                'actions': [action.to_dict(document.text) for action in self._extract_actions(document)],
+                'constraints': [constraint.to_dict() for constraint in self._extract_constraints(document)],
+                'user_roles': self._extract_user_roles(document),
+                'data_flows': self._extract_data_flows(document),
+                'business_rules': self._extract_business_rules(document),
+                'integration_points': self._extract_integration_points(document),
+                'erpnext_suggestions': self._suggest_erpnext_components(document, entities)
             }
             
             # Validate and enrich the parsing result
@@ -54,43 +239,347 @@ class RequirementParser:
         except Exception as e:
             logger.error(f"Error parsing requirement: {str(e)}")
             return {
-                'original_text': requirement,
+                'original_text': getattr(requirement, 'text', requirement),
                 'parsed_at': datetime.now().isoformat(),
                 'success': False,
                 'error': str(e),
                 'partial_result': self._create_minimal_parse(requirement)
             }
     
-    def _extract_components(self, text: str) -> Dict[str, List[str]]:
-        """Extract high-level components from requirement text"""
-        components = {
-            'functional_requirements': [],
-            'non_functional_requirements': [],
-            'user_stories': [],
-            'business_objectives': [],
-            'technical_constraints': []
+    def parse_many(self, requirements: Iterable[Union[str, RequirementDocument]],
+                   workers: Optional[int] = None, chunksize: int = 8) -> List[Dict[str, Any]]:
+        """
+        Parse many requirements on a pool of worker processes
+        
+        Args:
+            requirements: Requirement texts or documents
+            workers: Number of worker processes (default: CPU count); 1 parses in-process
+            chunksize: Number of requirements sent to a worker at a time
+            
+        Returns:
+            Parsing results in input order
+        """
+        return list(self.iter_parse_many(requirements, workers=workers, chunksize=chunksize))
+    
+    def iter_parse_many(self, requirements: Iterable[Union[str, RequirementDocument]],
+                        workers: Optional[int] = None, chunksize: int = 8) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of ``parse_many``
+        
+        Requirements are read from the iterable only as workers become free
+        (at most two chunks per worker are in flight), and results are yielded
+        in input order as soon as they are ready.
+        """
+        if chunksize <= 0:
+            raise ValueError("chunksize must be positive")
+        workers = workers or os.cpu_count() or 1
+        
+        # Documents are sent as plain text; their annotations are rebuilt in the worker
+        texts = (getattr(requirement, 'text', requirement) for requirement in requirements)
+        chunks = iter(lambda: list(islice(texts, chunksize)), [])
+        
+        if workers == 1:
+            for chunk in chunks:
+                for text in chunk:
+                    yield self.parse(text)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                                 initargs=(self._worker_options(),)) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_parse_in_worker, chunk))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    
+    def _worker_options(self) -> Dict[str, Any]:
+        """Constructor arguments that recreate this parser in a worker process"""
+        return {
+            'max_rule_span': self.rule_extractor.max_span,
+            'sentence_cache_size': self.sentence_cache.max_entries
         }
+    
+    def parse_stream(self, source: StreamSource, read_size: int = STREAM_READ_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Parse a requirement sentence by sentence as its text is read
+        
+        Only a bounded window of the text is held in memory, so multi-megabyte
+        documents can be parsed from a file object or any iterable of text
+        chunks. Pass the partial results to ``merge_stream_results`` to get
+        the result ``parse`` would return for the whole text.
+        
+        Args:
+            source: File object (text or binary), iterable of str/bytes chunks, or a string
+            read_size: Number of characters read from the source at a time
+            
+        Returns:
+            Iterator over one partial result per sentence
+        """
+        return iter(RequirementStream(self._parse_sentence, source, read_size=read_size,
+                                      context_chars=ACTION_CONTEXT_CHARS,
+                                      lookahead_tokens=ACTION_OBJECT_WORDS))
+    
+    def parse_file(self, path: str, encoding: str = 'utf-8',
+                   read_size: int = STREAM_READ_SIZE) -> Dict[str, Any]:
+        """
+        Parse a requirement file without building an annotated document of it
+
+        The file is memory-mapped and parsed sentence by sentence like
+        ``parse_stream``. The whole text is decoded once, as the result's
+        'original_text', but it is scanned a window at a time, so no
+        lower-cased copy or annotated document of the whole file is built.
+
+        Args:
+            path: Path of the requirement file
+            encoding: Text encoding of the file
+            read_size: Number of bytes of the file scanned at a time
+
+        Returns:
+            Structured parsing result, identical to ``parse`` on the file's text
+        """
+        try:
+            with map_file(path) as mapped:
+                text = codecs.decode(mapped, encoding)
+                stream = RequirementStream(self._parse_sentence, iter_mapped_chunks(mapped, read_size),
+                                           read_size=read_size, context_chars=ACTION_CONTEXT_CHARS,
+                                           lookahead_tokens=ACTION_OBJECT_WORDS, encoding=encoding)
+                return self.merge_stream_results(stream, text)
+
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading requirement file {path}: {str(e)}")
+            return {
+                'original_text': '',
+                'parsed_at': datetime.now().isoformat(),
+                'success': False,
+                'error': str(e),
+                'partial_result': self._create_minimal_parse('')
+            }
+
+    def merge_stream_results(self, partials: Iterable[Dict[str, Any]], text: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Merge the partial results of ``parse_stream`` into one parsing result
         
-        # Split into sentences for analysis
-        sentences = self._split_into_sentences(text)
+        Args:
+            partials: Partial results in the order ``parse_stream`` yielded them
+            text: The whole requirement, when the caller already holds it
+            
+        Returns:
+            Structured parsing result, identical to ``parse`` on the whole text
+        """
+        text_parts = []
+        try:
+            components = {category: [] for category in COMPONENT_CATEGORIES}
+            mention_counts: Dict[str, int] = {}
+            actions = []
+            constraints = []
+            rules = {kind: [] for kind in RULE_KINDS}
+            flows = [[] for _ in FLOW_PATTERNS]
+            mentioned_roles = set()
+            # Insertion-ordered dicts stand in for the per-role lists ``parse`` collects
+            role_permissions = {role_name: {} for role_name in ROLE_PATTERNS}
+            role_responsibilities = {role_name: {} for role_name in ROLE_PATTERNS}
+            integration_types = set()
+            keywords = KeywordSummary()
+            
+            for partial in partials:
+                if text is None:
+                    text_parts.append(partial['raw_text'])
+                for category, sentences in partial['components'].items():
+                    components[category].extend(sentences)
+                for entity_name, count in partial['entities'].items():
+                    mention_counts[entity_name] = mention_counts.get(entity_name, 0) + count
+                actions.extend(partial['actions'])
+                constraints.extend(constraint.to_dict() for constraint in partial['constraints'])
+                for kind, rule in zip(partial['rule_kinds'], partial['business_rules']):
+                    rules[kind].append(rule)
+                for pattern_index, flow in zip(partial['flow_patterns'], partial['data_flows']):
+                    flows[pattern_index].append(flow)
+                for role_name, role in partial['user_roles'].items():
+                    if role['mentioned']:
+                        mentioned_roles.add(role_name)
+                    role_permissions[role_name].update(dict.fromkeys(role['permissions']))
+                    role_responsibilities[role_name].update(dict.fromkeys(role['responsibilities']))
+                integration_types.update(partial['integration_types'])
+                keywords.update(partial['keywords'])
+            
+            # Actions are reported grouped by type, in text order within a type
+            action_order = {action_type: i for i, action_type in enumerate(ACTION_PATTERNS)}
+            actions.sort(key=lambda action: action_order[action.type])
+            
+            user_roles = []
+            for role_name in ROLE_PATTERNS:
+                if role_name in mentioned_roles:
+                    user_roles.append({
+                        'name': role_name.title(),
+                        # Build the sets from lists so they iterate exactly like parse's
+                        'permissions': list(set(list(role_permissions[role_name]))),
+                        'suggested_erpnext_role': self._map_to_erpnext_role(role_name),
+                        'responsibilities': list(set(list(role_responsibilities[role_name])))
+                    })
+            
+            if text is None:
+                text = ''.join(text_parts)
+            entities = self._build_entities(mention_counts, keywords)
+            result = {
+                'original_text': text,
+                'parsed_at': datetime.now().isoformat(),
+                'success': True,
+                'components': components,
+                'entities': entities,
+                'actions': [action.to_dict(text) for action in actions],
+                'constraints': constraints,
+                'user_roles': user_roles,
+                'data_flows': [flow for pattern_flows in flows for flow in pattern_flows],
+                'business_rules': [rule for kind in RULE_KINDS for rule in rules[kind]],
+                'integration_points': self._build_integration_points(
+                    integration_type for integration_type in INTEGRATION_PATTERNS
+                    if integration_type in integration_types
+                ),
+                'erpnext_suggestions': self._suggest_erpnext_components(keywords, entities)
+            }
+            
+            return self._validate_and_enrich(result)
+            
+        except Exception as e:
+            logger.error(f"Error merging streamed requirement: {str(e)}")
+            if text is None:
+                text = ''.join(text_parts)
+            return {
+                'original_text': text,
+                'parsed_at': datetime.now().isoformat(),
+                'success': False,
+                'error': str(e),
+                'partial_result': self._create_minimal_parse(text)
+            }
+    
+    def _iter_cached_sentences(self, document: RequirementDocument) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the partial result of every sentence, analyzing only uncached ones
         
-        for sentence in sentences:
-            sentence_lower = sentence.lower().strip()
+        A sentence's result also depends on the text its actions look at
+        around it, so it is cached under the digest of that whole window.
+        """
+        text = document.text
+        spans = document.sentence_spans
+        raw_end = 0
+        
+        for index, (start, end) in enumerate(spans):
+            window_start = max(0, start - ACTION_CONTEXT_CHARS)
+            window_end = self._action_window_end(text, end)
+            window_text = text[window_start:window_end]
+            key = SentenceCache.key(window_text, start - window_start, end - window_start)
+            
+            partial = self.sentence_cache.get(key)
+            if partial is None:
+                partial = self._parse_sentence(RequirementDocument(window_text), start - window_start,
+                                               end - window_start, 0, 0, '')
+                self.sentence_cache.put(key, partial)
+            
+            next_start = spans[index + 1][0] if index + 1 < len(spans) else len(text)
+            yield {
+                **partial,
+                'index': index,
+                'start': start,
+                'end': end,
+                'raw_text': text[raw_end:next_start],
+                # Results must not share mutable items with the cache; records are never modified
+                'actions': [action.shifted(window_start) for action in partial['actions']],
+                'constraints': list(partial['constraints']),
+                'business_rules': [dict(rule) for rule in partial['business_rules']],
+                'data_flows': [dict(flow) for flow in partial['data_flows']]
+            }
+            raw_end = next_start
+    
+    def _action_window_end(self, text: str, end: int) -> int:
+        """End of the text that actions of a sentence ending at end look at"""
+        window_end = min(len(text), end + ACTION_CONTEXT_CHARS)
+        for count, match in enumerate(TOKEN_PATTERN.finditer(text, end), 1):
+            if count == ACTION_OBJECT_WORDS:
+                return max(window_end, match.end())
+        return len(text)
+    
+    def _parse_sentence(self, window: RequirementDocument, start: int, end: int,
+                        offset: int, index: int, raw_text: str) -> Dict[str, Any]:
+        """
+        Parse one sentence of a streamed requirement
+        
+        Args:
+            window: Buffered text around the sentence
+            start: Sentence start offset in the window
+            end: Sentence end offset in the window
+            offset: Offset of the window in the whole text
+            index: Sentence number in the whole text
+            raw_text: Text handed out with this sentence, see RequirementStream
+            
+        Returns:
+            Partial result: what the sentence contributes to every part of ``parse``
+        """
+        sentence = window.text[start:end]
+        document = RequirementDocument.for_sentence(sentence)
+        
+        rule_kinds, rules = [], []
+        for kind, rule in self._iter_business_rules(document):
+            rule_kinds.append(kind)
+            rules.append(rule)
+        
+        flow_patterns, flows = [], []
+        for pattern_index, flow in self._iter_data_flows(document):
+            flow_patterns.append(pattern_index)
+            flows.append(flow)
+        
+        user_roles = {}
+        for role_name, pattern in ROLE_PATTERNS.items():
+            role = {
+                'mentioned': bool(re.search(pattern, document.lower, re.IGNORECASE)),
+                'permissions': self._collect_role_permissions(document, role_name),
+                'responsibilities': self._collect_role_responsibilities(document, role_name)
+            }
+            if role['mentioned'] or role['permissions'] or role['responsibilities']:
+                user_roles[role_name] = role
+        
+        return {
+            'index': index,
+            'start': offset + start,
+            'end': offset + end,
+            'sentence': sentence,
+            'raw_text': raw_text,
+            'components': self._extract_components(document),
+            'entities': self._count_entity_mentions(document),
+            'actions': self._extract_actions(window, start, end, offset),
+            'constraints': self._extract_constraints(document),
+            'business_rules': rules,
+            'rule_kinds': rule_kinds,
+            'data_flows': flows,
+            'flow_patterns': flow_patterns,
+            'user_roles': user_roles,
+            'integration_types': self._find_integration_types(document),
+            'keywords': sorted(document.keyword_offsets)
+        }
+    
+    def _extract_components(self, document: RequirementDocument) -> Dict[str, List[str]]:
+        """Extract high-level components from requirement text"""
+        components = {category: [] for category in COMPONENT_CATEGORIES}
+        
+        # Match keywords within each sentence span; only matching sentences are copied out
+        contains = document.sentence_contains
+        for index, sentence in enumerate(document.sentences):
             
             # Functional requirements (what the system should do)
-            if any(word in sentence_lower for word in ['should', 'must', 'will', 'need to', 'able to']):
+            if any(contains(index, word) for word in ['should', 'must', 'will', 'need to', 'able to']):
                 components['functional_requirements'].append(sentence)
             
             # User stories (as a user, I want...)
-            if 'as a' in sentence_lower and ('i want' in sentence_lower or 'i need' in sentence_lower):
+            if contains(index, 'as a') and (contains(index, 'i want') or contains(index, 'i need')):
                 components['user_stories'].append(sentence)
             
             # Business objectives (to achieve, goal, objective)
-            if any(word in sentence_lower for word in ['goal', 'objective', 'achieve', 'improve', 'increase']):
+            if any(contains(index, word) for word in ['goal', 'objective', 'achieve', 'improve', 'increase']):
                 components['business_objectives'].append(sentence)
             
             # Technical constraints (performance, security, integration)
-            if any(word in sentence_lower for word in ['integrate', 'performance', 'secure', 'fast', 'api']):
+            if any(contains(index, word) for word in ['integrate', 'performance', 'secure', 'fast', 'api']):
                 components['technical_constraints'].append(sentence)
             else:
                 # Default to functional requirement
@@ -98,257 +587,183 @@ class RequirementParser:
         
         return components
     
-    def _extract_entities(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_entities(self, document: RequirementDocument) -> List[Dict[str, Any]]:
         """Extract business entities with their attributes"""
-        entities = []
+        return self._build_entities(self._count_entity_mentions(document), document)
+    
+    def _count_entity_mentions(self, document: RequirementDocument) -> Dict[str, int]:
+        """Count the mentions of every business entity found in the text"""
+        mention_counts = {}
         
-        # Enhanced entity patterns with attributes
-        entity_patterns = {
-            'customer': {
-                'pattern': r'\b(customer|client|buyer|purchaser)s?\b',
-                'attributes': ['name', 'email', 'phone', 'address', 'type'],
-                'erpnext_doctype': 'Customer'
-            },
-            'supplier': {
-                'pattern': r'\b(supplier|vendor|provider)s?\b',
-                'attributes': ['name', 'email', 'phone', 'address', 'payment_terms'],
-                'erpnext_doctype': 'Supplier'
-            },
-            'product': {
-                'pattern': r'\b(product|item|good|merchandise|inventory)s?\b',
-                'attributes': ['name', 'description', 'price', 'category', 'stock'],
-                'erpnext_doctype': 'Item'
-            },
-            'order': {
-                'pattern': r'\b(order|purchase|sale)s?\b',
-                'attributes': ['date', 'amount', 'status', 'customer', 'items'],
-                'erpnext_doctype': 'Sales Order'
-            },
-            'invoice': {
-                'pattern': r'\b(invoice|bill|receipt)s?\b',
-                'attributes': ['number', 'date', 'amount', 'due_date', 'status'],
-                'erpnext_doctype': 'Sales Invoice'
-            },
-            'employee': {
-                'pattern': r'\b(employee|staff|worker|personnel)s?\b',
-                'attributes': ['name', 'position', 'department', 'email', 'phone'],
-                'erpnext_doctype': 'Employee'
-            },
-            'project': {
-                'pattern': r'\b(project|initiative|program)s?\b',
-                'attributes': ['name', 'description', 'start_date', 'end_date', 'status'],
-                'erpnext_doctype': 'Project'
-            },
-            'task': {
-                'pattern': r'\b(task|activity|assignment|job)s?\b',
-                'attributes': ['title', 'description', 'assigned_to', 'due_date', 'status'],
-                'erpnext_doctype': 'Task'
-            }
-        }
+        for entity_name, entity_info in ENTITY_PATTERNS.items():
+            matches = re.findall(entity_info['pattern'], document.lower, re.IGNORECASE)
+            if matches:
+                mention_counts[entity_name] = len(matches)
         
-        text_lower = text.lower()
+        return mention_counts
+    
+    def _build_entities(self, mention_counts: Dict[str, int],
+                        keywords: Union[RequirementDocument, KeywordSummary]) -> List[Dict[str, Any]]:
+        """Build prioritized entity descriptions from their mention counts"""
+        entities = []
         
-        for entity_name, entity_info in entity_patterns.items():
-            matches = re.findall(entity_info['pattern'], text_lower, re.IGNORECASE)
-            if matches:
+        for entity_name, entity_info in ENTITY_PATTERNS.items():
+            occurrences = mention_counts.get(entity_name)
+            if occurrences:
                 # Extract potential attributes mentioned in context
-                context_attributes = self._extract_entity_attributes(text, entity_name, entity_info['attributes'])
+                context_attributes = self._extract_entity_attributes(keywords, entity_name, entity_info['attributes'])
                 
                 entities.append({
                     'name': entity_name,
                     'type': 'business_entity',
-                    'occurrences': len(matches),
+                    'occurrences': occurrences,
                     'suggested_doctype': entity_info['erpnext_doctype'],
                     'standard_attributes': entity_info['attributes'],
                     'context_attributes': context_attributes,
-                    'priority': self._calculate_entity_priority(entity_name, len(matches), context_attributes)
+                    'priority': self._calculate_entity_priority(entity_name, occurrences, context_attributes)
                 })
         
         return sorted(entities, key=lambda x: x['priority'], reverse=True)
     
-    def _extract_actions(self, text: str) -> List[Dict[str, Any]]:
-        """Extract actions and operations from requirement text"""
-        actions = []
-        
-        # Action patterns with CRUD operations
-        action_patterns = {
-            'create': r'\b(create|add|new|register|setup|establish)\b',
-            'read': r'\b(view|display|show|list|browse|search|find)\b',
-            'update': r'\b(update|modify|change|edit|revise|adjust)\b',
-            'delete': r'\b(delete|remove|cancel|terminate|deactivate)\b',
-            'process': r'\b(process|handle|manage|execute|perform)\b',
-            'approve': r'\b(approve|authorize|validate|confirm|accept)\b',
-            'track': r'\b(track|monitor|follow|observe|record)\b',
-            'generate': r'\b(generate|produce|create|make|build)\b',
-            'integrate': r'\b(integrate|connect|link|sync|interface)\b',
-            'report': r'\b(report|analyze|summarize|dashboard|metrics)\b'
-        }
-        
-        text_lower = text.lower()
+    def _extract_actions(self, document: RequirementDocument, start: int = 0,
+                         end: Optional[int] = None, offset: int = 0) -> List[ActionRecord]:
+        """
+        Extract actions and operations from requirement text
         
-        for action_type, pattern in action_patterns.items():
-            matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
+        Args:
+            document: Requirement document, or a window of a larger text
+            start: Offset in the document where verbs are looked for
+            end: Offset in the document where the search stops (default: end of text)
+            offset: Offset of the document within the larger text, added to positions
+        """
+        actions = []
+        text = document.text
+        lower = document.lower
+        if end is None:
+            end = len(lower)
+        
+        for action_type, pattern in ACTION_PATTERNS.items():
+            operation_template = self._operation_template(action_type)
+            for match in pattern.finditer(lower, start, end):
                 # Try to find the object of the action
-                action_object = self._find_action_object(text, match.start(), match.end())
+                action_object = self._find_action_object(document, match.start(), match.end())
+                context_start, context_end = self._get_action_context_span(text, match.start(), match.end())
                 
-                actions.append({
-                    'type': action_type,
-                    'verb': match.group(),
-                    'object': action_object,
-                    'position': match.start(),
-                    'context': self._get_action_context(text, match.start(), match.end()),
-                    'erpnext_operation': self._map_to_erpnext_operation(action_type, action_object)
-                })
+                actions.append(ActionRecord(
+                    type=action_type,
+                    verb=sys.intern(match.group()),
+                    object=action_object,
+                    verb_start=match.start(),
+                    context_start=context_start,
+                    context_end=context_end,
+                    operation_template=operation_template,
+                    offset=offset
+                ))
         
         return actions
     
-    def _extract_constraints(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_constraints(self, document: RequirementDocument) -> List[ConstraintRecord]:
         """Extract business constraints and rules"""
         constraints = []
-        
-        # Constraint patterns
-        constraint_patterns = {
-            'validation': r'\b(must be|should be|required|mandatory|validate)\b',
-            'permission': r'\b(only|access|permission|role|authorized)\b',
-            'workflow': r'\b(approval|review|workflow|process|step)\b',
-            'business_rule': r'\b(if|when|unless|condition|rule)\b',
-            'limit': r'\b(maximum|minimum|limit|exceed|below|above)\b',
-            'timing': r'\b(before|after|within|deadline|schedule)\b'
-        }
-        
-        text_lower = text.lower()
-        sentences = self._split_into_sentences(text)
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            for constraint_type, pattern in constraint_patterns.items():
-                if re.search(pattern, sentence_lower, re.IGNORECASE):
-                    constraints.append({
-                        'type': constraint_type,
-                        'description': sentence.strip(),
-                        'severity': self._assess_constraint_severity(sentence),
-                        'implementation_suggestion': self._suggest_constraint_implementation(constraint_type, sentence)
-                    })
+        text = document.text
+        lower = document.lower
+        
+        for (start, end), (text_start, text_end) in zip(document.lower_sentence_spans, document.sentence_spans):
+            severity = None
+            for constraint_type, pattern in CONSTRAINT_PATTERNS.items():
+                if pattern.search(lower, start, end):
+                    sentence = text[text_start:text_end]
+                    if severity is None:
+                        severity = self._assess_constraint_severity(sentence)
+                    constraints.append(ConstraintRecord(
+                        type=constraint_type,
+                        source=text,
+                        start=text_start,
+                        end=text_end,
+                        severity=severity,
+                        implementation_suggestion=self._suggest_constraint_implementation(constraint_type, sentence)
+                    ))
         
         return constraints
     
-    def _extract_user_roles(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_user_roles(self, document: RequirementDocument) -> List[Dict[str, Any]]:
         """Extract user roles and their responsibilities"""
         roles = []
         
-        # Role patterns
-        role_patterns = {
-            'manager': r'\b(manager|supervisor|lead|head|director)\b',
-            'admin': r'\b(admin|administrator|system admin)\b',
-            'user': r'\b(user|employee|staff|worker)\b',
-            'customer': r'\b(customer|client|buyer)\b',
-            'sales': r'\b(sales|salesperson|sales rep)\b',
-            'accountant': r'\b(accountant|finance|accounting)\b',
-            'operator': r'\b(operator|technician|specialist)\b'
-        }
-        
-        text_lower = text.lower()
-        
-        for role_name, pattern in role_patterns.items():
-            if re.search(pattern, text_lower, re.IGNORECASE):
+        for role_name, pattern in ROLE_PATTERNS.items():
+            if re.search(pattern, document.lower, re.IGNORECASE):
                 # Extract permissions and responsibilities for this role
-                permissions = self._extract_role_permissions(text, role_name)
+                permissions = self._extract_role_permissions(document, role_name)
                 
                 roles.append({
                     'name': role_name.title(),
                     'permissions': permissions,
                     'suggested_erpnext_role': self._map_to_erpnext_role(role_name),
-                    'responsibilities': self._extract_role_responsibilities(text, role_name)
+                    'responsibilities': self._extract_role_responsibilities(document, role_name)
                 })
         
         return roles
     
-    def _extract_data_flows(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_data_flows(self, document: RequirementDocument) -> List[Dict[str, Any]]:
         """Extract data flow patterns"""
-        flows = []
-        
-        # Data flow indicators
-        flow_patterns = [
-            r'from\s+(\w+)\s+to\s+(\w+)',
-            r'(\w+)\s+sends?\s+(\w+)',
-            r'(\w+)\s+receives?\s+(\w+)',
-            r'transfer\s+(\w+)\s+to\s+(\w+)',
-            r'import\s+(\w+)\s+from\s+(\w+)'
-        ]
-        
-        for pattern in flow_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        return [flow for _, flow in self._iter_data_flows(document)]
+    
+    def _iter_data_flows(self, document: RequirementDocument) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (index into FLOW_PATTERNS, data flow) grouped by flow pattern"""
+        for pattern_index, pattern in enumerate(FLOW_PATTERNS):
+            matches = re.finditer(pattern, document.text, re.IGNORECASE)
             for match in matches:
                 groups = match.groups()
                 if len(groups) >= 2:
-                    flows.append({
+                    yield pattern_index, {
                         'source': groups[0],
                         'target': groups[1] if len(groups) > 1 else 'system',
                         'type': 'data_transfer',
                         'context': match.group()
-                    })
-        
-        return flows
+                    }
     
-    def _extract_business_rules(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_business_rules(self, document: RequirementDocument) -> List[Dict[str, Any]]:
         """Extract business rules and logic"""
-        rules = []
-        
-        # Business rule patterns
-        rule_patterns = [
-            r'if\s+(.+?)\s+then\s+(.+?)(?:\.|$)',
-            r'when\s+(.+?),\s*(.+?)(?:\.|$)',
-            r'unless\s+(.+?),\s*(.+?)(?:\.|$)',
-            r'condition:\s*(.+?)(?:\.|$)',
-            r'rule:\s*(.+?)(?:\.|$)'
-        ]
-        
-        for pattern in rule_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                groups = match.groups()
-                condition = groups[0].strip() if len(groups) > 0 else ""
-                action = groups[1].strip() if len(groups) > 1 else ""
-                
-                rules.append({
-                    'condition': condition,
-                    'action': action,
-                    'type': 'business_rule',
-                    'implementation': self._suggest_rule_implementation(condition, action)
-                })
-        
-        return rules
+        return [rule for _, rule in self._iter_business_rules(document)]
+    
+    def _iter_business_rules(self, document: RequirementDocument) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (rule kind, business rule) grouped by rule kind"""
+        # Rules are matched per sentence and within a bounded span of their keyword
+        for kind, condition, action in self.rule_extractor.extract(document.text, document.sentence_spans):
+            yield kind, {
+                'condition': condition,
+                'action': action,
+                'type': 'business_rule',
+                'implementation': self._suggest_rule_implementation(condition, action)
+            }
     
-    def _extract_integration_points(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_integration_points(self, document: RequirementDocument) -> List[Dict[str, Any]]:
         """Extract integration requirements"""
+        return self._build_integration_points(self._find_integration_types(document))
+    
+    def _find_integration_types(self, document: RequirementDocument) -> List[str]:
+        """Find the integration types mentioned in the text"""
+        return [
+            integration_type for integration_type, pattern in INTEGRATION_PATTERNS.items()
+            if re.search(pattern, document.lower, re.IGNORECASE)
+        ]
+    
+    def _build_integration_points(self, integration_types: Iterable[str]) -> List[Dict[str, Any]]:
+        """Describe the given integration types"""
         integrations = []
         
-        # Integration keywords
-        integration_patterns = {
-            'api': r'\b(api|rest|soap|web service)\b',
-            'database': r'\b(database|db|sql|mysql|postgres)\b',
-            'email': r'\b(email|smtp|mail|notification)\b',
-            'payment': r'\b(payment|gateway|stripe|paypal)\b',
-            'accounting': r'\b(accounting|quickbooks|tally)\b',
-            'erp': r'\b(sap|oracle|erp|system)\b',
-            'file': r'\b(import|export|csv|excel|pdf)\b'
-        }
-        
-        text_lower = text.lower()
-        
-        for integration_type, pattern in integration_patterns.items():
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                integrations.append({
-                    'type': integration_type,
-                    'description': f"Integration with {integration_type} systems",
-                    'complexity': self._assess_integration_complexity(integration_type),
-                    'implementation_approach': self._suggest_integration_approach(integration_type)
-                })
+        for integration_type in integration_types:
+            integrations.append({
+                'type': integration_type,
+                'description': f"Integration with {integration_type} systems",
+                'complexity': self._assess_integration_complexity(integration_type),
+                'implementation_approach': self._suggest_integration_approach(integration_type)
+            })
         
         return integrations
     
-    def _suggest_erpnext_components(self, text: str) -> Dict[str, Any]:
+    def _suggest_erpnext_components(self, document: Union[RequirementDocument, KeywordSummary],
+                                    entities: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Suggest ERPNext components based on parsed requirement"""
         suggestions = {
             'modules': [],
@@ -358,40 +773,27 @@ class RequirementParser:
             'customizations': []
         }
         
-        text_lower = text.lower()
-        
         # Module suggestions
-        module_keywords = {
-            'Selling': ['sales', 'customer', 'quotation', 'order'],
-            'Buying': ['purchase', 'supplier', 'procurement'],
-            'Stock': ['inventory', 'warehouse', 'item', 'stock'],
-            'Accounts': ['accounting', 'invoice', 'payment', 'financial'],
-            'CRM': ['lead', 'opportunity', 'customer relationship'],
-            'Projects': ['project', 'task', 'timesheet'],
-            'HR': ['employee', 'payroll', 'leave', 'attendance'],
-            'Manufacturing': ['production', 'bom', 'work order'],
-            'Quality Management': ['quality', 'inspection', 'testing']
-        }
-        
-        for module, keywords in module_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for module, keywords in MODULE_KEYWORDS.items():
+            if document.contains_any(keywords):
                 suggestions['modules'].append(module)
         
         # DocType suggestions based on entities
-        entities = self._extract_entities(text)
+        if entities is None:
+            entities = self._extract_entities(document)
         for entity in entities:
             suggestions['doctypes'].append(entity['suggested_doctype'])
         
         # Workflow suggestions
-        if any(word in text_lower for word in ['approval', 'review', 'workflow', 'process']):
+        if document.contains_any(WORKFLOW_KEYWORDS):
             suggestions['workflows'].append('Document Approval Workflow')
         
         # Report suggestions
-        if any(word in text_lower for word in ['report', 'analytics', 'dashboard', 'summary']):
+        if document.contains_any(REPORT_KEYWORDS):
             suggestions['reports'].append('Custom Reports')
         
         # Customization suggestions
-        if any(word in text_lower for word in ['custom', 'specific', 'unique', 'special']):
+        if document.contains_any(CUSTOMIZATION_KEYWORDS):
             suggestions['customizations'].append('Custom Fields and Scripts')
         
         return suggestions
@@ -417,31 +819,14 @@ class RequirementParser:
             'task': 'Task'
         }
     
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """Split text into sentences"""
-        return [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
-    
-    def _extract_entity_attributes(self, text: str, entity_name: str, standard_attributes: List[str]) -> List[str]:
+    def _extract_entity_attributes(self, document: Union[RequirementDocument, KeywordSummary], entity_name: str,
+                                   standard_attributes: List[str]) -> List[str]:
         """Extract attributes mentioned for an entity in the context"""
         context_attributes = []
         
         # Look for attribute keywords around entity mentions
-        attribute_keywords = {
-            'name': ['name', 'title', 'called'],
-            'email': ['email', 'mail', 'contact'],
-            'phone': ['phone', 'mobile', 'telephone'],
-            'address': ['address', 'location'],
-            'date': ['date', 'time', 'when'],
-            'amount': ['amount', 'value', 'price', 'cost'],
-            'status': ['status', 'state', 'condition'],
-            'type': ['type', 'category', 'kind'],
-            'description': ['description', 'details', 'info']
-        }
-        
-        text_lower = text.lower()
-        
-        for attr_name, keywords in attribute_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for attr_name, keywords in ATTRIBUTE_KEYWORDS.items():
+            if document.contains_any(keywords):
                 context_attributes.append(attr_name)
         
         return context_attributes
@@ -465,10 +850,10 @@ class RequirementParser:
         
         return priority
     
-    def _find_action_object(self, text: str, start: int, end: int) -> str:
+    def _find_action_object(self, document: RequirementDocument, start: int, end: int) -> str:
         """Find the object of an action verb"""
         # Look for nouns following the action verb
-        words_after = text[end:].split()[:5]  # Look at next 5 words
+        words_after = document.tokens_after(end, ACTION_OBJECT_WORDS)  # Look at next 5 words
         
         # Common business objects
         business_objects = ['customer', 'order', 'product', 'invoice', 'report', 'data']
@@ -476,30 +861,17 @@ class RequirementParser:
         for word in words_after:
             clean_word = re.sub(r'[^\w]', '', word.lower())
             if clean_word in business_objects:
-                return clean_word
+                return sys.intern(clean_word)
         
         return 'object'
     
-    def _get_action_context(self, text: str, start: int, end: int) -> str:
-        """Get context around an action"""
-        context_start = max(0, start - 50)
-        context_end = min(len(text), end + 50)
-        return text[context_start:context_end].strip()
-    
-    def _map_to_erpnext_operation(self, action_type: str, action_object: str) -> str:
-        """Map action to ERPNext operation"""
-        mapping = {
-            'create': f"Create new {action_object}",
-            'read': f"View {action_object} list/form",
-            'update': f"Edit {action_object} fields",
-            'delete': f"Cancel/delete {action_object}",
-            'approve': f"Workflow approval for {action_object}",
-            'track': f"Track {action_object} status",
-            'generate': f"Generate {action_object} document",
-            'report': f"Create {action_object} report"
-        }
-        
-        return mapping.get(action_type, f"{action_type} {action_object}")
+    def _get_action_context_span(self, text: str, start: int, end: int) -> Tuple[int, int]:
+        """Get the offsets of the context around an action"""
+        return max(0, start - ACTION_CONTEXT_CHARS), min(len(text), end + ACTION_CONTEXT_CHARS)
+    
+    def _operation_template(self, action_type: str) -> str:
+        """Get the ERPNext operation template of an action type"""
+        return ERPNEXT_OPERATIONS.get(action_type, f"{action_type} {{}}")
     
     def _assess_constraint_severity(self, constraint_text: str) -> str:
         """Assess the severity of a constraint"""
@@ -528,21 +900,14 @@ class RequirementParser:
         
         return suggestions.get(constraint_type, 'Custom implementation required')
     
-    def _extract_role_permissions(self, text: str, role_name: str) -> List[str]:
+    def _extract_role_permissions(self, document: RequirementDocument, role_name: str) -> List[str]:
         """Extract permissions for a specific role"""
-        permissions = []
-        
+        return list(set(self._collect_role_permissions(document, role_name)))
+    
+    def _collect_role_permissions(self, document: RequirementDocument, role_name: str) -> List[str]:
+        """Collect permission keywords from the sentences mentioning a role, in text order"""
         # Look for permission-related keywords near role mentions
-        permission_keywords = ['read', 'write', 'create', 'delete', 'approve', 'access', 'view']
-        
-        sentences = self._split_into_sentences(text)
-        for sentence in sentences:
-            if role_name in sentence.lower():
-                for perm in permission_keywords:
-                    if perm in sentence.lower():
-                        permissions.append(perm)
-        
-        return list(set(permissions))
+        return self._collect_role_keywords(document, role_name, PERMISSION_KEYWORDS)
     
     def _map_to_erpnext_role(self, role_name: str) -> str:
         """Map role to ERPNext standard role"""
@@ -558,20 +923,43 @@ class RequirementParser:
         
         return role_mapping.get(role_name, 'Employee')
     
-    def _extract_role_responsibilities(self, text: str, role_name: str) -> List[str]:
+    def _extract_role_responsibilities(self, document: RequirementDocument, role_name: str) -> List[str]:
         """Extract responsibilities for a role"""
-        responsibilities = []
+        return list(set(self._collect_role_responsibilities(document, role_name)))
+    
+    def _collect_role_responsibilities(self, document: RequirementDocument, role_name: str) -> List[str]:
+        """Collect responsibilities from the sentences mentioning a role, in text order"""
+        # Look for action verbs in the sentences
+        verbs = self._collect_role_keywords(document, role_name, RESPONSIBILITY_VERBS)
+        return [f"{verb.title()} related tasks" for verb in verbs]
+    
+    def _collect_role_keywords(self, document: RequirementDocument, role_name: str,
+                               keywords: List[str]) -> List[str]:
+        """
+        Collect the keywords that share a sentence with a role mention
         
-        sentences = self._split_into_sentences(text)
-        for sentence in sentences:
-            if role_name in sentence.lower():
-                # Look for action verbs in the sentence
-                action_verbs = ['manage', 'handle', 'process', 'approve', 'review', 'create', 'update']
-                for verb in action_verbs:
-                    if verb in sentence.lower():
-                        responsibilities.append(f"{verb.title()} related tasks")
+        Intersects the sentence IDs of the role with those of each keyword
+        instead of searching every sentence for every keyword.
         
-        return list(set(responsibilities))
+        Args:
+            document: Annotated requirement
+            role_name: Lower-case role keyword
+            keywords: Keywords to look for, in reporting order
+            
+        Returns:
+            One entry per sentence and keyword found in it, by sentence then keyword order
+        """
+        role_sentences = document.sentences_with(role_name)
+        if not role_sentences:
+            return []
+        
+        hits = []
+        for position, keyword in enumerate(keywords):
+            for sentence_id in role_sentences & document.sentences_with(keyword):
+                hits.append((sentence_id, position))
+        hits.sort()
+        
+        return [keywords[position] for _, position in hits]
     
     def _assess_integration_complexity(self, integration_type: str) -> str:
         """Assess complexity of integration"""
@@ -654,13 +1042,28 @@ class RequirementParser:
             }
         }
     
-    def _create_minimal_parse(self, requirement: str) -> Dict[str, Any]:
+    def _create_minimal_parse(self, requirement: Union[str, RequirementDocument]) -> Dict[str, Any]:
         """Create minimal parsing result for fallback"""
+        document = RequirementDocument.coerce(requirement)
         return {
             'basic_info': {
-                'word_count': len(requirement.split()),
-                'sentence_count': len(self._split_into_sentences(requirement)),
-                'has_business_terms': any(term in requirement.lower() 
-                                        for term in ['customer', 'order', 'product', 'invoice'])
+                'word_count': document.word_count,
+                'sentence_count': len(document.sentence_spans),
+                'has_business_terms': document.contains_any(MINIMAL_PARSE_TERMS)
             }
-        }
\ No newline at end of file
+        }
+
+
+_worker_parser: Optional[RequirementParser] = None
+
+
+def _init_parse_worker(parser_options: Dict[str, Any]):
+    """Build the parser and its keyword tables once per worker process"""
+    global _worker_parser
+    _worker_parser = RequirementParser(**parser_options)
+    get_keyword_automaton()
+
+
+def _parse_in_worker(texts: List[str]) -> List[Dict[str, Any]]:
+    """Parse a chunk of requirements in a worker process"""
+    return [_worker_parser.parse(text) for text in texts]
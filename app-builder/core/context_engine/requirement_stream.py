@@ -0,0 +1,172 @@
+"""
+Requirement Stream for ERPNext App Builder
+
+This module feeds a requirement that arrives in chunks (a file object or any
+iterable of text) to a sentence parser one sentence at a time, keeping only a
+bounded window of the text in memory.
+"""
+
+import os
+import mmap
+import codecs
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, Union
+
+from .requirement_document import RequirementDocument, TOKEN_PATTERN
+from .sentence_segmenter import segment_sentences
+
+logger = logging.getLogger(__name__)
+
+STREAM_READ_SIZE = 64 * 1024
+
+StreamSource = Union[str, IO, Iterable[Union[str, bytes]]]
+
+# parse_sentence(window, start, end, offset, index, raw_text) -> partial result
+SentenceParser = Callable[[RequirementDocument, int, int, int, int, str], Dict[str, Any]]
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Memory-map a file read-only; an empty file, which cannot be mapped, gives b''"""
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_mapped_chunks(mapped: Union[mmap.mmap, bytes], read_size: int = STREAM_READ_SIZE) -> Iterator[bytes]:
+    """Yield consecutive chunks of mapped bytes, for RequirementStream to decode"""
+    for start in range(0, len(mapped), read_size):
+        yield mapped[start:start + read_size]
+
+
+class RequirementStream:
+    """Iterator over per-sentence results for a requirement read in chunks
+    
+    A sentence is handed to the sentence parser once it is complete and enough
+    text follows it for everything the parser looks at past the sentence end
+    (``context_chars`` characters and ``lookahead_tokens`` whole words). Text
+    before the last parsed sentence is dropped except for the
+    ``context_chars`` the next sentence can reach back into, so memory is
+    bounded by the longest sentence plus the read size, not by the document.
+    
+    Each result receives the raw text from the end of the previous sentence's
+    raw text up to the start of the next sentence, so joining the raw text of
+    all results reproduces the document exactly.
+    """
+    
+    def __init__(self, parse_sentence: SentenceParser, source: StreamSource,
+                 read_size: int = STREAM_READ_SIZE, context_chars: int = 0,
+                 lookahead_tokens: int = 0, encoding: str = 'utf-8'):
+        if read_size <= 0:
+            raise ValueError("read_size must be positive")
+        
+        self.parse_sentence = parse_sentence
+        self.source = source
+        self.read_size = read_size
+        self.context_chars = context_chars
+        self.lookahead_tokens = lookahead_tokens
+        self.encoding = encoding
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._buffer = ''
+        self._base = 0           # offset of the buffer in the whole text
+        self._sentence_end = 0   # end of the last parsed sentence
+        self._raw_end = 0        # end of the raw text handed out so far
+        self._index = 0
+        
+        pending = []
+        pending_size = 0
+        for chunk in self._iter_chunks():
+            pending.append(chunk)
+            pending_size += len(chunk)
+            # Segmenting rescans the buffer, so wait until the new text is at least as long
+            if pending_size < max(self.read_size, len(self._buffer)):
+                continue
+            
+            self._buffer += ''.join(pending)
+            pending = []
+            pending_size = 0
+            yield from self._drain(at_end=False)
+        
+        self._buffer += ''.join(pending)
+        yield from self._drain(at_end=True)
+        
+        if self._index == 0 and self._buffer:
+            # Text without any sentence still hands out its raw text
+            end = len(self._buffer)
+            yield self.parse_sentence(RequirementDocument(self._buffer), end, end, 0, 0, self._buffer)
+    
+    def _iter_chunks(self) -> Iterator[str]:
+        """Yield non-empty text chunks from the source, decoding bytes incrementally"""
+        source = self.source
+        if isinstance(source, str):
+            chunks = iter((source,))
+        elif hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(self.read_size), source.read(0))
+        else:
+            chunks = iter(source)
+        
+        decoder = None
+        for chunk in chunks:
+            if isinstance(chunk, (bytes, bytearray)):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(self.encoding)()
+                chunk = decoder.decode(chunk)
+            if chunk:
+                yield chunk
+        
+        if decoder is not None:
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+    
+    def _drain(self, at_end: bool) -> Iterator[Dict[str, Any]]:
+        """Parse every sentence of the buffer that can no longer change"""
+        buffer = self._buffer
+        base = self._base
+        spans = segment_sentences(buffer, self._sentence_end - base)
+        
+        # Until the text ends, the last sentence may still grow
+        ready = len(spans) if at_end else len(spans) - 1
+        window = None
+        
+        for i in range(ready):
+            start, end = spans[i]
+            if not at_end and not self._has_lookahead(buffer, end):
+                break
+            
+            if window is None:
+                window = RequirementDocument(buffer)
+            next_start = spans[i + 1][0] if i + 1 < len(spans) else len(buffer)
+            raw_text = buffer[self._raw_end - base:next_start]
+            
+            yield self.parse_sentence(window, start, end, base, self._index, raw_text)
+            
+            self._index += 1
+            self._sentence_end = base + end
+            self._raw_end = base + next_start
+        
+        # Keep only the text the next sentence can still reach back into
+        keep_from = max(0, self._sentence_end - base - self.context_chars)
+        if keep_from:
+            self._buffer = buffer[keep_from:]
+            self._base = base + keep_from
+    
+    def _has_lookahead(self, buffer: str, end: int) -> bool:
+        """Check whether the buffer holds everything a sentence ending at end looks at"""
+        if len(buffer) - end < self.context_chars:
+            return False
+        if not self.lookahead_tokens:
+            return True
+        
+        count = 0
+        for match in TOKEN_PATTERN.finditer(buffer, end):
+            count += 1
+            if count == self.lookahead_tokens:
+                # The last word must be followed by whitespace to be complete
+                return match.end() < len(buffer)
+        return False
@@ -0,0 +1,112 @@
+"""
+Business Rule Extractor for ERPNext App Builder
+
+This module extracts conditional business rules ("if ... then ...",
+"when ..., ...", "rule: ...") from requirement text in linear time.
+"""
+
+import re
+import logging
+from bisect import bisect_right
+from typing import Dict, List, Tuple, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RULE_SPAN = 500
+
+# Rule keywords in the order their rules are reported
+RULE_KINDS = ('if', 'when', 'unless', 'condition', 'rule')
+
+RULE_KEYWORD_PATTERN = re.compile(
+    r'\b(?:(?P<clause>if|when|unless)\s+|(?P<label>condition|rule):\s*)', re.IGNORECASE
+)
+
+# Separator between condition and action for clause-style rules
+RULE_SEPARATOR_PATTERNS = {
+    'if': re.compile(r'\s+then\s+', re.IGNORECASE),
+    'when': re.compile(r',\s*'),
+    'unless': re.compile(r',\s*')
+}
+
+
+class BusinessRuleExtractor:
+    """Linear-time, bounded extractor for conditional business rules
+    
+    A rule never crosses a sentence boundary and never extends more than
+    ``max_span`` characters past its keyword. Keywords and separators are
+    each found with a single scan of the text, and every keyword is paired
+    with the next separator through a forward-only cursor, so adversarial
+    input (many "if"s and no "then") costs the same as ordinary text.
+    """
+    
+    def __init__(self, max_span: int = DEFAULT_MAX_RULE_SPAN):
+        if max_span <= 0:
+            raise ValueError("max_span must be positive")
+        self.max_span = max_span
+    
+    def extract(self, text: str, sentence_spans: Sequence[Tuple[int, int]]) -> List[Tuple[str, str, str]]:
+        """
+        Extract business rules from text
+        
+        Args:
+            text: Original requirement text
+            sentence_spans: (start, end) offsets of the sentences in text
+        
+        Returns:
+            (rule kind, condition, action) triples grouped by kind in
+            ``RULE_KINDS`` order; label-style rules ("condition:", "rule:")
+            have an empty action
+        """
+        if not sentence_spans:
+            return []
+        
+        keyword_matches: Dict[str, List[re.Match]] = {kind: [] for kind in RULE_KINDS}
+        for match in RULE_KEYWORD_PATTERN.finditer(text):
+            kind = (match.group('clause') or match.group('label')).lower()
+            keyword_matches[kind].append(match)
+        
+        sentence_starts = [start for start, _ in sentence_spans]
+        separators = {
+            kind: [match.span() for match in pattern.finditer(text)]
+            for kind, pattern in RULE_SEPARATOR_PATTERNS.items()
+            if keyword_matches[kind]
+        }
+        
+        rules = []
+        for kind in RULE_KINDS:
+            kind_separators = separators.get(kind)
+            cursor = 0
+            consumed = 0
+            
+            for match in keyword_matches[kind]:
+                start = match.start()
+                if start < consumed:
+                    continue
+                
+                sentence_index = bisect_right(sentence_starts, start) - 1
+                if sentence_index < 0 or start >= sentence_spans[sentence_index][1]:
+                    continue
+                limit = min(sentence_spans[sentence_index][1], start + self.max_span)
+                body_start = match.end()
+                
+                if kind_separators is None:
+                    condition, action = text[body_start:limit].strip(), ''
+                else:
+                    # Keywords only move forward, so the separator cursor does too
+                    while cursor < len(kind_separators) and kind_separators[cursor][0] <= body_start:
+                        cursor += 1
+                    if cursor == len(kind_separators) or kind_separators[cursor][1] >= limit:
+                        continue
+                    separator_start, separator_end = kind_separators[cursor]
+                    condition = text[body_start:separator_start].strip()
+                    action = text[separator_end:limit].strip()
+                    if not action:
+                        continue
+                
+                if not condition:
+                    continue
+                
+                rules.append((kind, condition, action))
+                consumed = limit
+        
+        return rules
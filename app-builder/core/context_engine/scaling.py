@@ -0,0 +1,148 @@
+"""
+Parser Scaling Check for ERPNext App Builder
+
+This module times RequirementParser on generated requirements from 1 KB
+to 5 MB, and its business rule extractor on adversarial text, and checks
+that the time per character does not grow with the input, so parsing
+stays linear in the length of the requirement.
+
+Run from the app-builder directory:
+
+    python -m core.context_engine.scaling --max-size 5000000
+"""
+
+import sys
+import json
+import time
+import argparse
+from functools import partial
+from typing import Callable, Dict, List, Any, Sequence, Tuple
+
+from .requirement_parser import RequirementParser
+from .sentence_segmenter import segment_sentences
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 5_000_000)
+
+# Largest allowed growth of the time per character over any smaller input
+DEFAULT_TOLERANCE = 2.0
+
+# Small inputs are timed repeatedly for at least this long, keeping the fastest run
+DEFAULT_MIN_TIME = 0.05
+
+ORDINARY_REQUIREMENT = (
+    "I need to create customer records and track every order. The manager must approve invoices above the limit. "
+    "Staff can view product reports and generate a dashboard. Sales should process payment data quickly. "
+)
+
+# Every word is an action verb, so every token starts an action-object lookup
+VERB_DENSE_REQUIREMENT = "create track manage approve process generate update delete view submit "
+
+# Rule keywords whose separator never comes, the worst case for a backtracking rule pattern
+IF_WITHOUT_THEN = "if the order is large "
+WHEN_WITHOUT_COMMA = "when stock runs low "
+
+
+def _repeat(unit: str, size: int) -> str:
+    """Repeat unit to exactly size characters"""
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def _unterminated_rule(size: int) -> str:
+    """One sentence of size characters opening a rule that is never completed"""
+    return "If " + _repeat("the approval is pending and ", size - 3)
+
+
+def _extract_rules(parser: RequirementParser, text: str) -> Callable[[], Any]:
+    """Rule extraction alone, on sentences segmented before timing"""
+    return partial(parser.rule_extractor.extract, text, segment_sentences(text))
+
+
+# Case name -> (text of a given size, callable timed on that text)
+CASES: Dict[str, Tuple[Callable[[int], str], Callable[[RequirementParser, str], Callable[[], Any]]]] = {
+    'parse': (partial(_repeat, ORDINARY_REQUIREMENT), lambda parser, text: partial(parser.parse, text)),
+    'verb-dense': (partial(_repeat, VERB_DENSE_REQUIREMENT), lambda parser, text: partial(parser.parse, text)),
+    'rules-if-without-then': (partial(_repeat, IF_WITHOUT_THEN), _extract_rules),
+    'rules-when-without-comma': (partial(_repeat, WHEN_WITHOUT_COMMA), _extract_rules),
+    'rules-unterminated-sentence': (_unterminated_rule, _extract_rules)
+}
+
+
+def _best_time(function: Callable[[], Any], min_time: float) -> float:
+    """Fastest of as many runs of function as fit in min_time, and at least one"""
+    best = None
+    spent = 0.0
+    while best is None or spent < min_time:
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        spent += elapsed
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_scaling(sizes: Sequence[int] = DEFAULT_SIZES, cases: Sequence[str] = tuple(CASES),
+                tolerance: float = DEFAULT_TOLERANCE, min_time: float = DEFAULT_MIN_TIME) -> Dict[str, Any]:
+    """
+    Time every case at every size and check that it scales linearly
+    
+    Args:
+        sizes: Input sizes in characters, ascending
+        cases: Names of the ``CASES`` to run
+        tolerance: Largest allowed ratio of a size's time per character to
+            the lowest time per character of any size up to it
+        min_time: Seconds each size is repeatedly timed for
+    
+    Returns:
+        Time per character and its growth for every case and size, and the
+        sizes where the growth exceeded tolerance
+    """
+    parser = RequirementParser()
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    failures: List[str] = []
+    
+    for name in cases:
+        make_text, measure = CASES[name]
+        # Warm up pattern caches and lazily built tables before timing
+        measure(parser, make_text(min(sizes)))()
+        
+        rows = []
+        lowest = None
+        for size in sizes:
+            seconds = _best_time(measure(parser, make_text(size)), min_time)
+            per_char = seconds / size
+            lowest = per_char if lowest is None else min(lowest, per_char)
+            growth = per_char / lowest
+            rows.append({
+                'size': size,
+                'seconds': round(seconds, 4),
+                'us_per_char': round(per_char * 1e6, 3),
+                'growth': round(growth, 2)
+            })
+            if growth > tolerance:
+                failures.append(f"{name} at {size} characters is {growth:.1f}x slower per character")
+        results[name] = rows
+    
+    return {
+        'tolerance': tolerance,
+        'cases': results,
+        'failures': failures
+    }
+
+
+def main(argv=None) -> int:
+    """Run the scaling check from the command line, failing when any case grew superlinearly"""
+    parser = argparse.ArgumentParser(description="Check that requirement parsing and rule extraction scale linearly")
+    parser.add_argument('--max-size', type=int, default=DEFAULT_SIZES[-1])
+    parser.add_argument('--case', action='append', choices=sorted(CASES), dest='cases')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME)
+    args = parser.parse_args(argv)
+    
+    sizes = [size for size in DEFAULT_SIZES if size <= args.max_size]
+    result = run_scaling(sizes, args.cases or tuple(CASES), args.tolerance, args.min_time)
+    print(json.dumps(result, indent=2))
+    return 1 if result['failures'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Sentence Cache for ERPNext App Builder
+
+This module caches per-sentence analysis results by content hash, so that
+re-submitting a slightly edited requirement only re-analyzes the sentences
+that actually changed.
+"""
+
+import hashlib
+import logging
+from typing import Any
+
+from .bounded_cache import BoundedCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SENTENCE_CACHE_SIZE = 4096
+
+
+class SentenceCache(BoundedCache):
+    """Bounded LRU cache of analysis results keyed by a digest of their text
+    
+    Safe to share between threads; cached results are never modified.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_SENTENCE_CACHE_SIZE):
+        super().__init__(max_entries)
+    
+    @staticmethod
+    def key(text: str, *qualifiers: Any) -> bytes:
+        """
+        Build a cache key from text and anything else the result depends on
+        
+        Args:
+            text: Text the cached result was computed from
+            qualifiers: Extra values (such as offsets) that change the result
+        
+        Returns:
+            128-bit content digest
+        """
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16)
+        for qualifier in qualifiers:
+            digest.update(f"\x00{qualifier}".encode('utf-8'))
+        return digest.digest()
@@ -0,0 +1,96 @@
+"""
+Sentence Segmenter for ERPNext App Builder
+
+This module splits requirement text into sentences as (start, end) offsets
+into the original text, so analyzers share one segmentation and only create
+sentence strings when their output needs them.
+"""
+
+import re
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_DELIMITER_PATTERN = re.compile(r'[.!?]+')
+
+# Word immediately before a full stop, including dotted forms such as "e.g"
+PRECEDING_WORD_PATTERN = re.compile(r'\b[A-Za-z]+(?:\.[A-Za-z]+)*$')
+NEXT_CHARACTER_PATTERN = re.compile(r'\s*(\S)')
+
+# Abbreviations that are never the last word of a sentence
+NON_TERMINAL_ABBREVIATIONS = frozenset({
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st',
+    'e.g', 'i.e', 'eg', 'ie', 'vs', 'cf', 'approx', 'incl', 'excl', 'esp', 'viz'
+})
+
+# Abbreviations that end a sentence only when a capitalized word follows
+ABBREVIATIONS = frozenset({
+    'etc', 'no', 'nos', 'fig', 'dept', 'est', 'inc', 'ltd', 'co', 'corp',
+    'qty', 'ref', 'avg', 'min', 'max', 'hr', 'hrs', 'mo', 'yr', 'yrs', 'pcs',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec'
+})
+
+
+def segment_sentences(text: str, start: int = 0) -> List[Tuple[int, int]]:
+    """
+    Find the sentences of text as (start, end) offsets, with surrounding whitespace excluded
+    
+    Runs of '.', '!' and '?' end a sentence, except for a single full stop that
+    is followed directly by a letter or digit (decimals such as "$1000.50",
+    versions, file names and addresses) or that ends an abbreviation.
+    
+    Args:
+        text: Text to segment
+        start: Offset to start segmenting from; must lie on a sentence boundary
+    
+    Returns:
+        Sentence spans in text order
+    """
+    spans = []
+    sentence_start = start
+    
+    for match in SENTENCE_DELIMITER_PATTERN.finditer(text, start):
+        delimiter_start, delimiter_end = match.span()
+        if delimiter_end - delimiter_start == 1 and text[delimiter_start] == '.':
+            if _continues_sentence(text, delimiter_start, delimiter_end):
+                continue
+        
+        _add_span(spans, text, sentence_start, delimiter_start)
+        sentence_start = delimiter_end
+    
+    _add_span(spans, text, sentence_start, len(text))
+    return spans
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into stripped sentence strings"""
+    return [text[start:end] for start, end in segment_sentences(text)]
+
+
+def _continues_sentence(text: str, stop: int, after: int) -> bool:
+    """Check whether the full stop at offset stop is part of the sentence"""
+    if after < len(text) and text[after].isalnum():
+        return True
+    
+    word = PRECEDING_WORD_PATTERN.search(text, max(0, stop - 16), stop)
+    if word is None:
+        return False
+    
+    abbreviation = word.group().lower()
+    if abbreviation in NON_TERMINAL_ABBREVIATIONS:
+        return True
+    if abbreviation in ABBREVIATIONS or '.' in abbreviation:
+        following = NEXT_CHARACTER_PATTERN.match(text, after)
+        return following is not None and not following.group(1).isupper()
+    return False
+
+
+def _add_span(spans: List[Tuple[int, int]], text: str, start: int, end: int):
+    """Append the whitespace-stripped span between start and end, if not empty"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append((start, end))
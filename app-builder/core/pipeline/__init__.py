@@ -0,0 +1,14 @@
+"""
+Pipeline - Runs requirements through every stage of app generation
+
+This module chains the Claude hooks, context engine and PRD processor
+and caches their combined results, or runs their independent stages
+concurrently.
+"""
+
+from .cache import PipelineCache, normalize_requirement, table_fingerprint
+from .pipeline import RequirementPipeline
+from .orchestrator import PipelineOrchestrator
+
+__all__ = ['PipelineCache', 'normalize_requirement', 'table_fingerprint', 'RequirementPipeline',
+           'PipelineOrchestrator']
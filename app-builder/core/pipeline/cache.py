@@ -0,0 +1,306 @@
+"""
+Pipeline Cache for ERPNext App Builder
+
+This module caches complete pipeline results by a digest of the normalized
+requirement text and a fingerprint of the pattern and knowledge tables the
+results were computed with, so an unchanged requirement is never analyzed
+twice and any change to the tables invalidates old results automatically.
+"""
+
+import re
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import ModuleType
+from typing import Dict, Any, Optional
+
+from ..prd_processor import LazyPRD
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+LINE_BREAK_PATTERN = re.compile(r'\r\n?')
+
+
+def normalize_requirement(text: str) -> str:
+    """
+    Normalize requirement text before it is hashed and analyzed
+    
+    Applies NFC normalization, converts line breaks to '\\n' and strips
+    surrounding whitespace. The pipeline analyzes the normalized text, so a
+    cached result is identical to the result of analyzing it again.
+    """
+    text = unicodedata.normalize('NFC', text)
+    return LINE_BREAK_PATTERN.sub('\n', text).strip()
+
+
+def table_fingerprint(*tables: Any) -> str:
+    """
+    Fingerprint pattern and knowledge tables
+    
+    Args:
+        tables: Modules (whose upper-case globals are the tables) or plain values
+    
+    Returns:
+        Hex digest that changes whenever any table changes
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for table in tables:
+        if isinstance(table, ModuleType):
+            table = {name: value for name, value in vars(table).items() if name.isupper()}
+        digest.update(json.dumps(table, sort_keys=True, default=_table_value).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def _table_value(value: Any) -> Any:
+    """Turn table values json cannot encode into stable, comparable ones"""
+    if isinstance(value, re.Pattern):
+        return [value.pattern, value.flags]
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, LazyPRD):
+        # Encoding must not build the remaining sections, which may fail
+        return value.built_sections()
+    if isinstance(value, Mapping):
+        return dict(value)
+    return repr(value)
+
+
+class PipelineCache:
+    """Two-tier cache of pipeline results
+    
+    Results live in an in-memory LRU tier and, when a database path is given,
+    in a SQLite tier that survives restarts. Disk entries expire after
+    ``ttl_seconds`` and the least recently used ones are evicted once the
+    tier grows past ``max_disk_bytes``. Entries written under a different
+    fingerprint are dropped when the database is opened.
+    
+    Values are stored as JSON, so every hit returns a fresh copy the caller
+    is free to modify.
+    """
+    
+    def __init__(self, fingerprint: str = '', db_path: Optional[str] = None,
+                 max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_disk_bytes: int = DEFAULT_DISK_BYTES,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS):
+        if max_memory_entries <= 0:
+            raise ValueError("max_memory_entries must be positive")
+        if max_disk_bytes <= 0:
+            raise ValueError("max_disk_bytes must be positive")
+        
+        self.fingerprint = fingerprint
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        
+        self._memory: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._connection = self._open_database(db_path) if db_path else None
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+    
+    def key(self, text: str, *qualifiers: Any) -> str:
+        """
+        Build a cache key for a normalized requirement
+        
+        Args:
+            text: Normalized requirement text
+            qualifiers: Anything else the result depends on (user context, options)
+        
+        Returns:
+            Hex digest covering the text, the qualifiers and the table fingerprint
+        """
+        digest = hashlib.blake2b(self.fingerprint.encode('utf-8'), digest_size=16)
+        digest.update(b'\x00')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        for qualifier in qualifiers:
+            digest.update(b'\x00')
+            digest.update(json.dumps(qualifier, sort_keys=True, default=repr).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached result from the memory tier, falling back to disk"""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(payload)
+            
+            payload = self._read_disk(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            
+            self._remember(key, payload)
+            self.disk_hits += 1
+            return json.loads(payload)
+    
+    def put(self, key: str, value: Any):
+        """Cache a JSON-serializable result (read-only views included) in every tier"""
+        payload = json.dumps(value, default=_table_value)
+        with self._lock:
+            self._remember(key, payload)
+            self._write_disk(key, payload)
+    
+    def invalidate(self, key: str):
+        """Drop a single cached result"""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("DELETE FROM pipeline_cache WHERE key = ?", (key,))
+    
+    def clear(self):
+        """Drop every cached result and reset the statistics"""
+        with self._lock:
+            self._memory.clear()
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("DELETE FROM pipeline_cache")
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+    
+    def close(self):
+        """Close the disk tier"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tier sizes and hit statistics"""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            disk_entries, disk_bytes = 0, 0
+            if self._connection is not None:
+                disk_entries, disk_bytes = self._connection.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pipeline_cache"
+                ).fetchone()
+            
+            return {
+                'fingerprint': self.fingerprint,
+                'memory_entries': len(self._memory),
+                'disk_entries': disk_entries,
+                'disk_bytes': disk_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0.0
+            }
+    
+    def _remember(self, key: str, payload: str):
+        """Add a payload to the memory tier, evicting the least recently used one"""
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _open_database(self, db_path: str) -> sqlite3.Connection:
+        """Open the disk tier and drop entries from other table versions"""
+        connection = sqlite3.connect(db_path, check_same_thread=False)
+        with connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS pipeline_cache (
+                    key TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS pipeline_cache_accessed ON pipeline_cache (accessed_at)"
+            )
+            stale = connection.execute(
+                "DELETE FROM pipeline_cache WHERE fingerprint != ?", (self.fingerprint,)
+            ).rowcount
+        
+        if stale:
+            logger.info(f"Dropped {stale} pipeline cache entries from other table versions")
+        return connection
+    
+    def _read_disk(self, key: str) -> Optional[str]:
+        """Read a payload from the disk tier, expiring it if it is too old"""
+        if self._connection is None:
+            return None
+        
+        row = self._connection.execute(
+            "SELECT value, created_at FROM pipeline_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        value, created_at = row
+        now = time.time()
+        with self._connection:
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._connection.execute("DELETE FROM pipeline_cache WHERE key = ?", (key,))
+                return None
+            self._connection.execute(
+                "UPDATE pipeline_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        
+        try:
+            return zlib.decompress(value).decode('utf-8')
+        except (zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Discarding unreadable pipeline cache entry: {str(e)}")
+            self.invalidate(key)
+            return None
+    
+    def _write_disk(self, key: str, payload: str):
+        """Write a payload to the disk tier and evict entries over the size budget"""
+        if self._connection is None:
+            return
+        
+        value = zlib.compress(payload.encode('utf-8'))
+        if len(value) > self.max_disk_bytes:
+            logger.debug(f"Pipeline result of {len(value)} bytes exceeds the disk budget")
+            return
+        
+        now = time.time()
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pipeline_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.fingerprint, value, len(value), now, now)
+            )
+            if self.ttl_seconds is not None:
+                self._connection.execute(
+                    "DELETE FROM pipeline_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+            self._evict(self._connection)
+    
+    def _evict(self, connection: sqlite3.Connection):
+        """Delete least recently used entries until the disk tier fits its budget"""
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM pipeline_cache").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        
+        evicted = []
+        for key, size in connection.execute(
+                "SELECT key, size FROM pipeline_cache ORDER BY accessed_at"):
+            if total <= self.max_disk_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM pipeline_cache WHERE key = ?", evicted)
+    
+    def __len__(self) -> int:
+        return len(self._memory)
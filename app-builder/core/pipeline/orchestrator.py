@@ -0,0 +1,181 @@
+"""
+Pipeline Orchestrator for ERPNext App Builder
+
+This module runs the analysis stages of a requirement as an asyncio task
+graph: the stages that only need the requirement text run concurrently,
+alongside the AI interface's network calls, and the stages that combine
+their results start as soon as their inputs are ready. Every stage runs in
+an executor so the event loop stays free, and is timed.
+"""
+
+import time
+import asyncio
+import logging
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional, Union
+
+from ..claude_hooks import ClaudeHooks, AIInterface, AsyncAIInterface
+from ..context_engine import ContextProcessor, RequirementParser, DomainKnowledge, RequirementDocument, thaw
+from ..prd_processor import PRDGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineOrchestrator:
+    """Concurrent end-to-end processing of business requirements
+    
+    Stage functions run on ``executor`` (by default the event loop's thread
+    pool) and share this orchestrator's components, so contexts and PRDs are
+    stored as they are by a serial run. Stages overlap wherever they wait on
+    the network or release the GIL; pure-Python stages interleave.
+    """
+    
+    def __init__(self, executor: Optional[Executor] = None, use_ai: bool = True,
+                 mcp_server_url: str = "http://localhost:3000",
+                 ai_interface: Optional[Union[AIInterface, AsyncAIInterface]] = None):
+        self.claude_hooks = ClaudeHooks()
+        self.requirement_parser = RequirementParser()
+        self.context_processor = ContextProcessor()
+        self.domain_knowledge = DomainKnowledge()
+        self.prd_generator = PRDGenerator()
+        self.ai_interface = ai_interface or AIInterface(mcp_server_url)
+        self.executor = executor
+        self.use_ai = use_ai
+    
+    async def run(self, requirement: Union[str, RequirementDocument],
+                  user_context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Process a requirement through every stage
+        
+        Args:
+            requirement: User's business requirement or annotated RequirementDocument
+            user_context: Additional user-provided context
+        
+        Returns:
+            Results of every stage and the wall time of each in 'timings'
+        """
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        ai_task = None
+        try:
+            document = RequirementDocument.coerce(requirement)
+            if self.use_ai:
+                ai_task = asyncio.ensure_future(self._run_ai_stage(timings, document.text, user_context))
+            
+            claude_result, parsed_requirement, context_result = await asyncio.gather(
+                self._run_stage('claude_analysis', timings,
+                                self.claude_hooks.process_user_requirement, document, user_context),
+                self._run_stage('parsing', timings, self.requirement_parser.parse, document),
+                self._run_stage('context', timings,
+                                self.context_processor.process_requirement, document, user_context)
+            )
+            
+            for stage, stage_result in (('claude_analysis', claude_result), ('parsing', parsed_requirement),
+                                        ('context', context_result)):
+                if not stage_result['success']:
+                    return self._stage_failure(stage, stage_result, timings, started, ai_task)
+            
+            domain_guidance = await self._run_stage(
+                'domain_guidance', timings, self.domain_knowledge.get_industry_guidance,
+                claude_result['industry_category'], document.text
+            )
+            # Plain data, so results serialize like the pipeline's cached ones
+            domain_guidance = thaw(domain_guidance)
+            
+            prd_result = await self._run_stage(
+                'prd_generation', timings, self.prd_generator.generate_prd,
+                context_result['context'], domain_guidance, parsed_requirement
+            )
+            if not prd_result['success']:
+                return self._stage_failure('prd_generation', prd_result, timings, started, ai_task)
+            
+            ai_result = await ai_task if ai_task is not None else None
+            timings['total'] = time.perf_counter() - started
+            
+            return {
+                'success': True,
+                'processed_at': datetime.now().isoformat(),
+                'requirement': document.text,
+                'claude_analysis': claude_result,
+                'parsed_requirement': parsed_requirement,
+                'context': context_result,
+                'domain_guidance': domain_guidance,
+                'prd': prd_result,
+                'ai_analysis': ai_result,
+                'timings': timings
+            }
+        
+        except Exception as e:
+            logger.error(f"Error orchestrating requirement pipeline: {str(e)}")
+            if ai_task is not None:
+                ai_task.cancel()
+            timings['total'] = time.perf_counter() - started
+            return {
+                'success': False,
+                'error': str(e),
+                'timings': timings
+            }
+    
+    def run_sync(self, requirement: Union[str, RequirementDocument],
+                 user_context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run ``run`` on a new event loop, for callers outside asyncio"""
+        return asyncio.run(self.run(requirement, user_context))
+    
+    async def _run_stage(self, stage: str, timings: Dict[str, float],
+                         function: Callable[..., Any], *args: Any) -> Any:
+        """Run a stage function on the executor, recording its wall time"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self.executor, function, *args)
+        finally:
+            timings[stage] = time.perf_counter() - started
+    
+    async def _run_ai_stage(self, timings: Dict[str, float], requirement: str,
+                            user_context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run the AI analysis, awaiting an AsyncAIInterface directly instead of using the executor"""
+        if not isinstance(self.ai_interface, AsyncAIInterface):
+            return await self._run_stage('ai_analysis', timings, self._analyze_with_ai, requirement, user_context)
+        
+        started = time.perf_counter()
+        try:
+            if not await self.ai_interface.health_check():
+                return {
+                    'server_available': False,
+                    'result': None
+                }
+            
+            return {
+                'server_available': True,
+                'result': await self.ai_interface.analyze_requirement(requirement, user_context)
+            }
+        finally:
+            timings['ai_analysis'] = time.perf_counter() - started
+    
+    def _analyze_with_ai(self, requirement: str, user_context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Ask the AI interface for its analysis when the MCP server is reachable"""
+        if not self.ai_interface.health_check():
+            return {
+                'server_available': False,
+                'result': None
+            }
+        
+        return {
+            'server_available': True,
+            'result': self.ai_interface.analyze_requirement(requirement, user_context)
+        }
+    
+    def _stage_failure(self, stage: str, stage_result: Dict[str, Any], timings: Dict[str, float],
+                       started: float, ai_task: Optional[asyncio.Future]) -> Dict[str, Any]:
+        """Build the result of a run that stopped at a failed stage"""
+        if ai_task is not None:
+            ai_task.cancel()
+        timings['total'] = time.perf_counter() - started
+        return {
+            'success': False,
+            'failed_stage': stage,
+            'error': stage_result.get('error'),
+            'stage_result': stage_result,
+            'timings': timings
+        }
@@ -0,0 +1,163 @@
+"""
+Requirement Pipeline for ERPNext App Builder
+
+This module runs a requirement through every analysis stage, from the
+Claude hooks to PRD generation, and caches the combined result so repeated
+submissions of the same requirement skip analysis entirely.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Union
+
+from ..claude_hooks import ClaudeHooks, hooks
+from ..context_engine import ContextProcessor, RequirementParser, DomainKnowledge, RequirementDocument, thaw
+from ..context_engine import (context_processor, requirement_parser, rule_extractor,
+                              sentence_segmenter, pattern_scanner)
+from ..context_engine.keyword_automaton import get_keyword_automaton
+from ..prd_processor import PRDGenerator
+from .cache import (PipelineCache, normalize_requirement, table_fingerprint,
+                    DEFAULT_MEMORY_ENTRIES, DEFAULT_DISK_BYTES, DEFAULT_TTL_SECONDS)
+
+logger = logging.getLogger(__name__)
+
+# Bump when stage logic changes in a way the table fingerprint cannot see
+PIPELINE_VERSION = 2
+
+
+class RequirementPipeline:
+    """Cached end-to-end processing of business requirements"""
+    
+    def __init__(self, db_path: Optional[str] = None,
+                 max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_disk_bytes: int = DEFAULT_DISK_BYTES,
+                 ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS):
+        self.claude_hooks = ClaudeHooks()
+        self.requirement_parser = RequirementParser()
+        self.context_processor = ContextProcessor()
+        self.domain_knowledge = DomainKnowledge()
+        self.prd_generator = PRDGenerator()
+        
+        self.cache = PipelineCache(
+            self.fingerprint(),
+            db_path=db_path,
+            max_memory_entries=max_memory_entries,
+            max_disk_bytes=max_disk_bytes,
+            ttl_seconds=ttl_seconds
+        )
+    
+    def fingerprint(self) -> str:
+        """Fingerprint every pattern and knowledge table the stages read"""
+        return table_fingerprint(
+            PIPELINE_VERSION,
+            hooks, requirement_parser, context_processor, rule_extractor,
+            sentence_segmenter, pattern_scanner,
+            frozenset(get_keyword_automaton().keywords),
+            self.requirement_parser.business_patterns,
+            self.requirement_parser.erpnext_mappings,
+            self.domain_knowledge.industry_patterns,
+            self.domain_knowledge.business_processes,
+            self.domain_knowledge.erpnext_best_practices,
+            self.domain_knowledge.doctype_templates,
+            self.prd_generator.template_sections
+        )
+    
+    def run(self, requirement: Union[str, RequirementDocument], user_context: Dict[str, Any] = None,
+            use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Process a requirement through every stage, or return the cached result
+        
+        Args:
+            requirement: User's business requirement or annotated RequirementDocument
+            user_context: Additional user-provided context
+            use_cache: Look the result up in the cache before analyzing
+        
+        Returns:
+            Results of every stage, with 'cached' telling whether analysis was skipped
+        """
+        try:
+            text = normalize_requirement(getattr(requirement, 'text', requirement))
+            key = self.cache.key(text, user_context or {})
+            
+            if use_cache:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self._register_results(cached, cached.pop('prd_dependencies'))
+                    cached['cached'] = True
+                    return cached
+            
+            result = self._run_stages(text, user_context)
+            # A PRD with failed sections is not cached, so the next run builds them again
+            if result['success'] and not result['prd'].get('failed_sections'):
+                # Section dependencies let a PRD restored from the cache be regenerated like a fresh one
+                dependencies = self.prd_generator.get_section_dependencies(result['prd']['prd_id'])
+                self.cache.put(key, {**result, 'prd_dependencies': dependencies})
+            
+            result['cached'] = False
+            return result
+        
+        except Exception as e:
+            logger.error(f"Error running requirement pipeline: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'cached': False
+            }
+    
+    def _run_stages(self, text: str, user_context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run every stage on a normalized requirement, stopping at the first failure"""
+        document = RequirementDocument(text)
+        
+        claude_result = self.claude_hooks.process_user_requirement(document, user_context)
+        if not claude_result['success']:
+            return self._stage_failure('claude_analysis', claude_result)
+        
+        parsed_requirement = self.requirement_parser.parse(document)
+        if not parsed_requirement['success']:
+            return self._stage_failure('parsing', parsed_requirement)
+        
+        context_result = self.context_processor.process_requirement(document, user_context)
+        if not context_result['success']:
+            return self._stage_failure('context', context_result)
+        
+        # Plain data, so fresh results serialize like cached ones
+        domain_guidance = thaw(self.domain_knowledge.get_industry_guidance(claude_result['industry_category'], text))
+        
+        prd_result = self.prd_generator.generate_prd(context_result['context'], domain_guidance, parsed_requirement)
+        if not prd_result['success']:
+            return self._stage_failure('prd_generation', prd_result)
+        
+        return {
+            'success': True,
+            'processed_at': datetime.now().isoformat(),
+            'requirement': text,
+            'claude_analysis': claude_result,
+            'parsed_requirement': parsed_requirement,
+            'context': context_result,
+            'domain_guidance': domain_guidance,
+            'prd': prd_result
+        }
+    
+    def _stage_failure(self, stage: str, stage_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the result of a run that stopped at a failed stage"""
+        return {
+            'success': False,
+            'failed_stage': stage,
+            'error': stage_result.get('error'),
+            'stage_result': stage_result
+        }
+    
+    def _register_results(self, result: Dict[str, Any], prd_dependencies: Dict[str, List[str]]):
+        """Make a cached run's context and PRD retrievable and regenerable by their IDs, as a fresh run would"""
+        context_result = result['context']
+        self.context_processor.context_store.setdefault(context_result['context_id'], context_result['context'])
+        
+        prd_result = result['prd']
+        if prd_result['prd_id'] not in self.prd_generator.generated_prds:
+            self.prd_generator.register_prd(prd_result['prd_id'], prd_result['prd'], context_result['context'],
+                                            result['domain_guidance'], result['parsed_requirement'],
+                                            prd_dependencies)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get pipeline cache statistics"""
+        return self.cache.get_stats()
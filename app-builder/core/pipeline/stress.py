@@ -0,0 +1,241 @@
+"""
+Thread Stress Check for ERPNext App Builder
+
+This module shares one ContextProcessor, RequirementParser and PRDGenerator
+between many threads, the way a threaded web server worker uses them, and
+checks every result against a single-threaded run. It also reads expired
+contexts of a SQLite context store from many threads and checks that they
+are deleted and the store's running totals stay exact.
+
+Run from the app-builder directory:
+
+    python -m core.pipeline.stress --threads 16 --iterations 50
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any
+
+from ..context_engine import ContextProcessor, RequirementParser, SQLiteContextStore
+from ..prd_processor import PRDGenerator
+
+REQUIREMENTS = (
+    "I need to manage customers and sales orders. Orders over $1000 need manager approval.",
+    "Track product inventory across warehouses. Stock levels must be updated when items ship. "
+    "Generate weekly inventory reports.",
+    "Our clinic schedules patient appointments and bills insurance companies. "
+    "Doctors approve treatment plans before invoices are created.",
+    "Employees submit expense claims with receipts. Claims above $500 require finance approval "
+    "and are paid through payroll.",
+    "Manufacturing work orders consume raw materials from the bill of materials. "
+    "Quality inspections are required before finished goods enter stock."
+)
+
+# Small caches, so threads also race on eviction
+STRESS_CACHE_SIZE = 8
+
+# Lifetime of contexts in the expiry check, short enough that they expire before being read
+EXPIRY_TTL_SECONDS = 0.01
+
+# Fields that differ between otherwise identical runs
+VOLATILE_KEYS = frozenset({'context_id', 'timestamp', 'parsed_at'})
+
+
+def _comparable(result: Any) -> str:
+    """Serialize a result without the fields that differ between identical runs"""
+    def strip(value):
+        if isinstance(value, dict):
+            return {key: strip(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+        if isinstance(value, list):
+            return [strip(item) for item in value]
+        return value
+    
+    return json.dumps(strip(json.loads(json.dumps(result, default=dict))), sort_keys=True)
+
+
+def check_context_expiry(threads: int = 16, contexts: int = 32) -> List[str]:
+    """
+    Read expired contexts of a SQLite context store from many threads, repeatedly
+    
+    Returns:
+        Errors found: expired rows left in the table, or running totals that
+        disagree with the table
+    """
+    store = SQLiteContextStore(':memory:', ttl_seconds=EXPIRY_TTL_SECONDS)
+    for index in range(contexts):
+        store[f"ctx_{index}"] = {'index': index}
+    time.sleep(EXPIRY_TTL_SECONDS * 2)
+    
+    def read_all(_):
+        for _ in range(3):
+            for index in range(contexts):
+                store.get(f"ctx_{index}")
+    
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(read_all, range(threads)))
+    
+    errors = []
+    rows, stored_bytes = store._connection.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM contexts"
+    ).fetchone()
+    stats = store.get_stats()
+    if rows:
+        errors.append(f"{rows} expired contexts left in the store")
+    if (stats['entries'], stats['bytes']) != (rows, stored_bytes):
+        errors.append(f"context store totals {stats['entries']} entries, {stats['bytes']} bytes "
+                      f"disagree with the table's {rows} entries, {stored_bytes} bytes")
+    if stats['expirations'] != contexts:
+        errors.append(f"{stats['expirations']} context expirations counted, expected {contexts}")
+    store.close()
+    return errors
+
+
+def run_stress(threads: int = 16, iterations: int = 50, switch_interval: float = 1e-5) -> Dict[str, Any]:
+    """
+    Run requirement processing, context updates and PRD generation on shared instances from many threads
+    
+    Args:
+        threads: Worker threads sharing the instances
+        iterations: Requirements each thread processes
+        switch_interval: Interpreter thread switch interval while running, small to force interleaving
+    
+    Returns:
+        Elapsed time, how often each error was found and the checks that were made
+    """
+    expected = {
+        text: (_comparable(ContextProcessor().process_requirement(text)),
+               _comparable(RequirementParser().parse(text)))
+        for text in REQUIREMENTS
+    }
+    
+    processor = ContextProcessor(sentence_cache_size=STRESS_CACHE_SIZE)
+    parser = RequirementParser(sentence_cache_size=STRESS_CACHE_SIZE)
+    generator = PRDGenerator()
+    section_pool = ThreadPoolExecutor(max_workers=4)
+    
+    # One lazy PRD that every thread reads and regenerates
+    shared = processor.process_requirement(REQUIREMENTS[0])
+    shared_prd_id = generator.generate_prd(shared['context'], None, parser.parse(REQUIREMENTS[0]),
+                                           lazy=True)['prd_id']
+    shared_prd = generator.generated_prds[shared_prd_id]
+    sections = list(shared_prd.pending_sections)
+    
+    errors: List[str] = []
+    section_ids: Dict[str, set] = {section: set() for section in sections}
+    regenerations = []
+    record_lock = threading.Lock()
+    
+    def worker(index: int):
+        for iteration in range(iterations):
+            text = REQUIREMENTS[(index + iteration) % len(REQUIREMENTS)]
+            # Incremental runs share the sentence caches
+            incremental = iteration % 2 == 0
+            context_result = processor.process_requirement(text, incremental=incremental)
+            parsed = parser.parse(text, incremental=incremental)
+            expected_context, expected_parse = expected[text]
+            if _comparable(context_result) != expected_context:
+                errors.append("context differs from a single-threaded run")
+            if _comparable(parsed) != expected_parse:
+                errors.append("parse differs from a single-threaded run")
+            
+            # Updates replace the stored context; the context handed out earlier must not change
+            context_id = context_result['context_id']
+            processor.update_context(context_id, {'stress_iteration': iteration})
+            updated = processor.get_context(context_id)
+            if updated is None or updated.get('stress_iteration') != iteration:
+                errors.append("context update lost")
+            if 'stress_iteration' in context_result['context']:
+                errors.append("context changed in place")
+            
+            # Lazy, section-parallel and serial generation in turn
+            prd_result = generator.generate_prd(context_result['context'], None, parsed, lazy=iteration % 3 == 1,
+                                                executor=section_pool if iteration % 3 == 2 else None)
+            if not prd_result['success'] or prd_result.get('failed_sections'):
+                errors.append(f"PRD generation failed: {prd_result.get('error') or prd_result['failed_sections']}")
+            
+            # Sections of the shared PRD are built once, whichever thread reads them first
+            offset = (index + iteration) % len(sections)
+            seen = [(section, id(shared_prd[section])) for section in sections[offset:] + sections[:offset]]
+            regenerated = generator.regenerate_prd(shared_prd_id, ['business_entities'])
+            if not regenerated['success']:
+                errors.append(f"regeneration failed: {regenerated.get('error')}")
+            
+            snapshot = generator.generated_prds[shared_prd_id]
+            json.dumps(snapshot, default=dict)
+            processor.get_requirement_history()
+            
+            with record_lock:
+                for section, section_id in seen:
+                    section_ids[section].add(section_id)
+                regenerations.append(regenerated.get('regenerated_sections'))
+    
+    def guarded(index: int):
+        try:
+            worker(index)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+    
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(switch_interval)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(guarded, range(threads)))
+    finally:
+        elapsed = time.perf_counter() - started
+        sys.setswitchinterval(previous_interval)
+        section_pool.shutdown()
+    
+    # Regenerated sections are replaced, so only sections no regeneration touches keep one object
+    regenerated_sections = {section for listed in regenerations if listed for section in listed}
+    rebuilt = [section for section, ids in section_ids.items()
+               if len(ids) > 1 and section not in regenerated_sections]
+    if rebuilt:
+        errors.append(f"shared PRD sections built more than once: {', '.join(rebuilt)}")
+    
+    history = generator.generated_prds[shared_prd_id]['metadata']['version_history']
+    if len(history) != 1 + threads * iterations:
+        errors.append(f"shared PRD has {len(history)} versions, expected {1 + threads * iterations}")
+    
+    errors.extend(check_context_expiry(threads))
+    
+    expected_history = min(1 + threads * iterations, processor.requirement_history.maxlen)
+    if len(processor.get_requirement_history()) != expected_history:
+        errors.append("requirement history length is wrong")
+    
+    return {
+        'threads': threads,
+        'iterations': iterations,
+        'elapsed_seconds': round(elapsed, 3),
+        'error_count': len(errors),
+        'errors': dict(Counter(errors).most_common(20)),
+        'checks': {
+            'requirements_processed': threads * iterations,
+            'shared_prd_versions': len(history),
+            'context_store': processor.get_store_stats(),
+            'parser_sentence_cache': parser.sentence_cache.get_stats(),
+            'context_sentence_cache': processor.sentence_cache.get_stats()
+        }
+    }
+
+
+def main(argv=None) -> int:
+    """Run the stress check from the command line, failing when any check failed"""
+    parser = argparse.ArgumentParser(description="Stress shared analyzers from many threads")
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--switch-interval', type=float, default=1e-5)
+    args = parser.parse_args(argv)
+    
+    result = run_stress(args.threads, args.iterations, args.switch_interval)
+    print(json.dumps(result, indent=2, default=str))
+    return 1 if result['error_count'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
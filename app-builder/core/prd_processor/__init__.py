@@ -6,5 +6,9 @@ Product Requirements Documents for ERPNext application development.
 """
 
 from .prd_generator import PRDGenerator
+from .lazy_prd import LazyPRD
+from .prd_store import PRDStore, MemoryPRDStore, SQLitePRDStore
+from .prd_stream import iter_prd_json, iter_prd_markdown, write_prd_json, write_prd_markdown
 
-__all__ = ['PRDGenerator']
\ No newline at end of file
+__all__ = ['PRDGenerator', 'LazyPRD', 'iter_prd_json', 'iter_prd_markdown', 'write_prd_json',
+           'write_prd_markdown', 'PRDStore', 'MemoryPRDStore', 'SQLitePRDStore']
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Lazy PRD for ERPNext App Builder
+
+This module provides a PRD mapping whose sections are generated
+the first time they are read, so callers that only need a summary or a few
+sections do not pay for building the whole document.
+"""
+
+import logging
+import threading
+from collections.abc import MutableMapping
+from typing import Dict, List, Any, Callable, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class LazyPRD(MutableMapping):
+    """PRD whose sections are built on first access and then cached
+    
+    Keys keep the order of a fully built PRD. Errors raised while building a
+    section surface when that section is read; the section can be read again
+    to retry. Assigning a section stores it as built. ``to_dict`` builds every
+    remaining section and returns a plain dict for serialization.
+    
+    Threads reading the same PRD build each section once: building and
+    changing sections happen under the PRD's lock.
+    """
+    
+    def __init__(self, header: Dict[str, Any], sections: Iterable[str],
+                 build_section: Callable[[str], Any]):
+        self._sections: Dict[str, Any] = dict(header)
+        self._pending = {key for key in sections if key not in header}
+        self._keys = list(header) + [key for key in sections if key in self._pending]
+        self._build_section = build_section
+        # Reentrant: building a section may read sections of the same PRD
+        self._lock = threading.RLock()
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._sections[key]
+        except KeyError:
+            pass
+        
+        with self._lock:
+            if key in self._sections:
+                return self._sections[key]
+            if key not in self._pending:
+                raise KeyError(key)
+        
+            try:
+                value = self._build_section(key)
+            except KeyError as e:
+                # A KeyError escaping here would read as a missing section to Mapping.get
+                raise RuntimeError(f"Failed to build PRD section '{key}': missing {e}") from e
+            
+            self._sections[key] = value
+            self._pending.discard(key)
+            return value
+    
+    def __setitem__(self, key: str, value: Any):
+        with self._lock:
+            if key not in self._sections and key not in self._pending:
+                self._keys.append(key)
+            self._sections[key] = value
+            self._pending.discard(key)
+    
+    def __delitem__(self, key: str):
+        with self._lock:
+            if key not in self._sections and key not in self._pending:
+                raise KeyError(key)
+            self._sections.pop(key, None)
+            self._pending.discard(key)
+            self._keys.remove(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(tuple(self._keys))
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._sections or key in self._pending
+    
+    def is_built(self, key: str) -> bool:
+        """Check whether a section has been generated"""
+        return key in self._sections
+    
+    @property
+    def pending_sections(self) -> List[str]:
+        """Sections that have not been generated yet, in document order"""
+        with self._lock:
+            return [key for key in self._keys if key in self._pending]
+    
+    def copy(self, build_section: Callable[[str], Any]) -> 'LazyPRD':
+        """Copy the PRD, sharing its built sections and building the pending ones with build_section"""
+        with self._lock:
+            prd = LazyPRD({}, (), build_section)
+            prd._sections = dict(self._sections)
+            prd._pending = set(self._pending)
+            prd._keys = list(self._keys)
+        return prd
+    
+    def built_sections(self) -> Dict[str, Any]:
+        """The keys built so far and their values, in document order, without building the others"""
+        with self._lock:
+            return {key: self._sections[key] for key in self._keys if key in self._sections}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Build every remaining section and return the PRD as a plain dict"""
+        with self._lock:
+            return {key: self[key] for key in self._keys}
+    
+    def __repr__(self) -> str:
+        built = len(self._keys) - len(self._pending)
+        return f"LazyPRD({self._sections.get('prd_id')}, {built}/{len(self._keys)} sections built)"
@@ -7,82 +7,463 @@ based on processed user requirements and context analysis.
 
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
 from datetime import datetime, timedelta
 
+from .lazy_prd import LazyPRD
+from .prd_store import PRDStore, MemoryPRDStore
+
 logger = logging.getLogger(__name__)
 
+# PRD sections in document order, with their generator and the inputs it reads
+PRD_SECTIONS = {
+    'metadata': ('_generate_metadata', ('context',)),
+    'executive_summary': ('_generate_executive_summary', ('context',)),
+    'project_overview': ('_generate_project_overview', ('context', 'domain_guidance')),
+    'functional_requirements': ('_generate_functional_requirements', ('context', 'parsed_requirement')),
+    'technical_requirements': ('_generate_technical_requirements', ('context',)),
+    'data_model': ('_generate_data_model', ('context',)),
+    'user_stories': ('_generate_user_stories', ('context', 'parsed_requirement')),
+    'system_architecture': ('_generate_system_architecture', ('context',)),
+    'integration_requirements': ('_generate_integration_requirements', ('context',)),
+    'security_requirements': ('_generate_security_requirements', ('context',)),
+    'performance_requirements': ('_generate_performance_requirements', ('context',)),
+    'ui_ux_requirements': ('_generate_ui_ux_requirements', ('context',)),
+    'workflow_specifications': ('_generate_workflow_specifications', ('context',)),
+    'reporting_requirements': ('_generate_reporting_requirements', ('context',)),
+    'deployment_plan': ('_generate_deployment_plan', ('context',)),
+    'testing_strategy': ('_generate_testing_strategy', ('context',)),
+    'maintenance_plan': ('_generate_maintenance_plan', ('context',)),
+    'risk_assessment': ('_generate_risk_assessment', ('context',)),
+    'timeline_estimate': ('_generate_timeline_estimate', ('context',)),
+    'resource_requirements': ('_generate_resource_requirements', ('context',)),
+    'success_criteria': ('_generate_success_criteria', ('context',)),
+    'appendices': ('_generate_appendices', ('context', 'domain_guidance'))
+}
+
+# Sections streamed ahead of the rest, which follow in document order
+DEFAULT_SECTION_PRIORITY = ('executive_summary', 'project_overview', 'functional_requirements',
+                            'user_stories', 'timeline_estimate')
+
+# Recorded when a section reads the whole context rather than individual keys
+ALL_CONTEXT_KEYS = '*'
+
+# Locks that regenerations of different PRDs are spread over
+PRD_LOCK_STRIPES = 64
+
+# Sections the PRD summary is built from
+SUMMARY_SECTIONS = frozenset({'metadata', 'executive_summary', 'timeline_estimate', 'success_criteria'})
+
+# Key of the placeholder a section that failed to build holds, mapping to the error
+FAILED_SECTION_KEY = 'generation_error'
+
+
+class ContextReads(Mapping):
+    """Read-only view of a context that records which top-level keys are read"""
+    
+    def __init__(self, context: Dict[str, Any], reads: Set[str]):
+        self._context = context
+        self._reads = reads
+    
+    def __getitem__(self, key: str) -> Any:
+        self._reads.add(key)
+        return self._context[key]
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        self._reads.add(key)
+        return self._context.get(key, default)
+    
+    def __contains__(self, key: object) -> bool:
+        self._reads.add(key)
+        return key in self._context
+    
+    def __iter__(self) -> Iterator[str]:
+        self._reads.add(ALL_CONTEXT_KEYS)
+        return iter(self._context)
+    
+    def __len__(self) -> int:
+        self._reads.add(ALL_CONTEXT_KEYS)
+        return len(self._context)
+
 
 class PRDGenerator:
-    """Generates Product Requirements Documents for ERPNext applications"""
+    """Generates Product Requirements Documents for ERPNext applications
     
-    def __init__(self):
+    One instance can serve many threads. Regenerations of the same PRD are
+    serialized by a striped lock, and a generated PRD is replaced by an
+    updated copy rather than changed in place, so readers keep a consistent
+    snapshot.
+    """
+    
+    def __init__(self, prd_store: Optional[PRDStore] = None, section_executor: Optional[Executor] = None):
         self.template_sections = self._load_prd_template_sections()
-        self.generated_prds = {}
+        self.generated_prds = prd_store if prd_store is not None else MemoryPRDStore()
+        # Builds the sections of a complete PRD concurrently; None builds them in turn
+        self.section_executor = section_executor
+        self._prd_locks = tuple(threading.RLock() for _ in range(PRD_LOCK_STRIPES))
         
     def generate_prd(self, context: Dict[str, Any], domain_guidance: Dict[str, Any] = None,
-                    parsed_requirement: Dict[str, Any] = None) -> Dict[str, Any]:
+                    parsed_requirement: Dict[str, Any] = None, lazy: bool = False,
+                    executor: Optional[Executor] = None) -> Dict[str, Any]:
         """
         Generate comprehensive PRD from processed context
         
+        A section that fails to build does not fail the PRD: it holds a
+        placeholder mapping FAILED_SECTION_KEY to the error, is listed in
+        'failed_sections', and is built again by the next regeneration
+        whatever changed. The summary is None when a section it is built
+        from failed. Unless lazy, the PRD is a plain dict.
+        
         Args:
             context: Processed context from ContextProcessor
             domain_guidance: Industry-specific guidance
             parsed_requirement: Parsed requirement details
+            lazy: Return a LazyPRD that only builds the sections the summary needs,
+                  generating the others when they are first read
+            executor: Build the sections concurrently on this executor instead of
+                      ``section_executor``; a ProcessPoolExecutor gets copies of
+                      the inputs, which pays off when it serves many PRDs
             
         Returns:
             Complete PRD document structure
         """
+        prd_id = None
         try:
-            prd_id = self._generate_prd_id()
+            prd, sources = self._start_prd(context, domain_guidance, parsed_requirement)
+            prd_id = prd['prd_id']
             
-            prd = {
-                'prd_id': prd_id,
-                'generated_at': datetime.now().isoformat(),
-                'version': '1.0',
-                'status': 'draft',
-                'metadata': self._generate_metadata(context),
-                'executive_summary': self._generate_executive_summary(context),
-                'project_overview': self._generate_project_overview(context, domain_guidance),
-                'functional_requirements': self._generate_functional_requirements(context, parsed_requirement),
-                'technical_requirements': self._generate_technical_requirements(context),
-                'data_model': self._generate_data_model(context),
-                'user_stories': self._generate_user_stories(context, parsed_requirement),
-                'system_architecture': self._generate_system_architecture(context),
-                'integration_requirements': self._generate_integration_requirements(context),
-                'security_requirements': self._generate_security_requirements(context),
-                'performance_requirements': self._generate_performance_requirements(context),
-                'ui_ux_requirements': self._generate_ui_ux_requirements(context),
-                'workflow_specifications': self._generate_workflow_specifications(context),
-                'reporting_requirements': self._generate_reporting_requirements(context),
-                'deployment_plan': self._generate_deployment_plan(context),
-                'testing_strategy': self._generate_testing_strategy(context),
-                'maintenance_plan': self._generate_maintenance_plan(context),
-                'risk_assessment': self._generate_risk_assessment(context),
-                'timeline_estimate': self._generate_timeline_estimate(context),
-                'resource_requirements': self._generate_resource_requirements(context),
-                'success_criteria': self._generate_success_criteria(context),
-                'appendices': self._generate_appendices(context, domain_guidance)
-            }
+            if not lazy:
+                executor = executor or self.section_executor
+                if executor is None:
+                    self._build_sections(prd)
+                else:
+                    self._build_sections_concurrently(prd, sources, executor)
+                
+                prd = prd.to_dict()
+                self.generated_prds[prd_id] = prd
             
-            # Store generated PRD
-            self.generated_prds[prd_id] = prd
-            
-            return {
+            result = {
                 'success': True,
                 'prd_id': prd_id,
                 'prd': prd,
                 'summary': self._generate_prd_summary(prd)
             }
+            # Lazy PRDs only report the sections built so far
+            failed_sections = self._failed_sections(prd)
+            if failed_sections:
+                result['failed_sections'] = failed_sections
+            return result
             
         except Exception as e:
             logger.error(f"Error generating PRD: {str(e)}")
+            if prd_id is not None:
+                self.generated_prds.pop(prd_id, None)
             return {
                 'success': False,
                 'error': str(e),
                 'partial_prd': self._generate_minimal_prd(context)
             }
     
+    def iter_prd_sections(self, context: Dict[str, Any], domain_guidance: Dict[str, Any] = None,
+                          parsed_requirement: Dict[str, Any] = None,
+                          priority: Iterable[str] = DEFAULT_SECTION_PRIORITY) -> Iterator[Tuple[str, Any]]:
+        """
+        Generate a PRD section by section, handing out each one as soon as it is built
+        
+        The PRD is stored like one from ``generate_prd(lazy=True)``, so it can be
+        retrieved or regenerated by ID once the stream has started.
+        
+        Args:
+            context: Processed context from ContextProcessor
+            domain_guidance: Industry-specific guidance
+            parsed_requirement: Parsed requirement details
+            priority: Sections to build first; the others follow in document order
+            
+        Yields:
+            (key, value) for the header fields, then for every section
+        """
+        priority = list(priority)
+        unknown = [section for section in priority if section not in PRD_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown PRD sections: {', '.join(unknown)}")
+        
+        prd, _ = self._start_prd(context, domain_guidance, parsed_requirement)
+        
+        order = [key for key in prd if key not in PRD_SECTIONS]
+        order += dict.fromkeys(priority)
+        order += [section for section in PRD_SECTIONS if section not in priority]
+        
+        for key in order:
+            yield key, prd[key]
+        
+        # Store the complete PRD again so stores that persist PRDs write it out
+        self.generated_prds[prd['prd_id']] = prd
+    
+    def regenerate_prd(self, prd_id: str, changed_keys: Iterable[str], context: Dict[str, Any] = None,
+                       domain_guidance: Dict[str, Any] = None,
+                       parsed_requirement: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Regenerate only the PRD sections affected by a context update
+        
+        Args:
+            prd_id: ID of a PRD generated by this generator
+            changed_keys: Top-level context keys that changed, e.g. the keys
+                          passed to ContextProcessor.update_context
+            context: Replacement context, such as ContextProcessor.get_context
+                     after update_context; by default the context the PRD was
+                     generated from
+            domain_guidance: New industry guidance, regenerating the sections that use it
+            parsed_requirement: New parsed requirement, regenerating the sections that use it
+            
+        Returns:
+            Updated PRD with the regenerated sections listed
+        """
+        try:
+            with self._prd_lock(prd_id):
+                return self._regenerate_locked(prd_id, changed_keys, context, domain_guidance,
+                                               parsed_requirement)
+            
+        except Exception as e:
+            logger.error(f"Error regenerating PRD: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'prd_id': prd_id
+            }
+    
+    def _regenerate_locked(self, prd_id: str, changed_keys: Iterable[str], context: Dict[str, Any] = None,
+                           domain_guidance: Dict[str, Any] = None,
+                           parsed_requirement: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Regenerate the sections of a PRD affected by a change, holding the PRD's lock
+        
+        Sections are rebuilt into copies of the PRD and its sources, which
+        replace the stored ones only once every affected section was built.
+        Sections that had failed before may fail again and keep a placeholder.
+        """
+        prd = self.generated_prds.get(prd_id)
+        sources = self.generated_prds.get_sources(prd_id)
+        if prd is None or sources is None:
+            raise ValueError(f"No generation inputs recorded for PRD {prd_id}")
+        
+        inputs = dict(sources['inputs'])
+        changed = set(changed_keys)
+        replaced = False
+        for name, value in (('context', context), ('domain_guidance', domain_guidance),
+                            ('parsed_requirement', parsed_requirement)):
+            if value is not None:
+                inputs[name] = value
+                replaced = True
+                if name != 'context':
+                    changed.add(name)
+        
+        affected = self._affected_sections(sources['dependencies'], changed)
+        rebuilt = [
+            (section, (self._try_generate_section if _is_failed_section(prd[section])
+                       else self._generate_section)(section, inputs))
+            for section in affected
+        ]
+        
+        if affected or replaced:
+            dependencies = dict(sources['dependencies'])
+            # Unbuilt sections of a lazy copy read the new inputs
+            if isinstance(prd, LazyPRD):
+                prd = prd.copy(lambda section: self._build_section(section, inputs, dependencies))
+            else:
+                prd = dict(prd)
+        
+            if affected:
+                previous_metadata = prd['metadata']
+                for section, (value, reads) in rebuilt:
+                    prd[section] = value
+                    dependencies[section] = reads
+                if prd['metadata'] is previous_metadata:
+                    prd['metadata'] = dict(previous_metadata)
+        
+                version = self._next_version(prd['version'])
+                prd['version'] = version
+                self._record_revision(prd['metadata'], previous_metadata, version, affected, changed)
+            
+            self.generated_prds.put(prd_id, prd, {'inputs': inputs, 'dependencies': dependencies})
+        
+        result = {
+            'success': True,
+            'prd_id': prd_id,
+            'prd': prd,
+            'regenerated_sections': affected,
+            'summary': self._generate_prd_summary(prd)
+        }
+        failed_sections = self._failed_sections(prd)
+        if failed_sections:
+            result['failed_sections'] = failed_sections
+        return result
+    
+    def register_prd(self, prd_id: str, prd: Dict[str, Any], context: Dict[str, Any],
+                     domain_guidance: Dict[str, Any] = None, parsed_requirement: Dict[str, Any] = None,
+                     dependencies: Dict[str, Iterable[str]] = None):
+        """
+        Store a PRD generated earlier, such as a cached one, so it can be retrieved and regenerated by ID
+        
+        Args:
+            prd_id: ID of the PRD
+            prd: The generated PRD
+            context: Context the PRD was generated from
+            domain_guidance: Industry guidance the PRD was generated with
+            parsed_requirement: Parsed requirement the PRD was generated with
+            dependencies: Context keys each section read, as returned by
+                          get_section_dependencies; sections left out are
+                          regenerated after any change
+        """
+        reads = {section: set(keys) for section, keys in (dependencies or {}).items()}
+        for section in PRD_SECTIONS:
+            if section in prd and section not in reads:
+                reads[section] = {ALL_CONTEXT_KEYS}
+        
+        inputs = {
+            'context': context,
+            'domain_guidance': domain_guidance,
+            'parsed_requirement': parsed_requirement
+        }
+        self.generated_prds.put(prd_id, prd, {'inputs': inputs, 'dependencies': reads})
+    
+    def get_section_dependencies(self, prd_id: str) -> Dict[str, List[str]]:
+        """Get the context keys each built section of a PRD read"""
+        sources = self.generated_prds.get_sources(prd_id)
+        if sources is None:
+            return {}
+        return {section: sorted(keys) for section, keys in dict(sources['dependencies']).items()}
+    
+    def _prd_lock(self, prd_id: str) -> threading.RLock:
+        """Lock guarding regeneration of one PRD"""
+        return self._prd_locks[hash(prd_id) % PRD_LOCK_STRIPES]
+    
+    def _start_prd(self, context: Dict[str, Any], domain_guidance: Dict[str, Any] = None,
+                   parsed_requirement: Dict[str, Any] = None) -> Tuple[LazyPRD, Dict[str, Any]]:
+        """Create and store a PRD whose sections are built when first read, returning it and its sources"""
+        prd_id = self._generate_prd_id()
+        header = {
+            'prd_id': prd_id,
+            'generated_at': datetime.now().isoformat(),
+            'version': '1.0',
+            'status': 'draft'
+        }
+        inputs = {
+            'context': context,
+            'domain_guidance': domain_guidance,
+            'parsed_requirement': parsed_requirement
+        }
+        dependencies = {}
+        
+        prd = LazyPRD(header, PRD_SECTIONS, lambda section: self._build_section(section, inputs, dependencies))
+        
+        # Store generated PRD
+        sources = {'inputs': inputs, 'dependencies': dependencies}
+        self.generated_prds.put(prd_id, prd, sources)
+        return prd, sources
+    
+    def _build_section(self, section: str, inputs: Dict[str, Any], dependencies: Dict[str, Set[str]]) -> Any:
+        """Generate one PRD section, or its failure placeholder, recording the context keys and inputs it reads"""
+        value, reads = self._try_generate_section(section, inputs)
+        dependencies[section] = reads
+        return value
+    
+    def _generate_section(self, section: str, inputs: Dict[str, Any]) -> Tuple[Any, Set[str]]:
+        """Generate one PRD section, returning it with the context keys and inputs it read"""
+        method, input_names = PRD_SECTIONS[section]
+        reads = set()
+        
+        args = []
+        for name in input_names:
+            if name == 'context':
+                args.append(ContextReads(inputs['context'], reads))
+            else:
+                reads.add(name)
+                args.append(inputs[name])
+        
+        return getattr(self, method)(*args), reads
+    
+    def _try_generate_section(self, section: str, inputs: Dict[str, Any]) -> Tuple[Any, Set[str]]:
+        """Generate one PRD section, or the placeholder of its failure"""
+        try:
+            return self._generate_section(section, inputs)
+        except Exception as e:
+            return self._failed_section(section, e)
+    
+    def _failed_section(self, section: str, error: Exception) -> Tuple[Dict[str, str], Set[str]]:
+        """Placeholder for a section that failed to build, read as depending on every context key"""
+        message = str(error) or type(error).__name__
+        logger.error(f"Error generating PRD section '{section}': {message}")
+        # Depending on everything, the section is retried by any regeneration
+        return {FAILED_SECTION_KEY: message}, {ALL_CONTEXT_KEYS}
+    
+    def _failed_sections(self, prd: Dict[str, Any]) -> Dict[str, str]:
+        """Errors of the built sections of a PRD that failed, without building the others"""
+        built = prd.built_sections() if isinstance(prd, LazyPRD) else prd
+        return {
+            section: value[FAILED_SECTION_KEY] for section, value in built.items()
+            if section in PRD_SECTIONS and _is_failed_section(value)
+        }
+    
+    def _build_sections(self, prd: LazyPRD):
+        """Build every pending section in document order"""
+        for section in prd.pending_sections:
+            prd[section]
+    
+    def _build_sections_concurrently(self, prd: LazyPRD, sources: Dict[str, Any], executor: Executor):
+        """Build every pending section on an executor"""
+        inputs, dependencies = sources['inputs'], sources['dependencies']
+        
+        if isinstance(executor, ProcessPoolExecutor):
+            futures = [(section, executor.submit(_generate_section_in_worker, section, _plain(inputs)))
+                       for section in prd.pending_sections]
+        else:
+            futures = [(section, executor.submit(self._generate_section, section, inputs))
+                       for section in prd.pending_sections]
+        
+        # Sections are assembled in document order whatever order they finish in
+        for section, future in futures:
+            try:
+                value, reads = future.result()
+            except Exception as e:
+                value, reads = self._failed_section(section, e)
+            dependencies[section] = reads
+            prd[section] = value
+    
+    def _affected_sections(self, dependencies: Dict[str, Set[str]], changed: Set[str]) -> List[str]:
+        """Built sections that read any changed key, in document order"""
+        return [
+            section for section in PRD_SECTIONS
+            if section in dependencies and (ALL_CONTEXT_KEYS in dependencies[section]
+                                            or not dependencies[section].isdisjoint(changed))
+        ]
+    
+    def _next_version(self, version: str) -> str:
+        """Bump the minor part of a 'major.minor' version"""
+        major, _, minor = str(version).partition('.')
+        try:
+            return f"{major}.{int(minor or 0) + 1}"
+        except ValueError:
+            return f"{version}.1"
+    
+    def _record_revision(self, metadata: Dict[str, Any], previous_metadata: Dict[str, Any],
+                         version: str, sections: List[str], changed: Set[str]):
+        """Record a new version on updated metadata, carrying over the previous history"""
+        metadata['creation_date'] = previous_metadata['creation_date']
+        
+        now = datetime.now().isoformat()
+        metadata['last_modified'] = now
+        # A new list, so the previous metadata keeps its own history
+        metadata['version_history'] = previous_metadata['version_history'] + [{
+            'version': version,
+            'date': now,
+            'changes': f"Regenerated {', '.join(sections)} after changes to {', '.join(sorted(changed))}",
+            'changed_keys': sorted(changed),
+            'regenerated_sections': sections,
+            'author': 'App Builder System'
+        }]
+    
     def _generate_metadata(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Generate PRD metadata"""
         return {
@@ -1000,8 +1381,10 @@ class PRDGenerator:
             }
         }
     
-    def _generate_prd_summary(self, prd: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate PRD summary"""
+    def _generate_prd_summary(self, prd: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Generate PRD summary, or None when a section it is built from failed"""
+        if any(_is_failed_section(prd[section]) for section in SUMMARY_SECTIONS):
+            return None
         return {
             'project_name': prd['metadata']['project_name'],
             'complexity': prd['timeline_estimate']['total_duration'],
@@ -1014,14 +1397,51 @@ class PRDGenerator:
         """Retrieve generated PRD by ID"""
         return self.generated_prds.get(prd_id)
     
-    def list_prds(self) -> List[Dict[str, Any]]:
-        """List all generated PRDs"""
-        return [
-            {
-                'prd_id': prd_id,
-                'project_name': prd['metadata']['project_name'],
-                'created_at': prd['generated_at'],
-                'status': prd['status']
-            }
-            for prd_id, prd in self.generated_prds.items()
-        ]
\ No newline at end of file
+    def list_prds(self, project_name: Optional[str] = None, status: Optional[str] = None,
+                  since: Optional[str] = None, until: Optional[str] = None,
+                  offset: int = 0, limit: Optional[int] = None,
+                  after: Optional[Mapping] = None) -> List[Dict[str, Any]]:
+        """
+        List generated PRDs in generation order
+        
+        Args:
+            project_name: Only PRDs for this project
+            status: Only PRDs with this status
+            since: Only PRDs generated at or after this ISO timestamp
+            until: Only PRDs generated before this ISO timestamp
+            offset: Number of matching PRDs to skip
+            limit: Maximum number of PRDs to list, or None for all
+            after: Last entry of the previous page, to page through PRDs in
+                   time independent of how many were listed before
+            
+        Returns:
+            PRD IDs with project name, creation time and status
+        """
+        return self.generated_prds.query(project_name, status, since, until, offset, limit, after)
+
+
+_worker_generator: Optional[PRDGenerator] = None
+
+
+def _generate_section_in_worker(section: str, inputs: Dict[str, Any]) -> Tuple[Any, Set[str]]:
+    """Generate one PRD section in a worker process, building the generator once per process"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = PRDGenerator()
+    return _worker_generator._generate_section(section, inputs)
+
+
+def _is_failed_section(value: Any) -> bool:
+    """Check whether a section value is the placeholder of a failed build"""
+    return isinstance(value, dict) and FAILED_SECTION_KEY in value
+
+
+def _plain(value: Any) -> Any:
+    """Copy read-only mappings in generation inputs into dicts that can be sent to another process"""
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_plain(item) for item in value)
+    return value
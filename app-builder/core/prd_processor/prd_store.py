@@ -0,0 +1,472 @@
+"""
+PRD Store for ERPNext App Builder
+
+This module keeps generated PRDs indexed by project name, status and
+generation time, so listing a page of PRDs costs time proportional to the
+page rather than to every PRD generated. The SQLite store writes PRDs
+compressed to disk so they survive restarts and do not stay in memory.
+
+Alongside each PRD a store keeps its generation sources: the inputs it was
+generated from and the context keys each section read, which regeneration
+needs. They are stored and dropped together with the PRD.
+"""
+
+import json
+import zlib
+import sqlite3
+import logging
+import threading
+from abc import abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from itertools import islice
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from .lazy_prd import LazyPRD
+
+logger = logging.getLogger(__name__)
+
+# Lazily built PRDs the SQLite store keeps in memory until every section is built
+DEFAULT_OPEN_PRDS = 64
+
+# (generated_at, prd_id), ordered by generation time
+TimeKey = Tuple[str, str]
+
+
+def prd_index_entry(prd_id: str, prd: Mapping) -> Dict[str, Any]:
+    """Build the listing entry of a PRD"""
+    return {
+        'prd_id': prd_id,
+        'project_name': prd['metadata']['project_name'],
+        'created_at': prd['generated_at'],
+        'status': prd['status']
+    }
+
+
+def _prd_value(value: Any) -> Any:
+    """Turn PRD values json cannot encode into plain ones"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def _encode_sources(sources: Dict[str, Any]) -> bytes:
+    """Compress generation sources, with the dependency sets as sorted lists"""
+    return zlib.compress(json.dumps(sources, default=_prd_value).encode('utf-8'))
+
+
+def _decode_sources(value: bytes) -> Dict[str, Any]:
+    """Restore generation sources written by _encode_sources"""
+    sources = json.loads(zlib.decompress(value).decode('utf-8'))
+    sources['dependencies'] = {section: set(reads) for section, reads in sources['dependencies'].items()}
+    return sources
+
+
+class PRDStore(MutableMapping):
+    """Mapping of PRD IDs to PRDs, indexed for listing
+    
+    Indexes are updated when a PRD is assigned, so assign a PRD again after
+    changing its status or metadata. Assigning keeps the PRD's generation
+    sources; ``put`` replaces them as well.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+    
+    def __setitem__(self, prd_id: str, prd: Any):
+        self.put(prd_id, prd)
+    
+    @abstractmethod
+    def put(self, prd_id: str, prd: Any, sources: Optional[Dict[str, Any]] = None):
+        """
+        Store a PRD
+        
+        Args:
+            prd_id: PRD ID
+            prd: PRD dict or LazyPRD
+            sources: Generation inputs and section dependencies, replacing
+                     the recorded ones; None keeps them
+        """
+    
+    @abstractmethod
+    def get_sources(self, prd_id: str) -> Optional[Dict[str, Any]]:
+        """Get the generation sources of a PRD, or None when none are recorded"""
+    
+    @abstractmethod
+    def query(self, project_name: Optional[str] = None, status: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              offset: int = 0, limit: Optional[int] = None,
+              after: Optional[Mapping] = None) -> List[Dict[str, Any]]:
+        """
+        List PRDs in generation order
+        
+        Args:
+            project_name: Only PRDs for this project
+            status: Only PRDs with this status
+            since: Only PRDs generated at or after this ISO timestamp
+            until: Only PRDs generated before this ISO timestamp
+            offset: Number of matching PRDs to skip
+            limit: Maximum number of PRDs to list, or None for all
+            after: Listing entry the previous page ended with; only PRDs
+                   listed after it are returned. Unlike ``offset``, paging
+                   this way costs the same however deep the page is
+        
+        Returns:
+            Listing entries with prd_id, project_name, created_at and status
+        """
+    
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size statistics"""
+    
+    def close(self):
+        """Release resources held by the store"""
+
+
+class MemoryPRDStore(PRDStore):
+    """In-memory PRD store with sorted secondary indexes
+    
+    PRDs and their generation sources are held as the objects that were
+    stored, LazyPRDs included.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._prds: Dict[str, Any] = {}
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._by_time: List[TimeKey] = []
+        self._by_project: Dict[str, List[TimeKey]] = {}
+        self._by_status: Dict[str, List[TimeKey]] = {}
+    
+    def __getitem__(self, prd_id: str) -> Any:
+        return self._prds[prd_id]
+    
+    def put(self, prd_id: str, prd: Any, sources: Optional[Dict[str, Any]] = None):
+        """Store a PRD, replacing its generation sources when given"""
+        entry = prd_index_entry(prd_id, prd)
+        with self._lock:
+            if prd_id in self._prds:
+                self._unindex(prd_id)
+            self._prds[prd_id] = prd
+            self._entries[prd_id] = entry
+            if sources is not None:
+                self._sources[prd_id] = sources
+            
+            key = (entry['created_at'], prd_id)
+            insort(self._by_time, key)
+            insort(self._by_project.setdefault(entry['project_name'], []), key)
+            insort(self._by_status.setdefault(entry['status'], []), key)
+    
+    def __delitem__(self, prd_id: str):
+        with self._lock:
+            if prd_id not in self._prds:
+                raise KeyError(prd_id)
+            self._unindex(prd_id)
+            del self._prds[prd_id]
+            self._sources.pop(prd_id, None)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._prds))
+    
+    def __len__(self) -> int:
+        return len(self._prds)
+    
+    def __contains__(self, prd_id: object) -> bool:
+        return prd_id in self._prds
+    
+    def get_sources(self, prd_id: str) -> Optional[Dict[str, Any]]:
+        """Get the generation sources of a PRD, or None when none are recorded"""
+        return self._sources.get(prd_id)
+    
+    def query(self, project_name: Optional[str] = None, status: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              offset: int = 0, limit: Optional[int] = None,
+              after: Optional[Mapping] = None) -> List[Dict[str, Any]]:
+        """List PRDs in generation order, see PRDStore.query"""
+        with self._lock:
+            # Walk the most selective index in time order and filter on the rest
+            if project_name is not None:
+                keys = self._by_project.get(project_name, [])
+            elif status is not None:
+                keys = self._by_status.get(status, [])
+            else:
+                keys = self._by_time
+            
+            start = bisect_left(keys, (since,)) if since is not None else 0
+            stop = bisect_left(keys, (until,)) if until is not None else len(keys)
+            if after is not None:
+                start = max(start, bisect_right(keys, (after['created_at'], after['prd_id'])))
+            
+            if project_name is not None and status is not None:
+                entries = (self._entries[keys[i][1]] for i in range(start, stop))
+                entries = (entry for entry in entries if entry['status'] == status)
+                page = islice(entries, offset, None if limit is None else offset + limit)
+            else:
+                start = min(start + offset, stop)
+                if limit is not None:
+                    stop = min(stop, start + limit)
+                page = (self._entries[keys[i][1]] for i in range(start, stop))
+            
+            return [dict(entry) for entry in page]
+    
+    def clear(self):
+        """Drop every PRD"""
+        with self._lock:
+            self._prds.clear()
+            self._sources.clear()
+            self._entries.clear()
+            self._by_time.clear()
+            self._by_project.clear()
+            self._by_status.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size statistics"""
+        return {
+            'backend': 'memory',
+            'prds': len(self._prds),
+            'projects': len(self._by_project)
+        }
+    
+    def _unindex(self, prd_id: str):
+        entry = self._entries.pop(prd_id)
+        key = (entry['created_at'], prd_id)
+        _remove(self._by_time, key)
+        for index, name in ((self._by_project, entry['project_name']), (self._by_status, entry['status'])):
+            keys = index[name]
+            _remove(keys, key)
+            if not keys:
+                del index[name]
+
+
+def _remove(keys: List[TimeKey], key: TimeKey):
+    del keys[bisect_left(keys, key)]
+
+
+class SQLitePRDStore(PRDStore):
+    """PRD store backed by a SQLite database
+    
+    PRDs are written zlib-compressed JSON, with project name, status and
+    generation time in indexed columns, and decoded on every read, so
+    ``get`` returns a fresh copy; assign a changed PRD back to persist it.
+    
+    A LazyPRD with sections still unbuilt is listed straight away but kept
+    in memory until it is fully built, so storing it does not force every
+    section to be generated. Once complete it is written to disk on the next
+    write to the store; past ``max_open`` open PRDs the oldest is built and
+    written. ``flush`` writes them all. Generation sources are written
+    compressed next to the PRD and stay in memory only while it is open.
+    """
+    
+    def __init__(self, db_path: str, max_open: int = DEFAULT_OPEN_PRDS):
+        if max_open <= 0:
+            raise ValueError("max_open must be positive")
+        
+        super().__init__()
+        self.db_path = db_path
+        self.max_open = max_open
+        self._open: 'OrderedDict[str, LazyPRD]' = OrderedDict()
+        self._open_sources: Dict[str, Dict[str, Any]] = {}
+        self._connection = self._open_database(db_path)
+    
+    def __getitem__(self, prd_id: str) -> Any:
+        with self._lock:
+            prd = self._open.get(prd_id)
+            if prd is not None:
+                return prd
+            
+            row = self._connection.execute("SELECT value FROM prds WHERE prd_id = ?", (prd_id,)).fetchone()
+            if row is None:
+                raise KeyError(prd_id)
+            return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+    
+    def put(self, prd_id: str, prd: Any, sources: Optional[Dict[str, Any]] = None):
+        """Store a PRD, replacing its generation sources when given"""
+        with self._lock:
+            was_open = self._open.pop(prd_id, None) is not None
+            open_sources = self._open_sources.pop(prd_id, None)
+            if sources is None and was_open:
+                sources = open_sources
+            
+            if isinstance(prd, LazyPRD) and prd.pending_sections:
+                if sources is None:
+                    sources = self.get_sources(prd_id)
+                self._write_entry(prd_id, prd)
+                self._open[prd_id] = prd
+                if sources is not None:
+                    self._open_sources[prd_id] = sources
+            else:
+                self._write(prd_id, prd, sources)
+            self._flush_built()
+    
+    def get_sources(self, prd_id: str) -> Optional[Dict[str, Any]]:
+        """Get the generation sources of a PRD, or None when none are recorded"""
+        with self._lock:
+            sources = self._open_sources.get(prd_id)
+            if sources is not None:
+                return sources
+            
+            row = self._connection.execute("SELECT sources FROM prds WHERE prd_id = ?", (prd_id,)).fetchone()
+        return _decode_sources(row[0]) if row is not None and row[0] is not None else None
+    
+    def __delitem__(self, prd_id: str):
+        with self._lock, self._connection:
+            self._open.pop(prd_id, None)
+            self._open_sources.pop(prd_id, None)
+            deleted = self._connection.execute("DELETE FROM prds WHERE prd_id = ?", (prd_id,)).rowcount
+        if not deleted:
+            raise KeyError(prd_id)
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._connection.execute("SELECT prd_id FROM prds ORDER BY generated_at, prd_id").fetchall()
+        return (prd_id for prd_id, in rows)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM prds").fetchone()[0]
+    
+    def __contains__(self, prd_id: object) -> bool:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT 1 FROM prds WHERE prd_id = ?", (prd_id,)
+            ).fetchone() is not None
+    
+    def query(self, project_name: Optional[str] = None, status: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              offset: int = 0, limit: Optional[int] = None,
+              after: Optional[Mapping] = None) -> List[Dict[str, Any]]:
+        """List PRDs in generation order, see PRDStore.query"""
+        conditions, parameters = [], []
+        for condition, value in (('project_name = ?', project_name), ('status = ?', status),
+                                 ('generated_at >= ?', since), ('generated_at < ?', until)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        if after is not None:
+            # Keyset pagination, a range scan of the (..., generated_at, prd_id) indexes
+            conditions.append('(generated_at, prd_id) > (?, ?)')
+            parameters.extend((after['created_at'], after['prd_id']))
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        parameters.extend((-1 if limit is None else limit, offset))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT prd_id, project_name, generated_at, status FROM prds {where} "
+                "ORDER BY generated_at, prd_id LIMIT ? OFFSET ?", parameters
+            ).fetchall()
+        
+        return [
+            {'prd_id': prd_id, 'project_name': name, 'created_at': generated_at, 'status': status}
+            for prd_id, name, generated_at, status in rows
+        ]
+    
+    def flush(self):
+        """Build and write every PRD still held in memory"""
+        with self._lock:
+            while self._open:
+                self._write_open(*self._open.popitem(last=False))
+    
+    def clear(self):
+        """Drop every PRD"""
+        with self._lock, self._connection:
+            self._open.clear()
+            self._open_sources.clear()
+            self._connection.execute("DELETE FROM prds")
+    
+    def close(self):
+        """Write open PRDs and close the database"""
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                self._connection.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size statistics"""
+        with self._lock:
+            prds, stored_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM prds"
+            ).fetchone()
+            return {
+                'backend': 'sqlite',
+                'prds': prds,
+                'bytes': stored_bytes,
+                'open_prds': len(self._open)
+            }
+    
+    def _open_database(self, db_path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(db_path, check_same_thread=False)
+        with connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS prds (
+                    prd_id TEXT PRIMARY KEY,
+                    project_name TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    generated_at TEXT NOT NULL,
+                    value BLOB,
+                    size INTEGER NOT NULL,
+                    sources BLOB
+                )
+            """)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(prds)")}
+            if 'sources' not in columns:
+                # Databases written before generation sources were persisted
+                connection.execute("ALTER TABLE prds ADD COLUMN sources BLOB")
+            for column in ('project_name', 'status'):
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS prds_{column} ON prds ({column}, generated_at, prd_id)"
+                )
+            connection.execute("CREATE INDEX IF NOT EXISTS prds_generated_at ON prds (generated_at, prd_id)")
+            orphaned = connection.execute("DELETE FROM prds WHERE value IS NULL").rowcount
+        
+        if orphaned:
+            logger.info(f"Dropped {orphaned} PRDs that were never fully built")
+        return connection
+    
+    def _write(self, prd_id: str, prd: Any, sources: Optional[Dict[str, Any]] = None):
+        """Write a PRD and its index entry, with its generation sources when given"""
+        if isinstance(prd, LazyPRD):
+            prd = prd.to_dict()
+        self._write_entry(prd_id, prd, zlib.compress(json.dumps(prd, default=_prd_value).encode('utf-8')),
+                          _encode_sources(sources) if sources is not None else None)
+    
+    def _write_entry(self, prd_id: str, prd: Any, value: Optional[bytes] = None,
+                     sources: Optional[bytes] = None):
+        """Write the index entry of a PRD, without its body while it is still being built
+        
+        Recorded sources are kept unless new ones are given.
+        """
+        entry = prd_index_entry(prd_id, prd)
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO prds VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (prd_id) DO UPDATE SET project_name = excluded.project_name, "
+                "status = excluded.status, generated_at = excluded.generated_at, value = excluded.value, "
+                "size = excluded.size, sources = COALESCE(excluded.sources, sources)",
+                (prd_id, entry['project_name'], entry['status'], entry['created_at'],
+                 value, len(value) if value is not None else 0, sources)
+            )
+    
+    def _flush_built(self):
+        """Write open PRDs that have been fully built, and the oldest ones past max_open"""
+        for prd_id in [prd_id for prd_id, prd in self._open.items() if not prd.pending_sections]:
+            self._write_open(prd_id, self._open.pop(prd_id))
+        while len(self._open) > self.max_open:
+            self._write_open(*self._open.popitem(last=False))
+    
+    def _write_open(self, prd_id: str, prd: LazyPRD):
+        """Build and write an open PRD, dropping it if it cannot be built or encoded
+        
+        PRDGenerator records failed sections as placeholders rather than
+        raising, so only PRDs from other section builders are dropped here.
+        """
+        try:
+            self._write(prd_id, prd, self._open_sources.pop(prd_id, None))
+        except Exception as e:
+            logger.error(f"Error writing PRD {prd_id}: {str(e)}")
+            with self._connection:
+                self._connection.execute("DELETE FROM prds WHERE prd_id = ?", (prd_id,))
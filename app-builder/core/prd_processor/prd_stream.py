@@ -0,0 +1,181 @@
+"""
+PRD Stream Writers for ERPNext App Builder
+
+This module serializes PRD sections to JSON or Markdown as they are
+generated, so a client can render the first section while later ones are
+still being built and the full document is never held serialized in memory.
+"""
+
+import json
+import logging
+from collections.abc import Mapping
+from typing import Any, IO, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRDSections = Iterable[Tuple[str, Any]]
+
+MARKDOWN_TITLE = 'Product Requirements Document'
+
+
+def iter_prd_json(sections: PRDSections, indent: int = None) -> Iterator[str]:
+    """
+    Serialize PRD sections as one JSON object, a section per chunk
+    
+    A failure while generating sections ends the object with an "error"
+    member, so the output stays valid JSON.
+    
+    Args:
+        sections: (key, value) pairs, e.g. from PRDGenerator.iter_prd_sections
+        indent: Indentation of section values, as for json.dumps
+    
+    Yields:
+        Chunks that concatenate to a JSON object
+    """
+    separator = '{'
+    newline = '\n' if indent is not None else ''
+    
+    try:
+        for key, value in sections:
+            yield f"{separator}{newline}{json.dumps(key)}: {_dump_json(value, indent)}"
+            separator = ','
+    except Exception as e:
+        logger.error(f"Error streaming PRD: {str(e)}")
+        yield f"{separator}{newline}\"error\": {json.dumps(str(e))}"
+        separator = ','
+    
+    yield '{}' if separator == '{' else f"{newline}}}"
+
+
+def iter_prd_markdown(sections: PRDSections, title: str = MARKDOWN_TITLE) -> Iterator[str]:
+    """
+    Render PRD sections as Markdown, a section per chunk
+    
+    Header fields become bold label lines and every section a second-level
+    heading. A failure while generating sections is reported in a final
+    quote block.
+    
+    Args:
+        sections: (key, value) pairs, e.g. from PRDGenerator.iter_prd_sections
+        title: Document title
+    
+    Yields:
+        Markdown chunks
+    """
+    yield f"# {title}\n\n"
+    
+    try:
+        for key, value in sections:
+            if _is_scalar(value):
+                yield f"**{_label(key)}:** {_format_scalar(value)}\n\n"
+            else:
+                yield f"## {_label(key)}\n\n{''.join(_markdown_section(value))}\n"
+    except Exception as e:
+        logger.error(f"Error streaming PRD: {str(e)}")
+        yield f"> Error generating PRD: {str(e)}\n"
+
+
+def write_prd_json(sections: PRDSections, stream: IO[str], indent: int = None):
+    """Write PRD sections to a text stream as JSON, flushing after each section"""
+    _write_chunks(iter_prd_json(sections, indent), stream)
+
+
+def write_prd_markdown(sections: PRDSections, stream: IO[str], title: str = MARKDOWN_TITLE):
+    """Write PRD sections to a text stream as Markdown, flushing after each section"""
+    _write_chunks(iter_prd_markdown(sections, title), stream)
+
+
+def _write_chunks(chunks: Iterator[str], stream: IO[str]):
+    """Write chunks, flushing so each section reaches the client immediately"""
+    flush = getattr(stream, 'flush', None)
+    for chunk in chunks:
+        stream.write(chunk)
+        if flush is not None:
+            flush()
+
+
+def _dump_json(value: Any, indent: int = None) -> str:
+    """Serialize a section value, including read-only mappings and sets"""
+    return json.dumps(value, indent=indent, default=_json_value)
+
+
+def _json_value(value: Any) -> Any:
+    """Turn values json cannot encode into plain ones"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def _markdown_section(value: Any) -> Iterator[str]:
+    """Render a section: top-level scalar fields as lines, nested fields under third-level headings"""
+    if isinstance(value, Mapping):
+        for key, item in value.items():
+            if _is_scalar(item):
+                yield f"**{_label(key)}:** {_format_scalar(item)}\n\n"
+            else:
+                yield f"### {_label(key)}\n\n"
+                yield from _markdown_items(item, 0)
+                yield '\n'
+    else:
+        yield from _markdown_items(value, 0)
+
+
+def _markdown_items(value: Any, depth: int) -> Iterator[str]:
+    """Render nested values as a bulleted list"""
+    pad = '  ' * depth
+    
+    if _is_scalar(value):
+        yield f"{pad}- {_format_scalar(value)}\n"
+    elif isinstance(value, Mapping):
+        if not value:
+            yield f"{pad}- None\n"
+        for key, item in value.items():
+            if _is_scalar(item):
+                yield f"{pad}- **{_label(key)}:** {_format_scalar(item)}\n"
+            else:
+                yield f"{pad}- **{_label(key)}:**\n"
+                yield from _markdown_items(item, depth + 1)
+    else:
+        items = list(value)
+        if not items:
+            yield f"{pad}- None\n"
+        for item in items:
+            if isinstance(item, Mapping) and item:
+                yield from _markdown_record(item, depth)
+            else:
+                yield from _markdown_items(item, depth)
+
+
+def _markdown_record(record: Mapping, depth: int) -> Iterator[str]:
+    """Render a dict inside a list as one bullet of its scalar fields, nested fields below it"""
+    pad = '  ' * depth
+    scalars: List[str] = []
+    nested = []
+    for key, item in record.items():
+        if _is_scalar(item):
+            scalars.append(f"**{_label(key)}:** {_format_scalar(item)}")
+        else:
+            nested.append((key, item))
+    
+    yield f"{pad}- {'; '.join(scalars) if scalars else '&nbsp;'}\n"
+    for key, item in nested:
+        yield f"{pad}  - **{_label(key)}:**\n"
+        yield from _markdown_items(item, depth + 2)
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _format_scalar(value: Any) -> str:
+    if value is None:
+        return 'Not specified'
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    return str(value)
+
+
+def _label(key: str) -> str:
+    return str(key).replace('_', ' ').title()
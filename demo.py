@@ -8,6 +8,7 @@ by processing a sample business requirement and generating a complete PRD.
 
 import sys
 import json
+import asyncio
 import os
 from pathlib import Path
 
@@ -17,8 +18,9 @@ sys.path.insert(0, str(app_builder_path))
 
 # Import our modules
 from core.claude_hooks import ClaudeHooks, PromptManager, AIInterface
-from core.context_engine import ContextProcessor, RequirementParser, DomainKnowledge
+from core.context_engine import ContextProcessor, RequirementParser, DomainKnowledge, RequirementDocument
 from core.prd_processor import PRDGenerator
+from core.pipeline import PipelineOrchestrator
 
 
 def main():
@@ -42,18 +44,23 @@ def main():
     
     # Step 1: Initialize components
     print("🔧 Initializing App Builder Components...")
-    claude_hooks = ClaudeHooks()
-    context_processor = ContextProcessor()
-    requirement_parser = RequirementParser()
-    domain_knowledge = DomainKnowledge()
-    prd_generator = PRDGenerator()
-    ai_interface = AIInterface()
+    orchestrator = PipelineOrchestrator()
     
     print("✅ Components initialized successfully\n")
     
+    # Annotate the requirement once and run the independent stages concurrently
+    requirement_document = RequirementDocument(sample_requirement)
+    print("⚡ Running pipeline stages concurrently...")
+    result = asyncio.run(orchestrator.run(requirement_document))
+    
+    if not result['success']:
+        print(f"❌ Pipeline run failed at {result.get('failed_stage', 'setup')}: {result.get('error')}\n")
+        return
+    print("✅ Pipeline run completed\n")
+    
     # Step 2: Process requirement with Claude Hooks
     print("🤖 Processing requirement with Claude Hooks...")
-    claude_result = claude_hooks.process_user_requirement(sample_requirement)
+    claude_result = result['claude_analysis']
     
     if claude_result['success']:
         print("✅ Claude Hooks processing completed")
@@ -67,7 +74,7 @@ def main():
     
     # Step 3: Parse requirement details
     print("📋 Parsing requirement details...")
-    parsed_requirement = requirement_parser.parse(sample_requirement)
+    parsed_requirement = result['parsed_requirement']
     
     if parsed_requirement['success']:
         print("✅ Requirement parsing completed")
@@ -81,7 +88,7 @@ def main():
     
     # Step 4: Build context
     print("🎯 Building comprehensive context...")
-    context_result = context_processor.process_requirement(sample_requirement)
+    context_result = result['context']
     
     if context_result['success']:
         context = context_result['context']
@@ -96,8 +103,7 @@ def main():
     
     # Step 5: Get domain guidance
     print("🏢 Getting domain-specific guidance...")
-    industry = claude_result['industry_category']
-    domain_guidance = domain_knowledge.get_industry_guidance(industry, sample_requirement)
+    domain_guidance = result['domain_guidance']
     
     print("✅ Domain guidance retrieved")
     print(f"   - Industry: {domain_guidance['industry']}")
@@ -106,7 +112,7 @@ def main():
     
     # Step 6: Generate PRD
     print("📄 Generating Product Requirements Document...")
-    prd_result = prd_generator.generate_prd(context, domain_guidance, parsed_requirement)
+    prd_result = result['prd']
     
     if prd_result['success']:
         prd = prd_result['prd']
@@ -120,6 +126,12 @@ def main():
         print(f"❌ PRD generation failed: {prd_result.get('error')}\n")
         return
     
+    # Display how long each stage took
+    print("⏱️ Stage timings:")
+    for stage, seconds in result['timings'].items():
+        print(f"   - {stage}: {seconds * 1000:.1f} ms")
+    print()
+    
     # Step 7: Display summary
     print("📊 Summary of Generated Application:")
     print("=" * 50)
@@ -159,11 +171,12 @@ def main():
     
     # Step 8: Test AI Interface
     print(f"\n🧠 Testing AI Interface...")
-    if ai_interface.health_check():
+    ai_analysis = result['ai_analysis']
+    if ai_analysis['server_available']:
         print("✅ MCP Server connection successful")
         
-        # Test requirement analysis
-        ai_result = ai_interface.analyze_requirement(sample_requirement[:200] + "...")
+        # Requirement analysis ran alongside the local stages
+        ai_result = ai_analysis['result']
         if ai_result['success']:
             print("✅ AI analysis successful")
             print(f"   Response preview: {str(ai_result['response'])[:100]}...")